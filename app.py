@@ -4,11 +4,20 @@
 # Enhanced UI — Academic Intelligence Terminal
 # ============================================================
 
+# Heavy imports (plotly figures, pandas via batch_score, scikit-learn via
+# the pickled model) are deferred to the sections that need them so a
+# cold start only pays for Streamlit and NumPy.
+# Profile with: python benchmarks/import_profile.py
+import os
+
 import streamlit as st
 import numpy as np
-import pickle
-import plotly.graph_objects as go
-import pandas as pd
+
+from lookup_table import LookupPredictor
+from predictor import FEATURES, GPAPredictor
+from student_store import StudentStore
+from telemetry import AppTelemetry, serve_metrics
+from theme import theme_html
 
 # ============================================================
 # PAGE CONFIG  —  must be the very first Streamlit call
@@ -20,737 +29,81 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# ============================================================
+# TELEMETRY  —  per-section timings; ?debug=1 shows the last reruns
+# ============================================================
+@st.cache_resource
+def load_telemetry():
+    # Shared by every session; GPA_METRICS_PORT also exposes the
+    # histograms at http://127.0.0.1:<port>/metrics for a local scraper.
+    telemetry = AppTelemetry()
+    if os.environ.get("GPA_METRICS_PORT"):
+        serve_metrics(telemetry.registry, port=int(os.environ["GPA_METRICS_PORT"]))
+    return telemetry
+
+
+telemetry = load_telemetry()
+rerun     = telemetry.rerun()
+debug_mode = st.query_params.get("debug") == "1" or os.environ.get("GPA_DEBUG") == "1"
+
 # ============================================================
 # LOAD MODEL FILES
 # ============================================================
 @st.cache_resource
-def load_objects():
-    with open("model.pkl", "rb") as f:
-        model = pickle.load(f)
-    with open("scaler.pkl", "rb") as f:
-        scaler = pickle.load(f)
-    return model, scaler
+def load_predictor():
+    # One predictor shared by every session. The precomputed lookup table
+    # (python lookup_table.py) needs no scikit-learn; otherwise fall back
+    # to the memory-mapped model pack behind a prediction cache.
+    return LookupPredictor.open() or GPAPredictor.open(cache=True)
+
+
+@st.cache_resource
+def load_student_store():
+    # Columnar records behind the model's neighbours (python student_store.py
+    # saves a memory-mapped copy); None when the CSV is not deployed or
+    # the model pack records no training StudentIDs.
+    try:
+        return StudentStore.open() or StudentStore.from_csv()
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def what_if_views(profile):
+    # One batched predict per distinct base profile (a tuple, so it hashes)
+    from sensitivity import what_if
+
+    return what_if(load_predictor(), list(profile))
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def target_plans(profile, target):
+    # Cheapest feature changes reaching `target`, per (profile, target)
+    from counterfactual import plans_to_target
+
+    return plans_to_target(load_predictor(), list(profile), target)
+
+
+@st.cache_resource(show_spinner="Aggregating the student cohort…")
+def load_cohort_stats():
+    # GPA bin counts per group and residuals over the student CSV
+    # (python cohort_stats.py precomputes them); None when the CSV is
+    # not deployed. Only called once a session asks for the cohort tab:
+    # it imports pandas and, without a saved result, scores every row.
+    # Everything drawn from the result is O(bins), not O(rows).
+    from cohort_stats import load_stats
 
+    try:
+        return load_stats()
+    except FileNotFoundError:
+        return None
 
-model, scaler = load_objects()
 
 # ============================================================
 # PROFESSIONAL ANIMATED THEME  —  Emerald Academic Intelligence
 # ============================================================
-st.markdown(
-    """
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Syne:wght@400;600;700;800&family=Space+Mono:wght@400;700&family=DM+Sans:wght@300;400;500;600&display=swap');
-
-/* ── VARIABLES ── */
-:root {
-    --emerald:       #10b981;
-    --emerald-light: #34d399;
-    --emerald-dark:  #059669;
-    --violet:        #8b5cf6;
-    --violet-light:  #a78bfa;
-    --gold:          #f59e0b;
-    --red:           #ef4444;
-    --dark-950:      #030712;
-    --dark-900:      #080f1a;
-    --dark-800:      #0f1f2e;
-    --dark-700:      #162436;
-    --glass:         rgba(16,185,129,0.04);
-    --glass-border:  rgba(16,185,129,0.14);
-    --glow:          0 0 28px rgba(16,185,129,0.22);
-    --text-main:     #ecfdf5;
-    --text-muted:    rgba(236,253,245,0.5);
-}
-
-/* ── BACKGROUND ── */
-.stApp {
-    background: var(--dark-950);
-    font-family: 'DM Sans', sans-serif;
-    overflow-x: hidden;
-}
-
-.stApp::before {
-    content: '';
-    position: fixed;
-    inset: 0;
-    background:
-        radial-gradient(ellipse at 15% 15%, rgba(16,185,129,0.09) 0%, transparent 50%),
-        radial-gradient(ellipse at 85% 85%, rgba(139,92,246,0.08) 0%, transparent 50%),
-        radial-gradient(ellipse at 50% 50%, rgba(245,158,11,0.03) 0%, transparent 60%);
-    pointer-events: none;
-    z-index: 0;
-    animation: ambientShift 12s ease-in-out infinite alternate;
-}
-
-@keyframes ambientShift {
-    0%   { opacity: 0.6; }
-    100% { opacity: 1.0; }
-}
-
-/* ── DOT GRID ── */
-.stApp::after {
-    content: '';
-    position: fixed;
-    inset: 0;
-    background-image: radial-gradient(circle, rgba(16,185,129,0.08) 1px, transparent 1px);
-    background-size: 36px 36px;
-    pointer-events: none;
-    z-index: 0;
-}
-
-/* ── MAIN BLOCK ── */
-.main .block-container {
-    position: relative;
-    z-index: 1;
-    padding-top: 10px;
-    padding-bottom: 40px;
-    max-width: 1400px;
-}
-
-/* ── HERO ── */
-.hero {
-    text-align: center;
-    padding: 48px 20px 24px;
-    animation: heroReveal 0.8s cubic-bezier(0.22,1,0.36,1) both;
-}
-
-@keyframes heroReveal {
-    from { opacity: 0; transform: translateY(-22px); }
-    to   { opacity: 1; transform: translateY(0); }
-}
-
-.hero-badge {
-    display: inline-flex;
-    align-items: center;
-    gap: 8px;
-    background: rgba(16,185,129,0.08);
-    border: 1px solid rgba(16,185,129,0.2);
-    border-radius: 50px;
-    padding: 7px 18px;
-    font-family: 'Space Mono', monospace;
-    font-size: 10px;
-    color: var(--emerald-light);
-    letter-spacing: 2px;
-    text-transform: uppercase;
-    margin-bottom: 18px;
-    animation: heroReveal 0.8s ease both 0.1s;
-}
-
-.hero-badge-dot {
-    width: 6px; height: 6px;
-    border-radius: 50%;
-    background: var(--emerald);
-    box-shadow: 0 0 8px var(--emerald);
-    animation: dotPulse 1.6s ease-in-out infinite;
-}
-
-@keyframes dotPulse {
-    0%, 100% { opacity: 1; box-shadow: 0 0 8px var(--emerald); }
-    50%       { opacity: 0.4; box-shadow: 0 0 3px var(--emerald); }
-}
-
-.hero-title {
-    font-family: 'Syne', sans-serif;
-    font-size: clamp(30px, 5vw, 64px);
-    font-weight: 800;
-    color: var(--text-main);
-    letter-spacing: -1px;
-    line-height: 1.05;
-    margin-bottom: 8px;
-}
-
-.hero-title em {
-    font-style: normal;
-    background: linear-gradient(135deg, var(--emerald-light), var(--violet-light));
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    background-clip: text;
-    filter: drop-shadow(0 0 20px rgba(16,185,129,0.5));
-}
-
-.hero-sub {
-    font-family: 'Space Mono', monospace;
-    font-size: 11px;
-    color: var(--text-muted);
-    letter-spacing: 3px;
-    text-transform: uppercase;
-    animation: heroReveal 0.8s ease both 0.25s;
-}
-
-.hero-line {
-    display: flex;
-    align-items: center;
-    gap: 14px;
-    margin: 20px auto 0;
-    max-width: 420px;
-}
-
-.hero-line-seg {
-    flex: 1;
-    height: 1px;
-    background: linear-gradient(90deg, transparent, var(--emerald), transparent);
-    animation: lineGrow 1s ease both 0.4s;
-}
-
-@keyframes lineGrow {
-    from { transform: scaleX(0); opacity: 0; }
-    to   { transform: scaleX(1); opacity: 1; }
-}
-
-.hero-line-gem {
-    width: 8px; height: 8px;
-    background: var(--emerald);
-    clip-path: polygon(50% 0%, 100% 50%, 50% 100%, 0% 50%);
-    box-shadow: 0 0 14px var(--emerald);
-    animation: gemSpin 6s linear infinite;
-}
-
-@keyframes gemSpin {
-    from { transform: rotate(0deg); }
-    to   { transform: rotate(360deg); }
-}
-
-/* ── SCORE BAND ── */
-.score-band {
-    display: flex;
-    justify-content: center;
-    gap: 24px;
-    flex-wrap: wrap;
-    margin-bottom: 26px;
-    animation: heroReveal 0.8s ease both 0.3s;
-}
-
-.score-chip {
-    display: flex;
-    align-items: center;
-    gap: 8px;
-    background: rgba(16,185,129,0.05);
-    border: 1px solid rgba(16,185,129,0.12);
-    border-radius: 8px;
-    padding: 8px 16px;
-    font-family: 'Space Mono', monospace;
-    font-size: 11px;
-    color: var(--emerald-light);
-    letter-spacing: 1px;
-}
-
-.score-chip-dot {
-    width: 6px; height: 6px;
-    border-radius: 50%;
-    background: var(--emerald);
-}
-
-/* ── GLASS PANEL ── */
-.glass-panel {
-    background: var(--glass);
-    border: 1px solid var(--glass-border);
-    border-radius: 18px;
-    padding: 26px;
-    margin-bottom: 22px;
-    position: relative;
-    overflow: hidden;
-    transition: all 0.3s ease;
-    animation: panelIn 0.5s ease both;
-}
-
-@keyframes panelIn {
-    from { opacity: 0; transform: translateY(14px); }
-    to   { opacity: 1; transform: translateY(0); }
-}
-
-.glass-panel::before {
-    content: '';
-    position: absolute;
-    top: 0; left: -100%;
-    width: 100%; height: 2px;
-    background: linear-gradient(90deg, transparent, var(--emerald), var(--violet), transparent);
-    animation: scanRail 3.5s linear infinite;
-}
-
-@keyframes scanRail {
-    0%   { left: -100%; }
-    100% { left: 100%; }
-}
-
-.glass-panel:hover {
-    border-color: rgba(16,185,129,0.3);
-    box-shadow: var(--glow);
-    transform: translateY(-2px);
-}
-
-.panel-eyebrow {
-    font-family: 'Space Mono', monospace;
-    font-size: 10px;
-    letter-spacing: 3px;
-    color: var(--emerald);
-    text-transform: uppercase;
-    margin-bottom: 4px;
-    opacity: 0.75;
-}
-
-.panel-heading {
-    font-family: 'Syne', sans-serif;
-    font-size: 20px;
-    font-weight: 700;
-    color: var(--text-main);
-    margin-bottom: 0;
-}
-
-/* ── INPUT FIELDS ── */
-div[data-testid="stNumberInput"] > div > div > input,
-div[data-testid="stSelectbox"] > div > div,
-div[data-testid="stSlider"] {
-    background: rgba(16,185,129,0.04) !important;
-    border: 1px solid rgba(16,185,129,0.18) !important;
-    border-radius: 10px !important;
-    color: var(--text-main) !important;
-    font-family: 'DM Sans', sans-serif !important;
-    transition: all 0.25s ease !important;
-}
-
-div[data-testid="stNumberInput"] > div > div > input:focus {
-    border-color: var(--emerald) !important;
-    box-shadow: 0 0 0 3px rgba(16,185,129,0.14) !important;
-    outline: none !important;
-}
-
-.stSelectbox label,
-.stNumberInput label,
-.stSlider label {
-    color: rgba(16,185,129,0.85) !important;
-    font-family: 'Space Mono', monospace !important;
-    font-size: 10px !important;
-    letter-spacing: 1.5px !important;
-    text-transform: uppercase !important;
-}
-
-/* ── SLIDER TRACK ── */
-div[data-testid="stSlider"] > div > div > div {
-    background: linear-gradient(90deg, var(--emerald), var(--violet)) !important;
-}
-
-/* ── INPUT GROUP LABEL ── */
-.input-group {
-    font-family: 'Syne', sans-serif;
-    font-size: 12px;
-    font-weight: 700;
-    letter-spacing: 3px;
-    color: var(--emerald);
-    text-transform: uppercase;
-    border-bottom: 1px solid rgba(16,185,129,0.14);
-    padding-bottom: 8px;
-    margin-bottom: 14px;
-}
-
-/* ── PREDICT BUTTON ── */
-div.stButton > button {
-    width: 100% !important;
-    background: linear-gradient(135deg, var(--emerald-dark) 0%, var(--violet) 100%) !important;
-    color: #ffffff !important;
-    font-family: 'Syne', sans-serif !important;
-    font-size: 16px !important;
-    font-weight: 800 !important;
-    letter-spacing: 3px !important;
-    text-transform: uppercase !important;
-    border: none !important;
-    border-radius: 12px !important;
-    padding: 16px 40px !important;
-    cursor: pointer !important;
-    transition: all 0.3s ease !important;
-    box-shadow: 0 0 28px rgba(16,185,129,0.3), 0 0 50px rgba(139,92,246,0.15) !important;
-}
-
-div.stButton > button:hover {
-    transform: translateY(-3px) !important;
-    box-shadow: 0 0 50px rgba(16,185,129,0.5), 0 0 80px rgba(139,92,246,0.25) !important;
-}
-
-div.stButton > button:active {
-    transform: translateY(0) !important;
-}
-
-/* ── GPA RESULT BOX ── */
-.gpa-box {
-    border-radius: 22px;
-    padding: 50px 30px;
-    text-align: center;
-    position: relative;
-    overflow: hidden;
-    animation: gpaReveal 0.6s cubic-bezier(0.175,0.885,0.32,1.275) both;
-}
-
-@keyframes gpaReveal {
-    from { opacity: 0; transform: scale(0.82); }
-    to   { opacity: 1; transform: scale(1); }
-}
-
-.gpa-box::before {
-    content: '';
-    position: absolute;
-    top: -50%; left: -50%;
-    width: 200%; height: 200%;
-    background: conic-gradient(from 0deg, transparent 0deg, rgba(255,255,255,0.04) 60deg, transparent 120deg);
-    animation: rotateConic 7s linear infinite;
-}
-
-@keyframes rotateConic {
-    from { transform: rotate(0deg); }
-    to   { transform: rotate(360deg); }
-}
-
-.gpa-num {
-    font-family: 'Syne', sans-serif;
-    font-size: clamp(60px, 10vw, 100px);
-    font-weight: 800;
-    line-height: 1;
-    position: relative;
-    z-index: 1;
-    filter: drop-shadow(0 0 20px currentColor);
-}
-
-.gpa-category {
-    font-family: 'Space Mono', monospace;
-    font-size: 13px;
-    letter-spacing: 3px;
-    text-transform: uppercase;
-    position: relative;
-    z-index: 1;
-    margin-top: 10px;
-    opacity: 0.85;
-}
-
-/* ── GPA COLOR VARIANTS ── */
-.gpa-excellent { background: linear-gradient(135deg, #022c22, #064e3b); border: 1px solid rgba(16,185,129,0.5); color: var(--emerald-light); box-shadow: 0 0 50px rgba(16,185,129,0.2); }
-.gpa-good      { background: linear-gradient(135deg, #1c1917, #292524); border: 1px solid rgba(139,92,246,0.45); color: var(--violet-light);   box-shadow: 0 0 50px rgba(139,92,246,0.2); }
-.gpa-average   { background: linear-gradient(135deg, #1c1400, #292000); border: 1px solid rgba(245,158,11,0.45); color: var(--gold);            box-shadow: 0 0 50px rgba(245,158,11,0.2); }
-.gpa-risk      { background: linear-gradient(135deg, #1c0000, #290000); border: 1px solid rgba(239,68,68,0.45);  color: var(--red);             box-shadow: 0 0 50px rgba(239,68,68,0.2);  }
-
-/* ── STAT CHIPS ── */
-.stat-row {
-    display: flex;
-    gap: 14px;
-    flex-wrap: wrap;
-    margin-top: 20px;
-}
-
-.stat-chip {
-    flex: 1;
-    min-width: 100px;
-    background: rgba(16,185,129,0.05);
-    border: 1px solid rgba(16,185,129,0.15);
-    border-radius: 12px;
-    padding: 16px 12px;
-    text-align: center;
-    transition: all 0.25s ease;
-}
-
-.stat-chip:hover {
-    background: rgba(16,185,129,0.10);
-    transform: translateY(-2px);
-    box-shadow: var(--glow);
-}
-
-.stat-chip-val {
-    font-family: 'Syne', sans-serif;
-    font-size: 22px;
-    font-weight: 800;
-    color: var(--emerald-light);
-}
-
-.stat-chip-lbl {
-    font-family: 'Space Mono', monospace;
-    font-size: 9px;
-    color: var(--text-muted);
-    letter-spacing: 2px;
-    text-transform: uppercase;
-    margin-top: 4px;
-}
-
-/* ── SECTION TITLE ── */
-.section-title {
-    font-family: 'Syne', sans-serif;
-    font-size: 16px;
-    font-weight: 800;
-    color: var(--emerald-light);
-    text-transform: uppercase;
-    letter-spacing: 3px;
-    padding-bottom: 10px;
-    border-bottom: 1px solid rgba(16,185,129,0.12);
-    margin: 28px 0 18px;
-}
-
-/* ── TABS ── */
-.stTabs [data-baseweb="tab-list"] {
-    background: rgba(16,185,129,0.04) !important;
-    border-radius: 12px !important;
-    border: 1px solid rgba(16,185,129,0.1) !important;
-    padding: 5px !important;
-    gap: 4px !important;
-}
-
-.stTabs [data-baseweb="tab"] {
-    font-family: 'Syne', sans-serif !important;
-    font-size: 12px !important;
-    font-weight: 700 !important;
-    letter-spacing: 2px !important;
-    text-transform: uppercase !important;
-    color: rgba(16,185,129,0.5) !important;
-    border-radius: 9px !important;
-    padding: 10px 18px !important;
-    transition: all 0.3s ease !important;
-}
-
-.stTabs [aria-selected="true"] {
-    background: linear-gradient(135deg, rgba(16,185,129,0.18), rgba(139,92,246,0.18)) !important;
-    color: var(--emerald-light) !important;
-    box-shadow: 0 0 14px rgba(16,185,129,0.15) !important;
-}
-
-/* ── SIDEBAR ── */
-section[data-testid="stSidebar"] {
-    background: linear-gradient(180deg, #030f0a 0%, #060f14 100%) !important;
-    border-right: 1px solid rgba(16,185,129,0.1) !important;
-}
-
-.sb-logo-text {
-    font-family: 'Syne', sans-serif;
-    font-size: 26px;
-    font-weight: 800;
-    background: linear-gradient(135deg, var(--emerald-light), var(--violet-light));
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    background-clip: text;
-    letter-spacing: 2px;
-}
-
-.sb-logo-sub {
-    font-family: 'Space Mono', monospace;
-    font-size: 9px;
-    color: rgba(16,185,129,0.4);
-    letter-spacing: 3px;
-    margin-top: 3px;
-}
-
-.sb-title {
-    font-family: 'Syne', sans-serif;
-    font-size: 12px;
-    font-weight: 700;
-    color: var(--emerald);
-    letter-spacing: 2px;
-    text-transform: uppercase;
-    margin-bottom: 10px;
-}
-
-.sb-info {
-    background: rgba(16,185,129,0.05);
-    border: 1px solid rgba(16,185,129,0.13);
-    border-radius: 12px;
-    padding: 16px;
-    font-family: 'DM Sans', sans-serif;
-    font-size: 14px;
-    color: rgba(236,253,245,0.75);
-    line-height: 1.85;
-}
-
-.sb-info span { color: var(--emerald-light); font-weight: 600; }
-
-.sb-metric {
-    background: rgba(16,185,129,0.05);
-    border: 1px solid rgba(16,185,129,0.13);
-    border-radius: 10px;
-    padding: 14px;
-    text-align: center;
-}
-
-.sb-metric-val {
-    font-family: 'Syne', sans-serif;
-    font-size: 22px;
-    font-weight: 800;
-    color: var(--emerald-light);
-}
-
-.sb-metric-lbl {
-    font-family: 'Space Mono', monospace;
-    font-size: 9px;
-    color: var(--text-muted);
-    letter-spacing: 2px;
-    text-transform: uppercase;
-    margin-top: 4px;
-}
-
-/* ── INSIGHT CARD ── */
-.insight {
-    background: rgba(16,185,129,0.04);
-    border: 1px solid rgba(16,185,129,0.12);
-    border-left: 4px solid var(--emerald);
-    border-radius: 12px;
-    padding: 16px 20px;
-    margin-bottom: 12px;
-    font-family: 'DM Sans', sans-serif;
-    font-size: 14px;
-    color: rgba(236,253,245,0.8);
-    line-height: 1.7;
-    transition: all 0.25s ease;
-}
-
-.insight:hover {
-    background: rgba(16,185,129,0.08);
-    border-left-color: var(--emerald-light);
-    transform: translateX(4px);
-}
-
-.insight b { color: var(--emerald-light); }
-
-/* ── REPORT CARD ── */
-.report-card {
-    background: rgba(16,185,129,0.04);
-    border: 1px solid rgba(16,185,129,0.14);
-    border-radius: 16px;
-    padding: 26px;
-    margin-bottom: 18px;
-}
-
-.report-row {
-    display: flex;
-    justify-content: space-between;
-    align-items: center;
-    padding: 10px 0;
-    border-bottom: 1px solid rgba(16,185,129,0.08);
-    font-family: 'DM Sans', sans-serif;
-    font-size: 14px;
-    color: rgba(236,253,245,0.75);
-}
-
-.report-row:last-child { border-bottom: none; }
-
-.report-row-key {
-    font-family: 'Space Mono', monospace;
-    font-size: 10px;
-    letter-spacing: 1.5px;
-    text-transform: uppercase;
-    color: var(--text-muted);
-}
-
-.report-row-val {
-    font-family: 'Syne', sans-serif;
-    font-size: 15px;
-    font-weight: 700;
-    color: var(--emerald-light);
-}
-
-/* ── RECOMMENDATION BOX ── */
-.rec-warn {
-    background: rgba(245,158,11,0.07);
-    border: 1px solid rgba(245,158,11,0.25);
-    border-radius: 12px;
-    padding: 16px 20px;
-    font-family: 'DM Sans', sans-serif;
-    font-size: 14px;
-    color: rgba(245,240,220,0.85);
-    line-height: 1.7;
-}
-
-.rec-ok {
-    background: rgba(16,185,129,0.06);
-    border: 1px solid rgba(16,185,129,0.22);
-    border-radius: 12px;
-    padding: 16px 20px;
-    font-family: 'DM Sans', sans-serif;
-    font-size: 14px;
-    color: rgba(236,253,245,0.85);
-    line-height: 1.7;
-}
-
-/* ── PROGRESS BAR ── */
-div[data-testid="stProgressBar"] > div {
-    background: linear-gradient(90deg, var(--emerald), var(--violet)) !important;
-    border-radius: 99px !important;
-}
-
-div[data-testid="stProgressBar"] {
-    background: rgba(16,185,129,0.1) !important;
-    border-radius: 99px !important;
-}
-
-/* ── DATAFRAME ── */
-div[data-testid="stDataFrame"] {
-    border: 1px solid rgba(16,185,129,0.14) !important;
-    border-radius: 14px !important;
-    overflow: hidden !important;
-}
-
-/* ── INFO / WARNING / SUCCESS ── */
-div[data-testid="stInfo"],
-div[data-testid="stSuccess"],
-div[data-testid="stWarning"] {
-    border-radius: 12px !important;
-    font-family: 'DM Sans', sans-serif !important;
-}
-
-/* ── SCROLLBAR ── */
-::-webkit-scrollbar { width: 5px; }
-::-webkit-scrollbar-track { background: var(--dark-950); }
-::-webkit-scrollbar-thumb {
-    background: linear-gradient(180deg, var(--emerald), var(--violet));
-    border-radius: 3px;
-}
-
-/* ── FLOATING PARTICLES ── */
-.particles {
-    position: fixed;
-    inset: 0;
-    pointer-events: none;
-    z-index: 0;
-    overflow: hidden;
-}
-
-.pt {
-    position: absolute;
-    border-radius: 50%;
-    animation: ptFloat linear infinite;
-}
-
-.pt:nth-child(1)  { width:2px; height:2px; left: 5%;  background:var(--emerald);       box-shadow:0 0 5px var(--emerald);       animation-duration:15s; animation-delay:0s;   opacity:0.5; }
-.pt:nth-child(2)  { width:2px; height:2px; left:18%;  background:var(--violet-light);   box-shadow:0 0 5px var(--violet-light);  animation-duration:20s; animation-delay:3s;   opacity:0.4; }
-.pt:nth-child(3)  { width:3px; height:3px; left:30%;  background:var(--emerald-light);  box-shadow:0 0 8px var(--emerald-light); animation-duration:13s; animation-delay:6s;   opacity:0.6; }
-.pt:nth-child(4)  { width:2px; height:2px; left:45%;  background:var(--gold);           box-shadow:0 0 5px var(--gold);          animation-duration:23s; animation-delay:1s;   opacity:0.3; }
-.pt:nth-child(5)  { width:2px; height:2px; left:60%;  background:var(--emerald);        box-shadow:0 0 5px var(--emerald);       animation-duration:17s; animation-delay:8s;   opacity:0.5; }
-.pt:nth-child(6)  { width:2px; height:2px; left:73%;  background:var(--violet-light);   box-shadow:0 0 5px var(--violet-light);  animation-duration:21s; animation-delay:4s;   opacity:0.4; }
-.pt:nth-child(7)  { width:3px; height:3px; left:85%;  background:var(--emerald-light);  box-shadow:0 0 8px var(--emerald-light); animation-duration:14s; animation-delay:2s;   opacity:0.6; }
-.pt:nth-child(8)  { width:2px; height:2px; left:93%;  background:var(--gold);           box-shadow:0 0 5px var(--gold);          animation-duration:19s; animation-delay:7s;   opacity:0.3; }
-
-@keyframes ptFloat {
-    0%   { transform: translateY(110vh) scale(0);   opacity: 0; }
-    10%  { opacity: 0.7; }
-    90%  { opacity: 0.5; }
-    100% { transform: translateY(-10vh) scale(1.5); opacity: 0; }
-}
-
-/* ── FOOTER ── */
-.footer {
-    text-align: center;
-    padding: 28px;
-    font-family: 'Space Mono', monospace;
-    font-size: 10px;
-    color: rgba(16,185,129,0.3);
-    letter-spacing: 2px;
-    text-transform: uppercase;
-    border-top: 1px solid rgba(16,185,129,0.07);
-    margin-top: 40px;
-    position: relative;
-    z-index: 1;
-}
-</style>
-
-<!-- Floating Particles -->
-<div class="particles">
-    <div class="pt"></div><div class="pt"></div><div class="pt"></div>
-    <div class="pt"></div><div class="pt"></div><div class="pt"></div>
-    <div class="pt"></div><div class="pt"></div>
-</div>
-""",
-    unsafe_allow_html=True,
-)
+st.markdown(theme_html(), unsafe_allow_html=True)
+rerun.lap("theme")
 
 # ============================================================
 # SESSION STATE INIT
@@ -758,7 +111,7 @@ div[data-testid="stWarning"] {
 _STATE_KEYS = [
     "gpa", "study_time", "absences", "tutoring",
     "parental_support", "extracurricular", "sports",
-    "music", "grade_class",
+    "music", "grade_class", "neighbours", "cohort_loaded",
 ]
 for _k in _STATE_KEYS:
     if _k not in st.session_state:
@@ -853,6 +206,35 @@ with st.sidebar:
         )
         st.progress(0.0)
 
+    st.markdown("<br>", unsafe_allow_html=True)
+    with st.expander("&#9889; Prediction Cache"):
+        if st.session_state.gpa is None:
+            st.markdown(
+                """<div class="sb-info">
+                    <span>Status:</span> Model loads on first prediction
+                </div>""",
+                unsafe_allow_html=True,
+            )
+        elif load_predictor().cache is not None:
+            cache_stats = load_predictor().cache.stats()
+            st.markdown(
+                f"""<div class="sb-info">
+                    <span>Hits:</span> {cache_stats["hits"]:,}<br>
+                    <span>Misses:</span> {cache_stats["misses"]:,}<br>
+                    <span>Hit Rate:</span> {cache_stats["hit_rate"]:.1%}<br>
+                    <span>Cached:</span> {cache_stats["filled"]:,} / {cache_stats["size"]:,}
+                </div>""",
+                unsafe_allow_html=True,
+            )
+        else:
+            st.markdown(
+                """<div class="sb-info">
+                    <span>Source:</span> Precomputed lookup table<br>
+                    <span>Lookup:</span> One array index per prediction
+                </div>""",
+                unsafe_allow_html=True,
+            )
+
     st.markdown("<br>", unsafe_allow_html=True)
     with st.expander("&#9881;&#65039; About KNN Model"):
         st.markdown(
@@ -884,6 +266,11 @@ with st.sidebar:
         unsafe_allow_html=True,
     )
 
+    # Filled at the end of the run, once every section has been timed
+    debug_slot = st.empty() if debug_mode else None
+
+rerun.lap("sidebar")
+
 # ============================================================
 # HERO HEADER
 # ============================================================
@@ -919,15 +306,19 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
+rerun.lap("header")
+
 # ============================================================
 # TABS
 # ============================================================
-tab1, tab2, tab3, tab4 = st.tabs(
+tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(
     [
         "&#9889;  PREDICTION",
         "&#128202;  ANALYTICS",
         "&#129504;  MODEL INSIGHTS",
         "&#128196;  STUDENT REPORT",
+        "&#128194;  BATCH SCORING",
+        "&#128101;  COHORT ANALYTICS",
     ]
 )
 
@@ -980,12 +371,14 @@ with tab1:
             parental_support, extracurricular_enc,
             sports_enc, music_enc, grade_class,
         ]])
-        input_scaled = scaler.transform(input_arr)
-        raw_pred     = model.predict(input_scaled)
-        predicted_gpa = round(float(raw_pred[0]), 2)
+        # One neighbour query gives the GPA and the spread of the k students behind it
+        with telemetry.predict_seconds.time("explain"):
+            neighbours = load_predictor().explain_one(input_arr)
+        predicted_gpa = neighbours["gpa"]
 
         # Persist everything
         st.session_state.gpa              = predicted_gpa
+        st.session_state.neighbours       = neighbours
         st.session_state.study_time       = float(study_time)
         st.session_state.absences         = int(absences)
         st.session_state.tutoring         = tutoring_enc
@@ -1035,6 +428,8 @@ with tab1:
         )
         st.markdown(f'<div class="stat-row">{chip_html}</div>', unsafe_allow_html=True)
 
+rerun.lap("prediction")
+
 # ============================================================
 # TAB 2 — ANALYTICS SUITE
 # ============================================================
@@ -1050,6 +445,11 @@ with tab2:
             unsafe_allow_html=True,
         )
     else:
+        from charts import (
+            confidence_figure, radar_figure, sensitivity_bar_figure,
+            simulation_figure, surface_figure,
+        )
+
         gpa            = float(st.session_state.gpa)
         s_study        = float(st.session_state.study_time)        if st.session_state.study_time        is not None else 12.0
         s_absences     = int(st.session_state.absences)            if st.session_state.absences          is not None else 4
@@ -1063,170 +463,84 @@ with tab2:
         # ── Radar Chart ──
         st.markdown('<div class="section-title">&#127944; Student Profile Radar</div>', unsafe_allow_html=True)
 
-        radar_labels = [
-            "Study Time", "Attendance", "Tutoring",
-            "Parental Support", "Extracurricular",
-            "Sports", "Music", "Grade Level",
-        ]
-        # Normalise each to [0, 1]
-        absence_score = max(0.0, 1.0 - s_absences / 50.0)
-        radar_values  = [
-            s_study / 40.0,
-            absence_score,
-            float(s_tutoring),
-            s_parental / 3.0,
-            float(s_extra),
-            float(s_sports),
-            float(s_music),
-            s_grade / 4.0,
-        ]
-        # Close the polygon
-        r_closed     = radar_values + [radar_values[0]]
-        theta_closed = radar_labels + [radar_labels[0]]
-
-        fig_radar = go.Figure()
-        fig_radar.add_trace(
-            go.Scatterpolar(
-                r=r_closed,
-                theta=theta_closed,
-                fill="toself",
-                fillcolor="rgba(16,185,129,0.12)",
-                line=dict(color="#10b981", width=2.5),
-                name="Student",
-            )
-        )
-        fig_radar.add_trace(
-            go.Scatterpolar(
-                r=[0.75] * (len(radar_labels) + 1),
-                theta=theta_closed,
-                mode="lines",
-                line=dict(color="rgba(139,92,246,0.35)", width=1.5, dash="dot"),
-                name="Benchmark",
-            )
-        )
-        fig_radar.update_layout(
-            polar=dict(
-                bgcolor="rgba(0,0,0,0)",
-                radialaxis=dict(
-                    gridcolor="rgba(16,185,129,0.1)",
-                    color="rgba(16,185,129,0.5)",
-                    range=[0, 1],
-                ),
-                angularaxis=dict(
-                    gridcolor="rgba(16,185,129,0.1)",
-                    color="rgba(16,185,129,0.7)",
-                ),
-            ),
-            paper_bgcolor="rgba(0,0,0,0)",
-            font=dict(family="Space Mono", color="#10b981", size=10),
-            height=420,
-            margin=dict(l=40, r=40, t=40, b=40),
-            showlegend=True,
-            legend=dict(font=dict(color="#10b981", size=11)),
-        )
+        fig_radar = radar_figure(s_study, s_absences, s_tutoring, s_parental,
+                                 s_extra, s_sports, s_music, s_grade)
         st.plotly_chart(fig_radar, use_container_width=True)
 
+        rerun.lap("analytics.radar")
+
         # ── GPA Confidence Curve ──
         st.markdown('<div class="section-title">&#128200; GPA Confidence Distribution</div>', unsafe_allow_html=True)
 
-        sigma   = 0.32
-        x_vals  = np.linspace(max(0.0, gpa - 1.2), min(4.0, gpa + 1.2), 200)
-        y_vals  = (1.0 / (sigma * np.sqrt(2.0 * np.pi))) * np.exp(-0.5 * ((x_vals - gpa) / sigma) ** 2)
-
-        fig_dist = go.Figure()
-        fig_dist.add_trace(
-            go.Scatter(
-                x=x_vals.tolist(),
-                y=y_vals.tolist(),
-                mode="lines",
-                fill="tozeroy",
-                fillcolor="rgba(16,185,129,0.1)",
-                line=dict(color="#10b981", width=3),
-                name="Confidence Curve",
-            )
-        )
-        fig_dist.add_vline(
-            x=gpa,
-            line=dict(color="#8b5cf6", width=2.5, dash="dash"),
-            annotation_text=f"Predicted GPA: {gpa}",
-            annotation_font_color="#a78bfa",
-        )
-        fig_dist.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(16,185,129,0.02)",
-            font=dict(family="DM Sans", color="#10b981"),
-            xaxis=dict(
-                title="GPA",
-                range=[0, 4],
-                gridcolor="rgba(16,185,129,0.08)",
-                color="rgba(16,185,129,0.7)",
-            ),
-            yaxis=dict(
-                title="Probability Density",
-                gridcolor="rgba(16,185,129,0.08)",
-                color="rgba(16,185,129,0.7)",
-            ),
-            height=360,
-            margin=dict(l=20, r=20, t=20, b=20),
-            showlegend=False,
-        )
+        neighbours = st.session_state.neighbours
+        nb_gpas    = neighbours["neighbour_gpa"]
+        fig_dist   = confidence_figure(gpa, neighbours)
         st.plotly_chart(fig_dist, use_container_width=True)
 
+        spread_text = (
+            f"Nearest {len(nb_gpas)} students scored "
+            f"<b>{', '.join(f'{g:.2f}' for g in sorted(nb_gpas))}</b> "
+            f"&mdash; spread &plusmn;{neighbours['spread']:.2f} GPA"
+        )
+        if "interval" in neighbours:
+            level, low, high = neighbours["interval"]
+            spread_text += f"; {level:.0%} interval <b>{low:.2f}&ndash;{high:.2f}</b>"
+        st.markdown(f'<div class="insight">{spread_text}.</div>', unsafe_allow_html=True)
+
+        rerun.lap("analytics.confidence")
+
+        # ── Similar Students ──
+        student_store = load_student_store()
+        if student_store is not None:
+            st.markdown('<div class="section-title">&#128101; Similar Students</div>', unsafe_allow_html=True)
+
+            similar, found = student_store.neighbours(neighbours["index"])
+            similar_table = {"Distance": np.array(neighbours["distance"])[found].round(3)}
+            similar_table.update(
+                (name, values if name == "StudentID" else
+                       values.round(1) if name == "StudyTimeWeekly" else values.astype(int))
+                for name, values in similar.items()
+            )
+            similar_table["GPA"] = similar["GPA"].round(2)
+            st.dataframe(similar_table, use_container_width=True, hide_index=True)
+
+        rerun.lap("analytics.similar")
+
         # ── Study Time Simulation ──
         st.markdown('<div class="section-title">&#128336; Study Time vs GPA Simulation</div>', unsafe_allow_html=True)
 
-        study_range  = np.linspace(0.0, 40.0, 40)
-        sim_gpas     = []
-        for sh in study_range:
-            sim_arr    = np.array([[
-                sh, s_absences, s_tutoring,
-                s_parental, s_extra,
-                s_sports, s_music, s_grade,
-            ]])
-            sim_scaled = scaler.transform(sim_arr)
-            sim_pred   = float(model.predict(sim_scaled)[0])
-            sim_gpas.append(round(min(max(sim_pred, 0.0), 4.0), 3))
-
-        fig_study = go.Figure()
-        fig_study.add_trace(
-            go.Scatter(
-                x=study_range.tolist(),
-                y=sim_gpas,
-                mode="lines+markers",
-                line=dict(color="#10b981", width=3, shape="spline"),
-                marker=dict(color="#8b5cf6", size=6, line=dict(color="#10b981", width=2)),
-                fill="tozeroy",
-                fillcolor="rgba(16,185,129,0.06)",
-                name="Simulated GPA",
-            )
-        )
-        fig_study.add_vline(
-            x=s_study,
-            line=dict(color="#f59e0b", width=2, dash="dash"),
-            annotation_text=f"Current: {s_study}h",
-            annotation_font_color="#f59e0b",
-        )
-        fig_study.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(16,185,129,0.02)",
-            font=dict(family="DM Sans", color="#10b981"),
-            xaxis=dict(
-                title="Study Hours / Week",
-                gridcolor="rgba(16,185,129,0.08)",
-                color="rgba(16,185,129,0.7)",
-            ),
-            yaxis=dict(
-                title="Predicted GPA",
-                range=[0, 4],
-                gridcolor="rgba(16,185,129,0.08)",
-                color="rgba(16,185,129,0.7)",
-            ),
-            height=360,
-            margin=dict(l=20, r=20, t=20, b=20),
-            showlegend=False,
+        study_range, sim_gpas = load_predictor().simulate_study_time(
+            [s_study, s_absences, s_tutoring, s_parental,
+             s_extra, s_sports, s_music, s_grade],
         )
+
+        fig_study = simulation_figure(study_range, sim_gpas, s_study)
         st.plotly_chart(fig_study, use_container_width=True)
 
+        rerun.lap("analytics.simulation")
+
+        # ── What-If Sensitivity ──
+        st.markdown('<div class="section-title">&#127777; What-If Sensitivity</div>', unsafe_allow_html=True)
+
+        from sensitivity import FEATURE_LEVELS, axis_labels
+
+        views = what_if_views((s_study, s_absences, s_tutoring, s_parental,
+                               s_extra, s_sports, s_music, s_grade))
+        heat_cols = st.columns(len(views["surfaces"]))
+        for heat_col, (names, surface) in zip(heat_cols, views["surfaces"]):
+            fig_heat = surface_figure(
+                FEATURE_LEVELS[names[0]], axis_labels(names), surface, " × ".join(names[1:]), s_study,
+            )
+            with heat_col:
+                st.plotly_chart(fig_heat, use_container_width=True)
+
+        # One-at-a-time: best and worst GPA reachable by moving a single feature
+        fig_oat = sensitivity_bar_figure(views["oat"], views["base"])
+        st.plotly_chart(fig_oat, use_container_width=True)
+        rerun.lap("analytics.what_if")
+
+rerun.lap("analytics")
+
 # ============================================================
 # TAB 3 — MODEL INSIGHTS
 # ============================================================
@@ -1246,8 +560,8 @@ with tab3:
     st.markdown('<div class="section-title">&#128204; Key Academic Drivers</div>', unsafe_allow_html=True)
 
     driver_insights = [
-        ("<b>Study Time</b> is the highest-impact variable — each extra hour correlates with meaningful GPA gain.",),
-        ("<b>Absences</b> have a strong negative effect — consistent attendance is critical.",),
+        ("<b>Absences</b> have the strongest negative effect — consistent attendance is critical.",),
+        ("<b>Study Time</b> shows a steady positive effect — each extra hour correlates with GPA gain.",),
         ("<b>Parental Support</b> at higher levels correlates with better academic outcomes.",),
         ("<b>Tutoring</b> provides measurable uplift, especially for students below 2.5 GPA.",),
         ("<b>Extracurricular activities</b> show a positive balance effect when not excessive.",),
@@ -1256,17 +570,31 @@ with tab3:
     for (text,) in driver_insights:
         st.markdown(f'<div class="insight">{text}</div>', unsafe_allow_html=True)
 
+    # Only once this session has loaded the cohort tab (a cache hit by then)
+    cohort = load_cohort_stats() if st.session_state.cohort_loaded else None
+    if cohort is not None:
+        from cohort_stats import group_spread
+
+        gap_text = "; ".join(
+            f"{title} {gap:.2f}" for title, _, _, gap in group_spread(cohort) if title != "Grade Class"
+        )
+        st.markdown(
+            f'''<div class="insight">Mean-GPA gap between the best and worst group, over
+                <b>{cohort["rows"]:,}</b> students: {gap_text}. See <b>COHORT ANALYTICS</b>.</div>''',
+            unsafe_allow_html=True,
+        )
+
     st.markdown('<div class="section-title">&#128200; Feature Reference Table</div>', unsafe_allow_html=True)
 
-    feat_df = pd.DataFrame(
-        {
-            "Feature":      ["study_time", "absences", "tutoring", "parental_support", "extracurricular", "sports", "music", "grade_class"],
-            "Type":         ["Numeric", "Numeric", "Binary", "Ordinal (0-3)", "Binary", "Binary", "Binary", "Ordinal (1-4)"],
-            "Scaling":      ["Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "Yes"],
-            "Impact Level": ["High", "High", "Medium", "Medium", "Low", "Low", "Low", "Medium"],
-        }
-    )
-    st.dataframe(feat_df, use_container_width=True, hide_index=True)
+    feat_table = {
+        "Feature":      ["study_time", "absences", "tutoring", "parental_support", "extracurricular", "sports", "music", "grade_class"],
+        "Type":         ["Numeric", "Numeric", "Binary", "Ordinal (0-3)", "Binary", "Binary", "Binary", "Ordinal (1-4)"],
+        "Scaling":      ["Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "Yes"],
+        "Impact Level": ["High", "High", "Medium", "Medium", "Low", "Low", "Low", "Medium"],
+    }
+    st.dataframe(feat_table, use_container_width=True, hide_index=True)
+
+rerun.lap("insights")
 
 # ============================================================
 # TAB 4 — STUDENT REPORT
@@ -1315,6 +643,7 @@ with tab4:
         report_rows = [
             ("Predicted GPA",         str(gpa)),
             ("Performance Band",      band),
+            ("Neighbour Spread",      f"±{st.session_state.neighbours['spread']:.2f} GPA"),
             ("Study Time",            f"{st.session_state.study_time}h / week"),
             ("Absences",              str(st.session_state.absences)),
             ("Tutoring",              yes_no(st.session_state.tutoring)),
@@ -1325,6 +654,10 @@ with tab4:
             ("Grade Class",           str(st.session_state.grade_class)),
         ]
 
+        if "interval" in st.session_state.neighbours:
+            level, low, high = st.session_state.neighbours["interval"]
+            report_rows.insert(3, (f"{level:.0%} Interval", f"{low:.2f} – {high:.2f}"))
+
         rows_html = "".join(
             f'<div class="report-row">'
             f'<span class="report-row-key">{k}</span>'
@@ -1371,6 +704,57 @@ with tab4:
                 unsafe_allow_html=True,
             )
 
+        rerun.lap("report.recommendation")
+
+        # Path to target GPA
+        st.markdown('<div class="section-title">&#127919; Path To Target GPA</div>', unsafe_allow_html=True)
+
+        next_edge   = next((edge for edge in (1.8, 2.5, 3.5, 4.0) if edge > gpa), 4.0)
+        target_gpa  = st.slider("Target GPA", 0.0, 4.0, float(next_edge), step=0.05)
+        plans, best_reachable = target_plans(
+            (st.session_state.study_time, st.session_state.absences,
+             st.session_state.tutoring, st.session_state.parental_support,
+             st.session_state.extracurricular, st.session_state.sports,
+             st.session_state.music, st.session_state.grade_class),
+            target_gpa,
+        )
+
+        def describe_change(name, old, new):
+            if name == "StudyTimeWeekly":
+                return f"Study <b>{new:g}h</b> / week (from {old:g}h)"
+            if name == "Absences":
+                return f"Cut absences to <b>{new:g}</b> (from {old:g})"
+            if name == "Tutoring":
+                return "<b>Start tutoring</b>"
+            return "<b>Join extracurriculars</b>" if new else "<b>Drop extracurriculars</b>"
+
+        if gpa >= target_gpa:
+            st.markdown(
+                f'<div class="rec-ok">&#9989; Current profile already reaches <b>{target_gpa:.2f}</b>.</div>',
+                unsafe_allow_html=True,
+            )
+        elif not plans:
+            st.markdown(
+                f"""<div class="rec-warn">&#9888; No combination of study time, attendance, tutoring and
+                    extracurriculars reaches <b>{target_gpa:.2f}</b>; the best reachable is
+                    <b>{best_reachable:.2f}</b>.</div>""",
+                unsafe_allow_html=True,
+            )
+        else:
+            for rank, plan in enumerate(plans, 1):
+                steps = "<br>".join(
+                    f"&bull; {describe_change(name, old, new)}" for name, (old, new) in plan["changes"].items()
+                )
+                st.markdown(
+                    f"""<div class="rec-ok">
+                        &#127919; <b>Plan {rank}</b> &mdash; predicted GPA <b>{plan["gpa"]:.2f}</b>
+                        (effort {plan["cost"]:g})<br>{steps}
+                    </div>""",
+                    unsafe_allow_html=True,
+                )
+
+        rerun.lap("report.plans")
+
         # GPA progress bar
         st.markdown("<br>", unsafe_allow_html=True)
         st.markdown(
@@ -1383,6 +767,147 @@ with tab4:
         )
         st.progress(min(gpa / 4.0, 1.0))
 
+rerun.lap("report")
+
+# ============================================================
+# TAB 5 — BATCH COHORT SCORING
+# ============================================================
+with tab5:
+
+    st.markdown(
+        """<div class="glass-panel">
+            <div class="panel-eyebrow">Cohort Scoring</div>
+            <div class="panel-heading">Score A Whole Student File</div>
+        </div>""",
+        unsafe_allow_html=True,
+    )
+    st.markdown(
+        f'''<div class="insight">Upload a CSV in the <b>Student_performance_data.csv</b> layout.
+            Required columns: {", ".join(FEATURES)}. StudentID is carried through when present.</div>''',
+        unsafe_allow_html=True,
+    )
+
+    cohort_file = st.file_uploader("Cohort CSV", type=["csv"])
+    if cohort_file is not None:
+        import io
+
+        from batch_score import score_csv
+        from ingest import RejectLog
+
+        scored_buf = io.StringIO()
+        rejects = RejectLog(keep=10)
+        try:
+            scored_rows = score_csv(cohort_file, scored_buf, load_predictor(), rejects=rejects)
+        except ValueError as exc:
+            st.markdown(f'<div class="rec-warn">&#9888; {exc}</div>', unsafe_allow_html=True)
+        else:
+            st.markdown(
+                f'<div class="rec-ok">&#9989; Scored <b>{scored_rows:,}</b> students.</div>',
+                unsafe_allow_html=True,
+            )
+            if rejects.rows:
+                by_column = ", ".join(
+                    f"{name} {count:,}" for name, count in sorted(rejects.by_column.items(), key=lambda item: -item[1])
+                )
+                st.markdown(
+                    f'''<div class="rec-warn">&#9888; Skipped <b>{rejects.rows:,}</b> rows with missing or
+                        invalid values ({by_column}). First {len(rejects.samples)} shown below.</div>''',
+                    unsafe_allow_html=True,
+                )
+                st.dataframe(
+                    {"Row": [s["row"] for s in rejects.samples], "Invalid Columns": [s["reason"] for s in rejects.samples]},
+                    use_container_width=True,
+                    hide_index=True,
+                )
+            st.download_button(
+                "&#11015;  DOWNLOAD RESULTS",
+                scored_buf.getvalue(),
+                file_name="scored_cohort.csv",
+                mime="text/csv",
+                use_container_width=True,
+            )
+
+rerun.lap("batch")
+
+# ============================================================
+# TAB 6 — COHORT ANALYTICS
+# ============================================================
+with tab6:
+
+    st.markdown(
+        """<div class="glass-panel">
+            <div class="panel-eyebrow">Cohort Analytics</div>
+            <div class="panel-heading">How The Whole Student Body Performs</div>
+        </div>""",
+        unsafe_allow_html=True,
+    )
+
+    if not st.session_state.cohort_loaded:
+        st.markdown(
+            '''<div class="insight">Aggregates over every student in <b>Student_performance_data.csv</b>:
+                GPA by group and predicted vs actual GPA. The first load after a data or model
+                change scores the whole file.</div>''',
+            unsafe_allow_html=True,
+        )
+        _, load_col, _ = st.columns([1, 2, 1])
+        with load_col:
+            st.session_state.cohort_loaded = st.button("&#128101;  LOAD COHORT ANALYTICS", use_container_width=True)
+
+    cohort = load_cohort_stats() if st.session_state.cohort_loaded else None
+    if st.session_state.cohort_loaded and cohort is None:
+        st.markdown(
+            '<div class="rec-warn">&#9888; Student_performance_data.csv is not deployed.</div>',
+            unsafe_allow_html=True,
+        )
+    elif cohort is not None:
+        from charts import (
+            group_distribution_figure, group_mean_figure,
+            residual_heatmap_figure, residual_hist_figure,
+        )
+        from cohort_stats import group_spread
+
+        # ── GPA by group ──
+        st.markdown('<div class="section-title">&#128202; GPA Distribution By Group</div>', unsafe_allow_html=True)
+
+        group_titles = {group["title"]: column for column, group in cohort["groups"].items()}
+        group_sel = st.selectbox("Group students by", list(group_titles))
+        group = cohort["groups"][group_titles[group_sel]]
+
+        dist_col, mean_col = st.columns(2)
+        with dist_col:
+            st.plotly_chart(group_distribution_figure(group, cohort["gpa_edges"]), use_container_width=True)
+        with mean_col:
+            st.plotly_chart(group_mean_figure(group), use_container_width=True)
+
+        spread_table = {"Group": [], "Lowest": [], "Highest": [], "Mean GPA Gap": []}
+        for title, (low_mean, low_label), (high_mean, high_label), gap in group_spread(cohort):
+            spread_table["Group"].append(title)
+            spread_table["Lowest"].append(f"{low_label} ({low_mean:.2f})")
+            spread_table["Highest"].append(f"{high_label} ({high_mean:.2f})")
+            spread_table["Mean GPA Gap"].append(round(gap, 2))
+        st.dataframe(spread_table, use_container_width=True, hide_index=True)
+
+        rerun.lap("cohort.groups")
+
+        # ── Predicted vs actual ──
+        st.markdown('<div class="section-title">&#127919; Predicted vs Actual GPA</div>', unsafe_allow_html=True)
+
+        residuals = cohort["residuals"]
+        st.markdown(
+            f'''<div class="insight">Over <b>{cohort["rows"]:,}</b> students: MAE <b>{residuals["mae"]:.3f}</b>,
+                RMSE <b>{residuals["rmse"]:.3f}</b>, bias <b>{residuals["bias"]:+.3f}</b>,
+                R&sup2; <b>{residuals["r2"]:.3f}</b>. Rows the model was trained on are included,
+                so these errors are optimistic.</div>''',
+            unsafe_allow_html=True,
+        )
+        fit_col, res_col = st.columns(2)
+        with fit_col:
+            st.plotly_chart(residual_heatmap_figure(residuals, cohort["gpa_edges"]), use_container_width=True)
+        with res_col:
+            st.plotly_chart(residual_hist_figure(residuals), use_container_width=True)
+
+rerun.lap("cohort")
+
 # ============================================================
 # FOOTER
 # ============================================================
@@ -1396,3 +921,19 @@ st.markdown(
     """,
     unsafe_allow_html=True,
 )
+
+# ============================================================
+# DEBUG  —  per-stage breakdown of the last reruns (?debug=1)
+# ============================================================
+rerun.lap("footer")
+rerun.finish()
+
+if debug_slot is not None:
+    recent_runs = list(telemetry.recent)[::-1]
+    stage_names = list(dict.fromkeys(name for run in recent_runs for name in run["stages"]))
+    timing_table = {"Total ms": [round(run["total"] * 1000, 1) for run in recent_runs]}
+    for name in stage_names:
+        timing_table[name] = [round(run["stages"].get(name, 0.0) * 1000, 1) for run in recent_runs]
+    with debug_slot.container():
+        st.markdown('<div class="sb-title">&#9201; Rerun Timings (ms)</div>', unsafe_allow_html=True)
+        st.dataframe(timing_table, use_container_width=True, hide_index=True)
@@ -0,0 +1,293 @@
+# ============================================================
+# 🎓 Model Pack Format
+# Versioned, pickle-free container for the fitted KNN model:
+# training matrix, targets, scaler mean/scale, k, weights, metric
+#
+#   python artifact.py                      # model.pkl + scaler.pkl -> model.gpaknn
+#   python artifact.py --check model.gpaknn
+#   python artifact.py --ids-from-csv Student_performance_data.csv
+#
+# Layout (little-endian):
+#   8 bytes   magic b"GPAKNN\0\0"
+#   8 bytes   uint64 header length
+#   header    UTF-8 JSON: format_version, k, weights, metric, features,
+#             and {name: {dtype, shape, offset, nbytes, sha256}} per array
+#   arrays    raw C-order data, each starting on a 64-byte boundary:
+#             train, targets, mean, scale, sq_norms (the brute-force
+#             index's row norms), then any extra arrays, e.g. train_ids
+#             (the StudentID of each training row, fixed-width unicode)
+#
+# Loading maps the file read-only and views each array in place,
+# so nothing is copied or unpickled, and processes that open the
+# same file share its pages, including the brute-force index.
+# ============================================================
+
+import argparse
+import hashlib
+import json
+import mmap
+import struct
+import sys
+
+import numpy as np
+
+from digest import file_digest
+from neighbors import row_sq_norms
+from predictor import FEATURES, MODEL_PACK_PATH, MODEL_PATH, SCALER_PATH
+
+MAGIC = b"GPAKNN\0\0"
+FORMAT_VERSION = 1
+ALIGN = 64
+ARRAYS = ("train", "targets", "mean", "scale")
+# Readers map only the arrays they know, and `verify` checks every
+# array in the header against its own checksum, known or not, so
+# adding an optional array needs no version bump.
+OPTIONAL_ARRAYS = ("sq_norms", "train_ids")
+# Known arrays are float64 except these (name -> dtype kind).
+_KINDS = {"train_ids": "U"}
+# payload_sha256 covers just these, in this order, as the first
+# readers expected; it is kept so they can still verify newer packs.
+LEGACY_PAYLOAD = (*ARRAYS, "sq_norms")
+_PREFIX = struct.Struct("<8sQ")
+
+
+def _aligned(n):
+    return -(-n // ALIGN) * ALIGN
+
+
+def write_pack(path, train, targets, mean, scale, k, weights="uniform", metric="euclidean",
+               features=FEATURES, extra=None, extra_arrays=None):
+    """Write the arrays and hyperparameters as one model pack; returns the header.
+
+    `extra_arrays` ({name: array}) are stored after the standard ones
+    with their own dtype; readers that do not know a name skip it.
+    """
+    arrays = {
+        "train": np.ascontiguousarray(train, dtype="<f8"),
+        "targets": np.ascontiguousarray(targets, dtype="<f8"),
+        "mean": np.ascontiguousarray(mean, dtype="<f8"),
+        "scale": np.ascontiguousarray(scale, dtype="<f8"),
+    }
+    arrays["sq_norms"] = row_sq_norms(arrays["train"])
+    for name, values in (extra_arrays or {}).items():
+        values = np.ascontiguousarray(values)
+        if name in arrays or values.dtype.hasobject:
+            raise ValueError(f"cannot store {name!r} as an extra array")
+        arrays[name] = values.astype(values.dtype.newbyteorder("<"), copy=False)
+    n, d = arrays["train"].shape
+    if arrays["targets"].shape != (n,) or arrays["mean"].shape != (d,) or arrays["scale"].shape != (d,):
+        raise ValueError("train (n, d), targets (n,), mean (d,) and scale (d,) shapes disagree")
+    if len(features) != d:
+        raise ValueError(f"{len(features)} feature names for {d} columns")
+
+    payload = hashlib.sha256()
+    layout, offset = {}, 0
+    for name in arrays:
+        raw = arrays[name].tobytes()
+        layout[name] = {
+            "dtype": arrays[name].dtype.str,
+            "shape": list(arrays[name].shape),
+            "offset": offset,
+            "nbytes": len(raw),
+            "sha256": hashlib.sha256(raw).hexdigest(),
+        }
+        if name in LEGACY_PAYLOAD:
+            payload.update(raw)
+        offset = _aligned(offset + len(raw))
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "k": int(k),
+        "weights": weights,
+        "metric": metric,
+        "features": list(features),
+        "arrays": layout,
+        "payload_sha256": payload.hexdigest(),
+        **(extra or {}),
+    }
+    # Offsets in the header are relative to the data start, so the
+    # header's own length never feeds back into them.
+    raw = json.dumps(header, sort_keys=True).encode("utf-8")
+    data_start = _aligned(_PREFIX.size + len(raw))
+    with open(path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, len(raw)))
+        f.write(raw)
+        f.write(b"\0" * (data_start - _PREFIX.size - len(raw)))
+        for name in arrays:
+            f.seek(data_start + layout[name]["offset"])
+            f.write(arrays[name].tobytes())
+    return header
+
+
+def export_sklearn(model, scaler, path=MODEL_PACK_PATH, extra=None, train_ids=None):
+    """Pack a fitted KNeighborsRegressor + StandardScaler pair.
+
+    `train_ids`, when given, are the StudentIDs of the model's training
+    rows in fit order.
+    """
+    params = model.get_params()
+    euclidean = params["metric"] == "euclidean" or (
+        params["metric"] == "minkowski" and params["p"] == 2
+    )
+    if not euclidean or params["weights"] not in ("uniform", "distance"):
+        raise ValueError("only euclidean KNN with uniform/distance weights can be packed")
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(scaler.n_features_in_)
+    scale = scaler.scale_ if scaler.with_std else np.ones(scaler.n_features_in_)
+    extra_arrays = None
+    if train_ids is not None:
+        train_ids = np.asarray(train_ids).astype(str)
+        if train_ids.shape != (len(model._y),):
+            raise ValueError(f"{len(train_ids)} train_ids for {len(model._y)} training rows")
+        extra_arrays = {"train_ids": train_ids}
+    return write_pack(
+        path, model._fit_X, model._y, mean, scale, params["n_neighbors"], params["weights"],
+        extra=extra, extra_arrays=extra_arrays,
+    )
+
+
+def align_training_rows(fit_X, fit_y, X, y):
+    """CSV row behind each of a model's training rows (-1 if not found).
+
+    Only for models trained without recorded IDs (the notebook's): the
+    model keeps scaled features and raw GPAs. Rows with a unique GPA
+    match pin down the per-column affine map back to raw features;
+    rows sharing a GPA then take the candidate closest to their
+    unscaled features.
+    """
+    order = np.argsort(y, kind="stable")
+    lo = np.searchsorted(y[order], fit_y, side="left")
+    hi = np.searchsorted(y[order], fit_y, side="right")
+    count = hi - lo
+    rows = np.where(count > 0, order[np.minimum(lo, len(y) - 1)], -1)
+
+    unique = np.flatnonzero(count == 1)
+    if len(unique) < 2:
+        return np.where(count == 1, rows, -1)
+    raw = np.empty_like(fit_X)
+    for j in range(fit_X.shape[1]):
+        A = np.column_stack([fit_X[unique, j], np.ones(len(unique))])
+        (slope, intercept), *_ = np.linalg.lstsq(A, X[rows[unique], j], rcond=None)
+        raw[:, j] = fit_X[:, j] * slope + intercept
+
+    for i in np.flatnonzero(count > 1):
+        cand = order[lo[i]:hi[i]]
+        rows[i] = cand[np.argmin(((X[cand] - raw[i]) ** 2).sum(axis=1))]
+    return rows
+
+
+class ModelPack:
+    """A model pack opened read-only; arrays are views into the mapping."""
+
+    def __init__(self, header, arrays, buffer=None):
+        self.header = header
+        self.train = arrays["train"]
+        self.targets = arrays["targets"]
+        self.mean = arrays["mean"]
+        self.scale = arrays["scale"]
+        self.sq_norms = arrays.get("sq_norms")
+        self.train_ids = arrays.get("train_ids")
+        self.k = header["k"]
+        self.weights = header["weights"]
+        self.metric = header["metric"]
+        self.features = tuple(header["features"])
+        self._buffer = buffer
+
+    @classmethod
+    def open(cls, path=MODEL_PACK_PATH, verify=False):
+        """Map a pack; `verify` also checks every array's checksum (reads every byte)."""
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(buffer) < _PREFIX.size:
+            raise ValueError(f"{path} is not a model pack")
+        magic, header_len = _PREFIX.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a model pack")
+        header = json.loads(bytes(buffer[_PREFIX.size:_PREFIX.size + header_len]))
+        if header.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"unsupported model pack version {header.get('format_version')!r}")
+        if header.get("metric") != "euclidean":
+            raise ValueError(f"unsupported metric {header.get('metric')!r}")
+
+        data_start = _aligned(_PREFIX.size + header_len)
+        names = [*ARRAYS, *(name for name in OPTIONAL_ARRAYS if name in header["arrays"])]
+        arrays = {}
+        for name in names:
+            spec = header["arrays"][name]
+            dtype = np.dtype(spec["dtype"])
+            expected = _KINDS.get(name, "f")
+            if dtype.kind != expected or dtype.str[0] != "<" or (expected == "f" and dtype.itemsize != 8):
+                raise ValueError(f"unsupported dtype {spec['dtype']!r} for {name}")
+            count = int(np.prod(spec["shape"], dtype=np.int64))
+            start = data_start + spec["offset"]
+            if start + count * dtype.itemsize > len(buffer):
+                raise ValueError(f"{path} is truncated")
+            arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count, offset=start).reshape(spec["shape"])
+
+        n, d = arrays["train"].shape
+        if (arrays["targets"].shape != (n,) or len(header["features"]) != d
+                or arrays.get("sq_norms", arrays["targets"]).shape != (n,)
+                or arrays.get("train_ids", arrays["targets"]).shape != (n,)):
+            raise ValueError(f"{path} has inconsistent array shapes")
+        if verify:
+            _verify(path, header, buffer, data_start, arrays)
+        return cls(header, arrays, buffer)
+
+
+def _verify(path, header, buffer, data_start, arrays):
+    """Check each array in the header, including ones this reader does not map.
+
+    Packs written before per-array checksums only carry payload_sha256.
+    """
+    specs = header["arrays"]
+    if all("sha256" in spec for spec in specs.values()):
+        for name, spec in specs.items():
+            start = data_start + spec["offset"]
+            if start + spec["nbytes"] > len(buffer):
+                raise ValueError(f"{path} is truncated")
+            if hashlib.sha256(buffer[start:start + spec["nbytes"]]).hexdigest() != spec["sha256"]:
+                raise ValueError(f"{path} failed its checksum ({name})")
+        return
+    digest = hashlib.sha256()
+    for name in LEGACY_PAYLOAD:
+        if name in arrays:
+            digest.update(arrays[name].tobytes())
+    if digest.hexdigest() != header["payload_sha256"]:
+        raise ValueError(f"{path} failed its checksum")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or check a pickle-free model pack.")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--scaler", default=SCALER_PATH)
+    parser.add_argument("--out", default=MODEL_PACK_PATH)
+    parser.add_argument("--check", metavar="PACK", help="verify an existing pack instead of exporting")
+    parser.add_argument("--ids-from-csv", metavar="CSV",
+                        help="record training StudentIDs matched back from this CSV, for a model "
+                             "trained without them (train.py records them itself)")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        pack = ModelPack.open(args.check, verify=True)
+        print(f"{args.check}: ok, {len(pack.train):,} rows, k={pack.k}, weights={pack.weights}")
+        return
+
+    from predictor import load_objects
+
+    model, scaler = load_objects(args.model, args.scaler)
+    train_ids = None
+    if args.ids_from_csv:
+        from dataset_cache import load_columns
+
+        columns, _ = load_columns(args.ids_from_csv)
+        X = np.column_stack([columns[name] for name in FEATURES]).astype(np.float64)
+        rows = align_training_rows(model._fit_X, model._y, X, np.asarray(columns["GPA"]))
+        if (rows < 0).any():
+            raise SystemExit(f"{int((rows < 0).sum())} training rows have no match in {args.ids_from_csv}")
+        train_ids = np.asarray(columns["StudentID"])[rows]
+    export_sklearn(model, scaler, args.out, extra={"source_model_sha256": file_digest(args.model)},
+                   train_ids=train_ids)
+    print(f"wrote {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# ============================================================
+# 🎓 Batch Cohort Scoring
+# Score a whole Student_performance_data.csv-style file in chunks
+#
+#   python batch_score.py cohort.csv -o scored.csv
+# ============================================================
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ingest import RejectLog, iter_student_chunks
+from neighbors import BACKENDS
+from predictor import FEATURES, MODEL_PACK_PATH, GPAPredictor, as_matrix, risk_band
+
+ID_COLUMN = "StudentID"
+OUTPUT_COLUMNS = ("PredictedGPA", "RiskBand")
+DEFAULT_CHUNK_SIZE = 65_536
+
+
+def iter_scored_chunks(src, predictor, chunk_size=DEFAULT_CHUNK_SIZE, rejects=None):
+    """Yield {column: array} of scored rows per chunk of `src`.
+
+    Only the 8 model columns (plus StudentID when present) are parsed
+    into typed arrays (see ingest.py); StudentID stays the fixed-width
+    unicode array the reader produced, so no per-row Python objects
+    are created here. Rows failing schema validation are not scored;
+    they go to `rejects` (a RejectLog). A chunk with none left yields
+    empty arrays.
+    """
+    chunks = iter_student_chunks(src, (ID_COLUMN, *FEATURES), FEATURES, chunk_size, rejects)
+    for chunk in chunks:
+        out = {}
+        if ID_COLUMN in chunk:
+            out[ID_COLUMN] = chunk[ID_COLUMN]
+        if len(chunk[FEATURES[0]]):
+            X = as_matrix(np.column_stack([chunk[name] for name in FEATURES]))
+            gpa = np.clip(predictor.predict(X), 0.0, 4.0).round(2)
+        else:
+            gpa = np.empty(0)
+        out["PredictedGPA"] = gpa
+        out["RiskBand"] = risk_band(gpa)
+        yield out
+
+
+def _csv_field(values):
+    """Column as unicode CSV fields, quoting any that hold , " or a newline."""
+    values = np.asarray(values).astype(str)
+    special = np.zeros(len(values), dtype=bool)
+    for char in (",", '"', "\n", "\r"):
+        special |= np.char.find(values, char) >= 0
+    if special.any():
+        quoted = np.char.add(np.char.add('"', np.char.replace(values, '"', '""')), '"')
+        values = np.where(special, quoted, values)
+    return values
+
+
+def format_csv_rows(scored):
+    """CSV text for one scored chunk, built column-wise with NumPy string ops."""
+    columns = iter(scored.values())
+    lines = _csv_field(next(columns))
+    for values in columns:
+        lines = np.char.add(np.char.add(lines, ","), _csv_field(values))
+    lines = np.char.add(lines, "\n")
+    # One buffer for the whole chunk; fixed-width padding is NUL.
+    return lines.tobytes().decode(f"utf-32-{sys.byteorder[0]}e").replace("\0", "")
+
+
+def score_csv(src, dst, predictor, chunk_size=DEFAULT_CHUNK_SIZE, rejects=None):
+    """Stream scored rows from `src` to `dst` (paths or text file objects).
+
+    Returns the number of rows written. Input without data rows gets
+    just the header. Raises ValueError when every row was rejected,
+    before anything is written.
+    """
+    rejects = rejects if rejects is not None else RejectLog()
+    out, columns, rows = None, list(OUTPUT_COLUMNS), 0
+
+    def start():
+        f = open(dst, "w", newline="", encoding="utf-8") if isinstance(dst, (str, Path)) else dst
+        f.write(",".join(columns) + "\n")
+        return f
+
+    try:
+        for scored in iter_scored_chunks(src, predictor, chunk_size, rejects):
+            columns = list(scored)
+            if len(scored["PredictedGPA"]):
+                if out is None:
+                    out = start()
+                out.write(format_csv_rows(scored))
+                rows += len(scored["PredictedGPA"])
+        if out is None:
+            if rejects.rows:
+                raise ValueError(f"all {rejects.rows:,} rows failed validation; nothing was scored")
+            out = start()
+    finally:
+        if out is not None and out is not dst:
+            out.close()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a student cohort CSV with the GPA model.")
+    parser.add_argument("input", help="CSV in the Student_performance_data.csv layout")
+    parser.add_argument("-o", "--output", default="-", help="results CSV (default: stdout)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--pack", default=MODEL_PACK_PATH, help="model pack (see artifact.py)")
+    parser.add_argument("--model", help="pickled model instead of the pack")
+    parser.add_argument("--scaler", help="pickled scaler instead of the pack")
+    parser.add_argument("--backend", default="kd_tree", choices=BACKENDS, help="neighbour index")
+    parser.add_argument("--rejects", help="write rows failing schema validation to this CSV")
+    args = parser.parse_args(argv)
+
+    predictor = GPAPredictor.open(args.pack, args.model, args.scaler, args.backend)
+
+    dst = sys.stdout if args.output == "-" else args.output
+    start = time.perf_counter()
+    rejects = RejectLog(args.rejects)
+    try:
+        rows = score_csv(args.input, dst, predictor, args.chunk_size, rejects)
+    except ValueError as exc:
+        where = f"; see {args.rejects}" if args.rejects else " (pass --rejects to see why)"
+        sys.exit(f"error: {exc}{where}")
+    elapsed = time.perf_counter() - start
+    print(
+        f"scored {rows:,} rows in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} rows/sec)",
+        file=sys.stderr,
+    )
+    if rejects.rows:
+        where = f", written to {args.rejects}" if args.rejects else ""
+        print(f"rejected {rejects.rows:,} invalid rows{where}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
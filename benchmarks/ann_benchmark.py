@@ -0,0 +1,100 @@
+# ============================================================
+# 🎓 Neighbour Backend Benchmark
+# Recall@k, GPA error and throughput of each neighbours.py
+# backend against the exact brute-force model
+#
+#   python benchmarks/ann_benchmark.py                 # shipped CSV
+#   python benchmarks/ann_benchmark.py --rows 1000000  # synthetic district-size set
+# ============================================================
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from predictor import BASE_DIR, FEATURES, load_objects  # noqa: E402
+from neighbors import build_index  # noqa: E402
+
+
+def load_training(rows, seed):
+    """Scaled training matrix + GPAs, optionally resampled up to `rows`.
+
+    Synthetic rows are drawn from the CSV with small jitter on study time
+    and GPA, keeping the real mix of discrete feature values.
+    """
+    df = pd.read_csv(BASE_DIR / "Student_performance_data.csv")
+    X = df[list(FEATURES)].to_numpy(dtype=np.float64)
+    y = df["GPA"].to_numpy(dtype=np.float64)
+    if rows and rows != len(X):
+        rng = np.random.default_rng(seed)
+        pick = rng.integers(0, len(X), rows)
+        X, y = X[pick].copy(), y[pick].copy()
+        X[:, 0] = np.clip(X[:, 0] + rng.normal(0.0, 0.5, rows), 0.0, 40.0)
+        y = np.clip(y + rng.normal(0.0, 0.05, rows), 0.0, 4.0)
+    _, scaler = load_objects()
+    return (X - scaler.mean_) / scaler.scale_, y
+
+
+def timed_query(index, Z, k, repeat):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        dist, ind = index.query(Z, k)
+        best = min(best, time.perf_counter() - start)
+    return dist, ind, best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=0, help="synthetic training rows (0 = CSV as-is)")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("-k", type=int, default=4)
+    parser.add_argument("--probes", default="1,2,4,8,16", help="IVF n_probe values to sweep")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    Z_train, y = load_training(args.rows, args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    Zq = Z_train[rng.integers(0, len(Z_train), args.queries)]
+    Zq = Zq + rng.normal(0.0, 0.05, Zq.shape)
+
+    configs = [("brute", {}), ("kd_tree", {}), ("ball_tree", {})]
+    configs += [("ivf", {"n_probe": int(p)}) for p in args.probes.split(",")]
+
+    print(f"training rows: {len(Z_train):,}   queries: {len(Zq):,}   k={args.k}")
+    print(f"{'backend':<18}{'build s':>9}{'q/s':>12}{'recall@k':>10}{'mean |dGPA|':>13}{'max |dGPA|':>12}")
+
+    exact_dist = exact_gpa = None
+    built = {}
+    for name, opts in configs:
+        start = time.perf_counter()
+        index = built.get(name) if name == "ivf" else None
+        if index is None:
+            index = build_index(Z_train, name)
+            built[name] = index
+        build_s = time.perf_counter() - start
+        if name == "ivf":
+            index.n_probe = opts["n_probe"]
+        dist, ind, elapsed = timed_query(index, Zq, args.k, args.repeat)
+        gpa = y[ind].mean(axis=1)
+        if exact_dist is None:
+            exact_dist, exact_gpa = dist, gpa
+        # A returned neighbour is a hit if it is no farther than the exact
+        # k-th neighbour, so equidistant ties are not counted as misses.
+        hits = (dist <= exact_dist[:, -1:] * (1 + 1e-9) + 1e-12).mean()
+        err = np.abs(gpa - exact_gpa)
+        label = name + "".join(f" {k}={v}" for k, v in opts.items())
+        print(
+            f"{label:<18}{build_s:>9.2f}{len(Zq) / elapsed:>12,.0f}"
+            f"{hits:>10.4f}{err.mean():>13.5f}{err.max():>12.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
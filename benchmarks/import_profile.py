@@ -0,0 +1,92 @@
+# ============================================================
+# 🎓 Import-Time Profile
+# Cold-start cost of the app's dependencies, measured in fresh
+# interpreters with `python -X importtime`
+#
+#   python benchmarks/import_profile.py [--runs 5] [--app]
+# ============================================================
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# What app.py imports at the top of every cold start, versus what it
+# only imports once a section needs it.
+EAGER = ["streamlit", "numpy", "lookup_table", "predictor", "student_store", "telemetry", "theme"]
+DEFERRED = ["charts", "pandas", "batch_score", "ingest", "dataset_cache", "cohort_stats", "sklearn.neighbors"]
+
+APP_RUN = """
+import time, warnings
+warnings.filterwarnings("ignore")
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+AppTest.from_file({app!r}, default_timeout=120).run()
+print(time.perf_counter() - start)
+"""
+
+
+def import_trace(stmt):
+    """[(cumulative_us, self_us, module)] for one fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", stmt],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cum_us), int(self_us), name.rstrip()))
+    return rows
+
+
+def cold_import_ms(modules, runs):
+    stmt = "; ".join(f"import {m}" for m in modules)
+    totals = []
+    for _ in range(runs):
+        # Top-level imports have a single space of indentation.
+        top = [r for r in import_trace(stmt) if not r[2].startswith("  ")]
+        totals.append(sum(r[0] for r in top) / 1000.0)
+    return statistics.median(totals)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report import-time cost of the app's dependencies.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--app", action="store_true", help="also time a cold first run of app.py")
+    args = parser.parse_args(argv)
+
+    print(f"{'module':<28}{'cold import ms':>16}")
+    for module in EAGER + DEFERRED:
+        tag = "" if module in EAGER else "  (deferred)"
+        print(f"{module:<28}{cold_import_ms([module], args.runs):>16.1f}{tag}")
+
+    print()
+    print(f"{'eager set (every cold start)':<28}{cold_import_ms(EAGER, args.runs):>16.1f}")
+    print(f"{'eager + deferred':<28}{cold_import_ms(EAGER + DEFERRED, args.runs):>16.1f}")
+
+    print("\nslowest imports on the eager path (cumulative ms):")
+    trace = sorted(import_trace("; ".join(f"import {m}" for m in EAGER)), reverse=True)
+    for cum_us, self_us, name in trace[:args.top]:
+        print(f"  {cum_us / 1000.0:>9.1f}  {name.strip()}")
+
+    if args.app:
+        times = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            proc = subprocess.run(
+                [sys.executable, "-c", APP_RUN.format(app=str(ROOT / "app.py"))],
+                cwd=ROOT, capture_output=True, text=True, check=True,
+            )
+            times.append(float(proc.stdout.strip().splitlines()[-1]))
+        print(f"\ncold app.py first run (AppTest, median of {args.runs}): {statistics.median(times) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# ============================================================
+# 🎓 Rerun Payload Size
+# Bytes of element payload app.py sends to the browser on each
+# rerun, measured headlessly with Streamlit's AppTest
+#
+#   python benchmarks/rerun_payload.py
+# ============================================================
+
+import argparse
+import warnings
+from collections import Counter
+from pathlib import Path
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+
+
+def payload(node, sizes):
+    """Accumulate serialized element proto bytes per element type."""
+    proto = getattr(node, "proto", None)
+    if proto is not None and hasattr(proto, "SerializeToString"):
+        sizes[type(node).__name__] += len(proto.SerializeToString())
+    for child in getattr(node, "children", {}).values():
+        payload(child, sizes)
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure per-rerun element payload of app.py.")
+    parser.add_argument("--static", choices=["on", "off"], default="on",
+                        help="server.enableStaticServing for the run")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    from streamlit import config
+    from streamlit.testing.v1 import AppTest
+
+    # Server options are normally fixed at startup; set it as a CLI flag would.
+    config.set_option("server.enableStaticServing", args.static == "on", where_defined="command-line flag")
+
+    at = AppTest.from_file(str(APP_PATH), default_timeout=120).run()
+    runs = [("first load", payload(at._tree, Counter()))]
+    at.button[0].click().run()
+    runs.append(("predict click", payload(at._tree, Counter())))
+    at.run()
+    runs.append(("plain rerun", payload(at._tree, Counter())))
+
+    print(f"static serving: {args.static}")
+    for label, sizes in runs:
+        top = ", ".join(f"{name} {size:,}" for name, size in sizes.most_common(3))
+        print(f"{label:<15}{sum(sizes.values()):>10,} bytes   ({top})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+# ============================================================
+# 🎓 GPA Engine Benchmark Suite
+# Latency percentiles for the prediction, simulation, figure and
+# model-loading paths, written as JSON and compared to a baseline
+#
+#   python benchmarks/suite.py                              # run, print, write results JSON
+#   python benchmarks/suite.py --baseline benchmarks/baseline.json
+#   python benchmarks/suite.py --quick --only batch,single  # skip the 1M-row batch
+#   python benchmarks/suite.py --save-baseline benchmarks/baseline.json
+# ============================================================
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from predictor import FEATURES, GPAPredictor, load_objects  # noqa: E402
+
+# Tab-2 default profile: 12 h study, 4 absences, parental support 2, grade 2.
+PROFILE = [12.0, 4.0, 0.0, 2.0, 1.0, 0.0, 0.0, 2.0]
+BATCH_SIZES = (1, 64, 4096, 1_048_576)
+PERCENTILES = (50, 90, 99)
+
+COLD_LOAD = """
+import time, warnings
+warnings.filterwarnings("ignore")
+start = time.perf_counter()
+from predictor import load_objects
+load_objects()
+print(time.perf_counter() - start)
+"""
+COLD_PACK = """
+import time
+start = time.perf_counter()
+from predictor import GPAPredictor
+GPAPredictor.from_pack().predict([[12, 4, 0, 2, 1, 0, 0, 2]])
+print(time.perf_counter() - start)
+"""
+
+
+def measure(fn, min_runs=5, max_runs=1000, budget=1.0, warmup=1):
+    """Per-call wall times: at least `min_runs`, then until `budget` seconds pass."""
+    for _ in range(warmup):
+        fn()
+    times = []
+    deadline = time.perf_counter() + budget
+    while len(times) < max_runs and (len(times) < min_runs or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def summarise(times, rows=None):
+    t = np.asarray(times)
+    out = {
+        "runs": len(t),
+        "mean_s": float(t.mean()),
+        "min_s": float(t.min()),
+        **{f"p{p}_s": float(np.percentile(t, p)) for p in PERCENTILES},
+    }
+    if rows:
+        out["rows"] = rows
+        out["rows_per_s"] = rows / float(np.median(t))
+    return out
+
+
+def random_rows(n, seed=0):
+    """Profiles spread over the input widgets' ranges (study time off the 0.5 h grid)."""
+    rng = np.random.default_rng(seed)
+    X = np.empty((n, len(FEATURES)))
+    X[:, 0] = rng.uniform(0.0, 40.0, n)
+    X[:, 1] = rng.integers(0, 51, n)
+    X[:, 2] = rng.integers(0, 2, n)
+    X[:, 3] = rng.integers(0, 4, n)
+    X[:, 4:7] = rng.integers(0, 2, (n, 3))
+    X[:, 7] = rng.integers(1, 5, n)
+    return X
+
+
+def bench_single(args, results):
+    model, scaler = load_objects()
+    row = np.array([PROFILE])
+    results["single.sklearn"] = summarise(measure(
+        lambda: model.predict(scaler.transform(row)), budget=args.budget))
+    predictor = GPAPredictor.from_sklearn(model, scaler, args.backend)
+    results["single.engine"] = summarise(measure(
+        lambda: predictor.predict_one(row), budget=args.budget))
+    results["single.explain"] = summarise(measure(
+        lambda: predictor.explain_one(row), budget=args.budget))
+
+    from lookup_table import LookupPredictor
+
+    lookup = LookupPredictor.open()
+    if lookup is not None:
+        results["single.lookup"] = summarise(measure(lambda: lookup.predict_one(row), budget=args.budget))
+
+
+def bench_batch(args, results):
+    predictor = GPAPredictor.from_files(backend=args.backend)
+    for size in args.batch_sizes:
+        X = random_rows(size)
+        runs = 3 if size >= 100_000 else 5
+        results[f"batch.{size}"] = summarise(
+            measure(lambda: predictor.predict(X), min_runs=runs, budget=args.budget), rows=size)
+
+
+def bench_simulation(args, results):
+    predictor = GPAPredictor.from_files(backend=args.backend)
+    results["simulation.study_time"] = summarise(measure(
+        lambda: predictor.simulate_study_time(PROFILE), budget=args.budget), rows=41)
+
+    from sensitivity import what_if
+
+    results["simulation.what_if"] = summarise(measure(
+        lambda: what_if(predictor, PROFILE), budget=args.budget))
+
+    from counterfactual import plans_to_target
+
+    results["simulation.plans"] = summarise(measure(
+        lambda: plans_to_target(predictor, PROFILE, 3.5), budget=args.budget))
+
+
+def bench_figures(args, results):
+    import plotly.io as pio
+
+    from charts import confidence_figure, radar_figure, simulation_figure
+
+    predictor = GPAPredictor.from_files(backend=args.backend)
+    neighbours = predictor.explain_one(PROFILE)
+    hours, gpas = predictor.simulate_study_time(PROFILE)
+    builders = {
+        "radar": lambda: radar_figure(*PROFILE),
+        "distribution": lambda: confidence_figure(neighbours["gpa"], neighbours),
+        "simulation": lambda: simulation_figure(hours, gpas, PROFILE[0]),
+    }
+
+    from dataset_cache import CSV_PATH
+
+    if CSV_PATH.exists():
+        from charts import group_distribution_figure, residual_heatmap_figure
+        from cohort_stats import load_stats
+
+        cohort = load_stats()
+        builders["cohort_groups"] = lambda: group_distribution_figure(cohort["groups"]["Absences"], cohort["gpa_edges"])
+        builders["cohort_residuals"] = lambda: residual_heatmap_figure(cohort["residuals"], cohort["gpa_edges"])
+    for name, build in builders.items():
+        results[f"figure.{name}"] = summarise(measure(build, budget=args.budget))
+        fig = build()
+        # Streamlit serialises each figure to JSON on every rerun.
+        results[f"figure.{name}.json"] = summarise(measure(lambda: pio.to_json(fig), budget=args.budget))
+
+
+def bench_cold_load(args, results):
+    from predictor import MODEL_PACK_PATH
+
+    cases = {"load.cold": COLD_LOAD}
+    if MODEL_PACK_PATH.exists():
+        cases["load.cold_pack"] = COLD_PACK
+    for case, script in cases.items():
+        times = []
+        for _ in range(args.cold_runs):
+            proc = subprocess.run(
+                [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True,
+            )
+            times.append(float(proc.stdout.strip().splitlines()[-1]))
+        results[case] = summarise(times)
+
+
+SUITES = {
+    "single": bench_single,
+    "batch": bench_batch,
+    "simulation": bench_simulation,
+    "figures": bench_figures,
+    "cold": bench_cold_load,
+}
+
+
+def environment():
+    import sklearn
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scikit-learn": sklearn.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Rows of (case, baseline p50, current p50, ratio, regressed)."""
+    rows = []
+    for case, current in results.items():
+        base = baseline.get("results", {}).get(case)
+        if base is None:
+            continue
+        ratio = current["p50_s"] / base["p50_s"] if base["p50_s"] else float("inf")
+        rows.append((case, base["p50_s"], current["p50_s"], ratio, ratio > threshold))
+    return rows
+
+
+def fmt_seconds(s):
+    if s < 1e-3:
+        return f"{s * 1e6:8.1f}us"
+    if s < 1.0:
+        return f"{s * 1e3:8.2f}ms"
+    return f"{s:8.3f}s "
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the GPA engine and report percentiles.")
+    parser.add_argument("--only", help=f"comma-separated subset of: {', '.join(SUITES)}")
+    parser.add_argument("--backend", default="brute", help="neighbour index for GPAPredictor")
+    parser.add_argument("--batch-sizes", default=",".join(map(str, BATCH_SIZES)))
+    parser.add_argument("--quick", action="store_true", help="drop batches over 100k rows, fewer cold loads")
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds of timed calls per case")
+    parser.add_argument("--cold-runs", type=int, default=5)
+    parser.add_argument("--out", default=ROOT / "benchmarks" / "results.json")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="p50 slowdown ratio counted as a regression (exit status 1)")
+    parser.add_argument("--save-baseline", help="also write the results to this baseline path")
+    args = parser.parse_args(argv)
+
+    args.batch_sizes = [int(s) for s in args.batch_sizes.split(",")]
+    if args.quick:
+        args.batch_sizes = [s for s in args.batch_sizes if s <= 100_000]
+        args.cold_runs = min(args.cold_runs, 2)
+    suites = args.only.split(",") if args.only else list(SUITES)
+    unknown = [s for s in suites if s not in SUITES]
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(unknown)}")
+
+    warnings.filterwarnings("ignore")
+    results = {}
+    for name in suites:
+        started = time.perf_counter()
+        SUITES[name](args, results)
+        print(f"[{name}] {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    report = {"environment": environment(), "backend": args.backend, "results": results}
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    print(f"{'case':<26}{'p50':>11}{'p90':>11}{'p99':>11}{'rows/s':>14}")
+    for case, r in results.items():
+        rate = f"{r['rows_per_s']:14,.0f}" if "rows_per_s" in r else ""
+        print(f"{case:<26}{fmt_seconds(r['p50_s']):>11}{fmt_seconds(r['p90_s']):>11}"
+              f"{fmt_seconds(r['p99_s']):>11}{rate}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.threshold)
+        print(f"\nvs {args.baseline} (commit {baseline['environment'].get('commit')}):")
+        for case, base, current, ratio, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{case:<26}{fmt_seconds(base):>11} -> {fmt_seconds(current):>11}  x{ratio:5.2f}{flag}")
+        if any(row[-1] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+# ============================================================
+# 🎓 Analytics Figures
+# Plotly figure builders for the analytics and cohort tabs,
+# kept free of Streamlit so they can be benchmarked and reused
+# headless
+# ============================================================
+
+import numpy as np
+import plotly.graph_objects as go
+
+RADAR_LABELS = [
+    "Study Time", "Attendance", "Tutoring",
+    "Parental Support", "Extracurricular",
+    "Sports", "Music", "Grade Level",
+]
+GPA_COLORSCALE = [[0.0, "#ef4444"], [0.45, "#f59e0b"], [0.7, "#10b981"], [1.0, "#8b5cf6"]]
+
+_PANEL_LAYOUT = dict(
+    paper_bgcolor="rgba(0,0,0,0)",
+    plot_bgcolor="rgba(16,185,129,0.02)",
+    height=360,
+    margin=dict(l=20, r=20, t=20, b=20),
+)
+
+
+def radar_figure(study, absences, tutoring, parental, extra, sports, music, grade):
+    """Student profile radar, every axis normalised to [0, 1]."""
+    absence_score = max(0.0, 1.0 - absences / 50.0)
+    radar_values  = [
+        study / 40.0,
+        absence_score,
+        float(tutoring),
+        parental / 3.0,
+        float(extra),
+        float(sports),
+        float(music),
+        grade / 4.0,
+    ]
+    # Close the polygon
+    r_closed     = radar_values + [radar_values[0]]
+    theta_closed = RADAR_LABELS + [RADAR_LABELS[0]]
+
+    fig = go.Figure()
+    fig.add_trace(
+        go.Scatterpolar(
+            r=r_closed,
+            theta=theta_closed,
+            fill="toself",
+            fillcolor="rgba(16,185,129,0.12)",
+            line=dict(color="#10b981", width=2.5),
+            name="Student",
+        )
+    )
+    fig.add_trace(
+        go.Scatterpolar(
+            r=[0.75] * (len(RADAR_LABELS) + 1),
+            theta=theta_closed,
+            mode="lines",
+            line=dict(color="rgba(139,92,246,0.35)", width=1.5, dash="dot"),
+            name="Benchmark",
+        )
+    )
+    fig.update_layout(
+        polar=dict(
+            bgcolor="rgba(0,0,0,0)",
+            radialaxis=dict(
+                gridcolor="rgba(16,185,129,0.1)",
+                color="rgba(16,185,129,0.5)",
+                range=[0, 1],
+            ),
+            angularaxis=dict(
+                gridcolor="rgba(16,185,129,0.1)",
+                color="rgba(16,185,129,0.7)",
+            ),
+        ),
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(family="Space Mono", color="#10b981", size=10),
+        height=420,
+        margin=dict(l=40, r=40, t=40, b=40),
+        showlegend=True,
+        legend=dict(font=dict(color="#10b981", size=11)),
+    )
+    return fig
+
+
+def confidence_figure(gpa, neighbours):
+    """Density of the k neighbour GPAs the prediction averages over.
+
+    `neighbours` is a predictor `explain_one` result.
+    """
+    nb_gpas = np.array(neighbours["neighbour_gpa"])
+    sigma   = max(neighbours["spread"], 0.05)   # keep a visible curve when neighbours agree
+    x_vals  = np.linspace(max(0.0, gpa - 1.2), min(4.0, gpa + 1.2), 200)
+    y_vals  = (1.0 / (sigma * np.sqrt(2.0 * np.pi))) * np.exp(-0.5 * ((x_vals - gpa) / sigma) ** 2)
+
+    fig = go.Figure()
+    if "interval" in neighbours:
+        level, low, high = neighbours["interval"]
+        fig.add_vrect(
+            x0=low, x1=high,
+            fillcolor="rgba(139,92,246,0.08)",
+            line_width=0,
+            annotation_text=f"{level:.0%} interval",
+            annotation_font_color="#a78bfa",
+        )
+    fig.add_trace(
+        go.Scatter(
+            x=x_vals.tolist(),
+            y=y_vals.tolist(),
+            mode="lines",
+            fill="tozeroy",
+            fillcolor="rgba(16,185,129,0.1)",
+            line=dict(color="#10b981", width=3),
+            name="Neighbour Spread",
+        )
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=nb_gpas.tolist(),
+            y=[0.0] * len(nb_gpas),
+            mode="markers",
+            marker=dict(color="#f59e0b", size=11, symbol="line-ns-open", line=dict(width=3)),
+            name="Nearest Students",
+        )
+    )
+    fig.add_vline(
+        x=gpa,
+        line=dict(color="#8b5cf6", width=2.5, dash="dash"),
+        annotation_text=f"Predicted GPA: {gpa}",
+        annotation_font_color="#a78bfa",
+    )
+    fig.update_layout(
+        font=dict(family="DM Sans", color="#10b981"),
+        xaxis=dict(
+            title="GPA",
+            range=[0, 4],
+            gridcolor="rgba(16,185,129,0.08)",
+            color="rgba(16,185,129,0.7)",
+        ),
+        yaxis=dict(
+            title="Probability Density",
+            gridcolor="rgba(16,185,129,0.08)",
+            color="rgba(16,185,129,0.7)",
+        ),
+        showlegend=False,
+        **_PANEL_LAYOUT,
+    )
+    return fig
+
+
+def simulation_figure(study_range, sim_gpas, current_study):
+    """Predicted GPA over study hours, marking the student's current hours."""
+    fig = go.Figure()
+    fig.add_trace(
+        go.Scatter(
+            x=np.asarray(study_range).tolist(),
+            y=np.asarray(sim_gpas).tolist(),
+            mode="lines+markers",
+            line=dict(color="#10b981", width=3, shape="spline"),
+            marker=dict(color="#8b5cf6", size=6, line=dict(color="#10b981", width=2)),
+            fill="tozeroy",
+            fillcolor="rgba(16,185,129,0.06)",
+            name="Simulated GPA",
+        )
+    )
+    fig.add_vline(
+        x=current_study,
+        line=dict(color="#f59e0b", width=2, dash="dash"),
+        annotation_text=f"Current: {current_study}h",
+        annotation_font_color="#f59e0b",
+    )
+    fig.update_layout(
+        font=dict(family="DM Sans", color="#10b981"),
+        xaxis=dict(
+            title="Study Hours / Week",
+            gridcolor="rgba(16,185,129,0.08)",
+            color="rgba(16,185,129,0.7)",
+        ),
+        yaxis=dict(
+            title="Predicted GPA",
+            range=[0, 4],
+            gridcolor="rgba(16,185,129,0.08)",
+            color="rgba(16,185,129,0.7)",
+        ),
+        showlegend=False,
+        **_PANEL_LAYOUT,
+    )
+    return fig
+
+
+def surface_figure(x_values, y_labels, surface, y_title, current_study):
+    """GPA heatmap of a sensitivity surface ((x, y) matrix, study hours on x)."""
+    fig = go.Figure(
+        go.Heatmap(
+            x=np.asarray(x_values).tolist(),
+            y=list(y_labels),
+            z=np.asarray(surface).T.round(3).tolist(),
+            zmin=0.0,
+            zmax=4.0,
+            colorscale=GPA_COLORSCALE,
+            colorbar=dict(title="GPA", thickness=10),
+            hovertemplate="%{x}, %{y}<br>GPA %{z:.2f}<extra></extra>",
+        )
+    )
+    fig.add_vline(x=current_study, line=dict(color="#ffffff", width=1.5, dash="dot"))
+    fig.update_layout(
+        font=dict(family="DM Sans", color="#10b981", size=10),
+        xaxis=dict(title="Study Hours / Week", color="rgba(16,185,129,0.7)"),
+        yaxis=dict(title=y_title, color="rgba(16,185,129,0.7)"),
+        **_PANEL_LAYOUT,
+    )
+    return fig
+
+
+def sensitivity_bar_figure(oat, base_gpa):
+    """Best and worst GPA reachable by moving one feature at a time.
+
+    `oat` maps feature name -> GPA per level; bars are sorted by range.
+    """
+    names = sorted(oat, key=lambda n: np.ptp(oat[n]))
+    fig = go.Figure()
+    fig.add_trace(
+        go.Bar(
+            y=list(names),
+            x=[float(oat[n].max() - base_gpa) for n in names],
+            orientation="h",
+            marker_color="#10b981",
+            name="Upside",
+        )
+    )
+    fig.add_trace(
+        go.Bar(
+            y=list(names),
+            x=[float(oat[n].min() - base_gpa) for n in names],
+            orientation="h",
+            marker_color="#ef4444",
+            name="Downside",
+        )
+    )
+    fig.update_layout(
+        barmode="relative",
+        font=dict(family="DM Sans", color="#10b981", size=10),
+        xaxis=dict(
+            title="GPA change vs current profile",
+            gridcolor="rgba(16,185,129,0.08)",
+            color="rgba(16,185,129,0.7)",
+        ),
+        yaxis=dict(color="rgba(16,185,129,0.7)"),
+        showlegend=True,
+        legend=dict(font=dict(color="#10b981", size=11)),
+        **_PANEL_LAYOUT,
+    )
+    return fig
+
+
+COHORT_COLORS = ["#10b981", "#8b5cf6", "#f59e0b", "#3b82f6", "#ef4444", "#14b8a6", "#ec4899"]
+
+
+def group_distribution_figure(group, gpa_edges):
+    """Share of each group level's students per GPA bin (a cohort_stats group)."""
+    edges = np.asarray(gpa_edges)
+    centers = ((edges[:-1] + edges[1:]) / 2).round(3).tolist()
+    fig = go.Figure()
+    for i, (label, counts) in enumerate(zip(group["labels"], group["hist"])):
+        total = sum(counts)
+        if not total:
+            continue
+        fig.add_trace(
+            go.Scatter(
+                x=centers,
+                y=[c / total for c in counts],
+                mode="lines",
+                line=dict(color=COHORT_COLORS[i % len(COHORT_COLORS)], width=2.5, shape="spline"),
+                name=f"{label} ({total:,})",
+                hovertemplate="GPA %{x:.1f}: %{y:.1%}<extra>" + label + "</extra>",
+            )
+        )
+    fig.update_layout(
+        font=dict(family="DM Sans", color="#10b981", size=10),
+        xaxis=dict(
+            title="GPA",
+            range=[0, 4],
+            gridcolor="rgba(16,185,129,0.08)",
+            color="rgba(16,185,129,0.7)",
+        ),
+        yaxis=dict(
+            title="Share of Students",
+            tickformat=".0%",
+            gridcolor="rgba(16,185,129,0.08)",
+            color="rgba(16,185,129,0.7)",
+        ),
+        showlegend=True,
+        legend=dict(font=dict(color="#10b981", size=11)),
+        **_PANEL_LAYOUT,
+    )
+    return fig
+
+
+def group_mean_figure(group):
+    """Mean GPA per group level, with one-standard-deviation error bars."""
+    kept = [i for i, mean in enumerate(group["mean"]) if mean is not None]
+    fig = go.Figure(
+        go.Bar(
+            x=[group["labels"][i] for i in kept],
+            y=[group["mean"][i] for i in kept],
+            error_y=dict(type="data", array=[group["std"][i] for i in kept], color="rgba(16,185,129,0.5)"),
+            customdata=[group["counts"][i] for i in kept],
+            marker_color="#10b981",
+            hovertemplate="%{x}: mean GPA %{y:.2f} (%{customdata:,} students)<extra></extra>",
+        )
+    )
+    fig.update_layout(
+        font=dict(family="DM Sans", color="#10b981", size=10),
+        xaxis=dict(title=group["title"], color="rgba(16,185,129,0.7)"),
+        yaxis=dict(
+            title="Mean GPA",
+            range=[0, 4],
+            gridcolor="rgba(16,185,129,0.08)",
+            color="rgba(16,185,129,0.7)",
+        ),
+        showlegend=False,
+        **_PANEL_LAYOUT,
+    )
+    return fig
+
+
+def residual_heatmap_figure(residuals, gpa_edges):
+    """Student counts by actual (y) and predicted (x) GPA bin; the diagonal is a perfect fit."""
+    edges = np.asarray(gpa_edges)
+    centers = ((edges[:-1] + edges[1:]) / 2).round(3).tolist()
+    joint = np.asarray(residuals["joint"], dtype=np.float64)
+    fig = go.Figure(
+        go.Heatmap(
+            x=centers,
+            y=centers,
+            z=np.where(joint > 0, joint, np.nan).tolist(),
+            colorscale=[[0.0, "rgba(16,185,129,0.15)"], [1.0, "#10b981"]],
+            colorbar=dict(title="Students", thickness=10),
+            hovertemplate="actual %{y:.1f}, predicted %{x:.1f}<br>%{z:,} students<extra></extra>",
+        )
+    )
+    fig.add_shape(type="line", x0=0, y0=0, x1=4, y1=4, line=dict(color="#8b5cf6", width=1.5, dash="dash"))
+    fig.update_layout(
+        font=dict(family="DM Sans", color="#10b981", size=10),
+        xaxis=dict(title="Predicted GPA", range=[0, 4], color="rgba(16,185,129,0.7)"),
+        yaxis=dict(title="Actual GPA", range=[0, 4], color="rgba(16,185,129,0.7)"),
+        **_PANEL_LAYOUT,
+    )
+    return fig
+
+
+def residual_hist_figure(residuals):
+    """Histogram of predicted minus actual GPA."""
+    edges = np.asarray(residuals["edges"])
+    fig = go.Figure(
+        go.Bar(
+            x=((edges[:-1] + edges[1:]) / 2).round(3).tolist(),
+            y=list(residuals["hist"]),
+            width=float(edges[1] - edges[0]),
+            marker_color="#8b5cf6",
+            hovertemplate="residual %{x:+.2f}: %{y:,} students<extra></extra>",
+        )
+    )
+    fig.add_vline(x=0, line=dict(color="#10b981", width=1.5, dash="dash"))
+    fig.update_layout(
+        font=dict(family="DM Sans", color="#10b981", size=10),
+        xaxis=dict(
+            title="Predicted − Actual GPA",
+            gridcolor="rgba(16,185,129,0.08)",
+            color="rgba(16,185,129,0.7)",
+        ),
+        yaxis=dict(
+            title="Students",
+            gridcolor="rgba(16,185,129,0.08)",
+            color="rgba(16,185,129,0.7)",
+        ),
+        showlegend=False,
+        **_PANEL_LAYOUT,
+    )
+    return fig
@@ -0,0 +1,211 @@
+# ============================================================
+# 🎓 Cohort Aggregates
+# GPA distributions by tutoring, parental support, absences,
+# study time and grade class, plus the model's predicted-vs-actual
+# residuals, reduced once to fixed-size bin counts
+#
+#   python cohort_stats.py                  # Student_performance_data.csv
+#   python cohort_stats.py district.csv --rebuild
+#
+# Each chunk of the columnar cache (see dataset_cache.py) is folded
+# in with np.bincount, so the result is a few hundred numbers
+# whatever the row count, and the dashboard draws from those alone.
+# Results are saved next to the column cache as cohort_stats.json
+# and reused until the CSV or the model files change.
+# ============================================================
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from dataset_cache import CSV_PATH, cache_dir_for, iter_column_chunks, load_columns
+from digest import file_digest
+from ingest import DEFAULT_CHUNK_SIZE
+from predictor import FEATURES, MODEL_PACK_PATH, GPAPredictor, model_files
+
+FORMAT_VERSION = 1
+STATS_NAME = "cohort_stats.json"
+TARGET = "GPA"
+GPA_EDGES = np.linspace(0.0, 4.0, 21)           # 0.2 GPA bins
+RESIDUAL_EDGES = np.linspace(-2.0, 2.0, 41)     # 0.1 GPA bins; outliers land in the end bins
+
+# (column, title, bucket lower edges or None for coded columns, labels).
+# Codes follow the dataset's data dictionary (GradeClass 0 = A ... 4 = F).
+GROUPS = (
+    ("Tutoring", "Tutoring", None, ("No", "Yes")),
+    ("ParentalSupport", "Parental Support", None, ("None", "Low", "Moderate", "High", "Very High")),
+    ("Absences", "Absences", (0, 5, 10, 15, 20, 25, 30),
+     ("0-4", "5-9", "10-14", "15-19", "20-24", "25-29", "30+")),
+    ("StudyTimeWeekly", "Study Time", (0, 4, 8, 12, 16), ("0-4h", "4-8h", "8-12h", "12-16h", "16h+")),
+    ("GradeClass", "Grade Class", None, ("A", "B", "C", "D", "F")),
+)
+
+
+def _bins(values, edges):
+    """Bin index of each value against `edges`, clipped into the outer bins."""
+    return np.clip(np.searchsorted(edges, values, side="right") - 1, 0, len(edges) - 2)
+
+
+def _codes(values, buckets, levels):
+    if buckets is None:
+        return np.clip(np.asarray(values, dtype=np.intp), 0, levels - 1)
+    return np.clip(np.searchsorted(buckets, values, side="right") - 1, 0, levels - 1)
+
+
+def compute_stats(columns, predictor, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Aggregate {column: array} student columns into a JSON-ready dict.
+
+    Per group level: student count, GPA mean and standard deviation,
+    and a GPA histogram over GPA_EDGES. For the model: an actual x
+    predicted count matrix over the same bins, a residual histogram
+    over RESIDUAL_EDGES, and MAE / RMSE / bias / R^2.
+    """
+    missing = [name for name in (*FEATURES, TARGET) if name not in columns]
+    if missing:
+        raise ValueError(f"input is missing columns: {', '.join(missing)}")
+    n_bins = len(GPA_EDGES) - 1
+    n_res = len(RESIDUAL_EDGES) - 1
+    groups = {
+        column: (np.zeros((len(labels), n_bins), dtype=np.int64), np.zeros(len(labels)), np.zeros(len(labels)))
+        for column, _, _, labels in GROUPS
+    }
+    joint = np.zeros(n_bins * n_bins, dtype=np.int64)
+    residual_hist = np.zeros(n_res, dtype=np.int64)
+    totals = np.zeros(5)    # sum err, sum |err|, sum err^2, sum y, sum y^2
+
+    wanted = {name: columns[name] for name in (*FEATURES, TARGET)}
+    for chunk in iter_column_chunks(wanted, chunk_size):
+        y = np.asarray(chunk[TARGET], dtype=np.float64)
+        gpa_bin = _bins(y, GPA_EDGES)
+        for column, _, buckets, labels in GROUPS:
+            hist, sums, sq_sums = groups[column]
+            code = _codes(chunk[column], buckets, len(labels))
+            hist += np.bincount(code * n_bins + gpa_bin, minlength=hist.size).reshape(hist.shape)
+            sums += np.bincount(code, weights=y, minlength=len(labels))
+            sq_sums += np.bincount(code, weights=y * y, minlength=len(labels))
+
+        X = np.column_stack([chunk[name] for name in FEATURES]).astype(np.float64)
+        pred = np.clip(predictor.predict(X), 0.0, 4.0)
+        err = pred - y
+        joint += np.bincount(gpa_bin * n_bins + _bins(pred, GPA_EDGES), minlength=joint.size)
+        residual_hist += np.bincount(_bins(err, RESIDUAL_EDGES), minlength=n_res)
+        totals += (err.sum(), np.abs(err).sum(), (err * err).sum(), y.sum(), (y * y).sum())
+
+    out_groups = {}
+    for column, title, _, labels in GROUPS:
+        hist, sums, sq_sums = groups[column]
+        counts = hist.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(counts > 0, sums / counts, np.nan)
+            std = np.sqrt(np.maximum(np.where(counts > 0, sq_sums / counts, np.nan) - mean * mean, 0.0))
+        out_groups[column] = {
+            "title": title,
+            "labels": list(labels),
+            "counts": counts.tolist(),
+            "mean": [None if np.isnan(v) else round(float(v), 4) for v in mean],
+            "std": [None if np.isnan(v) else round(float(v), 4) for v in std],
+            "hist": hist.tolist(),
+        }
+
+    rows = int(joint.sum())
+    err_sum, abs_sum, sq_sum, y_sum, y_sq_sum = totals
+    total_ss = y_sq_sum - y_sum * y_sum / rows if rows else 0.0
+    residuals = {
+        "edges": RESIDUAL_EDGES.round(3).tolist(),
+        "hist": residual_hist.tolist(),
+        "joint": joint.reshape(n_bins, n_bins).tolist(),     # [actual bin][predicted bin]
+        "mae": round(abs_sum / rows, 4) if rows else None,
+        "rmse": round(float(np.sqrt(sq_sum / rows)), 4) if rows else None,
+        "bias": round(err_sum / rows, 4) if rows else None,
+        "r2": round(1.0 - sq_sum / total_ss, 4) if total_ss > 0 else None,
+    }
+    return {
+        "format_version": FORMAT_VERSION,
+        "rows": rows,
+        "gpa_edges": GPA_EDGES.round(3).tolist(),
+        "groups": out_groups,
+        "residuals": residuals,
+    }
+
+
+def load_stats(csv_path=CSV_PATH, pack_path=MODEL_PACK_PATH, model_path=None, scaler_path=None,
+               chunk_size=DEFAULT_CHUNK_SIZE, rebuild=False):
+    """Cohort aggregates for `csv_path`, from disk when still fresh.
+
+    The model is chosen as GPAPredictor.open() chooses it: the pack,
+    unless pickle paths are given or no pack exists. Saved results are
+    keyed by the SHA-256 of the CSV and of the model files actually
+    used, so retraining or a new export recomputes them. When the
+    column cache could not be written (no CSV digest to key on), the
+    result is computed but not saved.
+    """
+    columns, meta = load_columns(csv_path, chunk_size=chunk_size)
+    key = {
+        "csv_sha256": meta.get("csv_sha256"),
+        "model_sha256": {
+            role: file_digest(path) for role, path in model_files(pack_path, model_path, scaler_path).items()
+        },
+    }
+    path = cache_dir_for(csv_path) / STATS_NAME
+    if not rebuild and key["csv_sha256"] is not None:
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+        except (FileNotFoundError, ValueError):
+            saved = None
+        if saved is not None and saved.get("format_version") == FORMAT_VERSION and all(
+            saved.get(name) == value for name, value in key.items()
+        ):
+            return saved
+
+    predictor = GPAPredictor.open(pack_path, model_path, scaler_path)
+    stats = {**compute_stats(columns, predictor, chunk_size), **key}
+    if key["csv_sha256"] is not None:
+        tmp = path.with_name(f"{STATS_NAME}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "w") as f:
+                json.dump(stats, f)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+    return stats
+
+
+def group_spread(stats):
+    """(title, lowest level, highest level, mean GPA gap) per group, widest gap first."""
+    rows = []
+    for group in stats["groups"].values():
+        levels = [(mean, label) for mean, label in zip(group["mean"], group["labels"]) if mean is not None]
+        if not levels:
+            continue
+        low, high = min(levels), max(levels)
+        rows.append((group["title"], low, high, round(high[0] - low[0], 4)))
+    return sorted(rows, key=lambda row: -row[3])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the cohort analytics aggregates.")
+    parser.add_argument("csv", nargs="?", default=CSV_PATH)
+    parser.add_argument("--pack", default=MODEL_PACK_PATH, help="model pack (see artifact.py)")
+    parser.add_argument("--model", help="pickled model instead of the pack")
+    parser.add_argument("--scaler", help="pickled scaler instead of the pack")
+    parser.add_argument("--rebuild", action="store_true", help="recompute even when the saved result is fresh")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    stats = load_stats(args.csv, args.pack, args.model, args.scaler, args.chunk_size, args.rebuild)
+    print(f"{stats['rows']:,} students aggregated in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    for title, (low_mean, low_label), (high_mean, high_label), gap in group_spread(stats):
+        print(f"  {title:<18}{low_label:>10} {low_mean:5.2f}  ->{high_label:>10} {high_mean:5.2f}"
+              f"   gap {gap:5.2f}", file=sys.stderr)
+    res = stats["residuals"]
+    print(f"  model: MAE {res['mae']}, RMSE {res['rmse']}, bias {res['bias']}, R^2 {res['r2']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
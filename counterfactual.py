@@ -0,0 +1,113 @@
+# ============================================================
+# 🎓 Counterfactual "Path to Target GPA"
+# Cheapest changes to the actionable features that lift a
+# profile's predicted GPA to a target, found by scoring candidate
+# profiles in cost order, thousands per predict call
+# ============================================================
+
+import numpy as np
+
+from grid import STUDY_STEP
+from predictor import FEATURES, as_matrix
+from sensitivity import FEATURE_LEVELS
+
+# Effort per unit of change: one extra study hour, one absence avoided,
+# starting tutoring, joining/leaving extracurriculars.
+EFFORT = {
+    "StudyTimeWeekly": 1.0,
+    "Absences": 1.5,
+    "Tutoring": 4.0,
+    "Extracurricular": 3.0,
+}
+SEARCH_BATCH = 4096
+
+
+def _options(name, current):
+    """Levels a student can move `name` to, current level first."""
+    if name == "StudyTimeWeekly":
+        return np.arange(current, FEATURE_LEVELS[name][-1] + STUDY_STEP / 2, STUDY_STEP)
+    if name == "Absences":
+        return np.arange(current, -1.0, -1.0)
+    if name == "Tutoring":
+        return np.array([current, 1.0]) if current == 0 else np.array([current])
+    return np.array([current, 1.0 - current])
+
+
+def candidates(profile, effort=EFFORT):
+    """(rows, changes, cost) for every reachable profile, cheapest first.
+
+    `changes` holds each candidate's absolute change per actionable
+    feature (in EFFORT order); the unchanged profile is excluded.
+    """
+    base = as_matrix(profile)[0]
+    names = list(effort)
+    cols = [FEATURES.index(name) for name in names]
+    levels = [_options(name, base[col]) for name, col in zip(names, cols)]
+    idx = np.indices(tuple(len(v) for v in levels)).reshape(len(levels), -1)[:, 1:]
+
+    rows = np.empty((idx.shape[1], len(FEATURES)), dtype=np.float64)
+    rows[:] = base
+    changes = np.empty((idx.shape[1], len(names)), dtype=np.float64)
+    for j, (col, values) in enumerate(zip(cols, levels)):
+        rows[:, col] = values[idx[j]]
+        changes[:, j] = np.abs(values[idx[j]] - base[col])
+    cost = changes @ np.array([effort[name] for name in names])
+    order = np.argsort(cost, kind="stable")
+    return rows[order], changes[order], cost[order]
+
+
+def _dominated(changes, plans):
+    """True where a candidate makes at least every change of a found plan."""
+    if not plans:
+        return np.zeros(len(changes), dtype=bool)
+    found = np.array([plan["_changes"] for plan in plans])
+    return ((changes[:, None, :] >= found[None, :, :]) & (found[None, :, :] > 0)
+            | (found[None, :, :] == 0)).all(axis=2).any(axis=1)
+
+
+def plans_to_target(predictor, profile, target, n_plans=3, effort=EFFORT, batch=SEARCH_BATCH):
+    """Up to `n_plans` cheapest, mutually non-redundant plans reaching `target`.
+
+    Candidates are scored in cost order, `batch` per predict call. Any
+    candidate that contains a cheaper plan's changes is pruned before
+    scoring, and the search stops once `n_plans` are found, since every
+    later candidate costs at least as much. Returns (plans, best_gpa):
+    each plan is {"changes": {feature: (from, to)}, "gpa", "cost"}, and
+    best_gpa is the highest GPA seen (the reachable ceiling if no plan
+    is found).
+    """
+    base = as_matrix(profile)[0]
+    names = list(effort)
+    rows, changes, cost = candidates(base, effort)
+
+    plans, best_gpa = [], -np.inf
+    for start in range(0, len(rows), batch):
+        stop = start + batch
+        keep = ~_dominated(changes[start:stop], plans)
+        if not keep.any():
+            continue
+        sel = np.flatnonzero(keep) + start
+        gpa = np.clip(predictor.predict(rows[sel]), 0.0, 4.0)
+        best_gpa = max(best_gpa, float(gpa.max()))
+
+        for pos in np.flatnonzero(gpa >= target):
+            i = sel[pos]
+            if _dominated(changes[i:i + 1], plans)[0]:
+                continue
+            plans.append({
+                "changes": {
+                    name: (float(base[FEATURES.index(name)]), float(rows[i, FEATURES.index(name)]))
+                    for name, delta in zip(names, changes[i]) if delta > 0
+                },
+                "gpa": float(gpa[pos]),
+                "cost": float(cost[i]),
+                "_changes": changes[i],
+            })
+            if len(plans) == n_plans:
+                break
+        if len(plans) == n_plans:
+            break
+
+    for plan in plans:
+        del plan["_changes"]
+    return plans, best_gpa
@@ -0,0 +1,107 @@
+# ============================================================
+# 🎓 Fast KNN Cross-Validation
+# One all-pairs top-K neighbour search over the scaled data;
+# every fold (or leave-one-out) is then scored by masking out
+# neighbours that fall in the held-out fold
+# ============================================================
+
+import numpy as np
+
+from neighbors import build_index
+
+
+def predictions_for_all_k(dist, neigh_y):
+    """KNN predictions for every k <= K from one sorted neighbour list.
+
+    Returns {"uniform": (n, K), "distance": (n, K)}, where column k-1
+    is the prediction using the k nearest neighbours. Distance weights
+    follow scikit-learn: exact matches take all the weight.
+    """
+    ks = np.arange(1, dist.shape[1] + 1)
+    uniform = np.cumsum(neigh_y, axis=1) / ks
+
+    zero = dist == 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = np.where(zero, 0.0, 1.0 / dist)
+        weighted = np.cumsum(w * neigh_y, axis=1) / np.cumsum(w, axis=1)
+    n_zero = np.cumsum(zero, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        exact = np.cumsum(zero * neigh_y, axis=1) / n_zero
+    return {"uniform": uniform, "distance": np.where(n_zero > 0, exact, weighted)}
+
+
+def score_matrix(y_true, preds):
+    """(r2, mae) per column of an (n, K) prediction matrix."""
+    resid = preds - y_true[:, None]
+    ss_tot = ((y_true - y_true.mean()) ** 2).sum()
+    return 1.0 - (resid ** 2).sum(axis=0) / ss_tot, np.abs(resid).mean(axis=0)
+
+
+def neighbour_graph(Z, depth, backend="kd_tree"):
+    """(dist, ind) of each row's `depth` nearest other rows.
+
+    The row itself is dropped by index (not by distance), so exact
+    duplicates elsewhere in the data are kept as legitimate neighbours.
+    Queries run in blocks inside the index, keeping memory bounded.
+    """
+    n = len(Z)
+    depth = min(depth, n - 1)
+    dist, ind = build_index(Z, backend).query(Z, depth + 1)
+    not_self = ind != np.arange(n)[:, None]
+    # Rows where self was crowded out by duplicates have depth + 1 others.
+    not_self[not_self.all(axis=1), -1] = False
+    keep = np.argsort(~not_self, axis=1, kind="stable")[:, :depth]
+    return np.take_along_axis(dist, keep, axis=1), np.take_along_axis(ind, keep, axis=1)
+
+
+def cv_neighbours(Z, folds, k_max, backend="kd_tree", slack=2.0):
+    """Per-row k_max nearest neighbours restricted to other folds.
+
+    `folds[i]` is row i's fold id; each row's neighbours come from rows
+    whose fold differs, exactly what a model refit without that fold
+    would see. The shared graph is `slack` times deeper than a fold's
+    expected need; rows that still run short are re-queried exactly.
+    """
+    n_folds = len(np.unique(folds))
+    depth = int(np.ceil(k_max * slack * n_folds / max(n_folds - 1, 1))) + 1
+    dist, ind = neighbour_graph(Z, depth, backend)
+
+    valid = folds[ind] != folds[:, None]
+    order = np.argsort(~valid, axis=1, kind="stable")[:, :k_max]
+    out_dist = np.take_along_axis(dist, order, axis=1)
+    out_ind = np.take_along_axis(ind, order, axis=1)
+
+    short = valid.sum(axis=1) < k_max
+    for fold in np.unique(folds[short]):
+        rows = np.flatnonzero(short & (folds == fold))
+        train = np.flatnonzero(folds != fold)
+        d, i = build_index(Z[train], "brute").query(Z[rows], k_max)
+        out_dist[rows], out_ind[rows] = d, train[i]
+    return out_dist, out_ind
+
+
+def loo_neighbours(Z, k_max, backend="kd_tree"):
+    """Leave-one-out: every row's k_max nearest other rows, O(n·K)."""
+    return neighbour_graph(Z, k_max, backend)
+
+
+def cross_validate(Z, y, k_max=15, n_folds=5, seed=42, backend="kd_tree"):
+    """CV scores for every k <= k_max and both weightings.
+
+    `n_folds=None` (or >= len(Z)) runs leave-one-out. Returns a list of
+    {"k", "weights", "r2", "mae"} dicts ranked by R².
+    """
+    n = len(Z)
+    if n_folds is None or n_folds >= n:
+        dist, ind = loo_neighbours(Z, k_max, backend)
+    else:
+        folds = np.random.default_rng(seed).permutation(n) % n_folds
+        dist, ind = cv_neighbours(Z, folds, k_max, backend)
+
+    results = []
+    for weights, preds in predictions_for_all_k(dist, y[ind]).items():
+        r2, mae = score_matrix(y, preds)
+        for k in range(1, dist.shape[1] + 1):
+            results.append({"k": k, "weights": weights, "r2": float(r2[k - 1]), "mae": float(mae[k - 1])})
+    results.sort(key=lambda row: row["r2"], reverse=True)
+    return results
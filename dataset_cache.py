@@ -0,0 +1,209 @@
+# ============================================================
+# 🎓 Columnar Dataset Cache
+# One-time conversion of a student CSV into per-column .npy
+# files that training, CV and the similar-students table map
+# instead of re-parsing the text
+#
+#   python dataset_cache.py                      # Student_performance_data.csv
+#   python dataset_cache.py district.csv --rebuild
+#
+# The cache sits next to the CSV (<name>.csv.columns/) and holds
+# the schema-valid rows only (see ingest.py). It is rebuilt when
+# the CSV's SHA-256 changes; an unchanged size and mtime skip the
+# hash, as git's index does.
+# ============================================================
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from digest import file_digest
+from ingest import COLUMNS, DEFAULT_CHUNK_SIZE, RejectLog, SCHEMA, iter_student_chunks
+from predictor import BASE_DIR
+
+CSV_PATH = BASE_DIR / "Student_performance_data.csv"
+CACHE_SUFFIX = ".columns"
+FORMAT_VERSION = 2
+COPY_BLOCK = 1 << 20
+# Text columns (StudentID) are stored as fixed-width unicode, as wide
+# as the longest value, so their stored dtype is only known per build.
+_DTYPES = {name: None if dtype is str else np.dtype(dtype).str for name, dtype, *_ in SCHEMA}
+
+
+def _dtype_ok(name, stored):
+    expected = _DTYPES.get(name, "")
+    if expected is None:
+        return isinstance(stored, str) and np.dtype(stored).kind == "U"
+    return stored == expected
+
+
+def cache_dir_for(csv_path):
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.name + CACHE_SUFFIX)
+
+
+def _stat(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def build_cache(csv_path=CSV_PATH, cache_dir=None, chunk_size=DEFAULT_CHUNK_SIZE, rejects=None):
+    """Parse `csv_path` once and write its valid rows column by column.
+
+    Chunks are appended to raw per-column files, then copied into .npy
+    files once the row count (and the widest text value) is known, so
+    memory stays at one chunk.
+    Files are written under per-process temporary names and renamed
+    into place, meta.json last, so readers never see a partial build
+    and concurrent builders (e.g. two app workers) do not collide.
+    """
+    cache_dir = Path(cache_dir or cache_dir_for(csv_path))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    rejects = rejects if rejects is not None else RejectLog()
+    tag = f".{os.getpid()}.tmp"
+    # Hash first: an edit made during the parse then fails the next check.
+    before, digest = _stat(csv_path), file_digest(csv_path)
+
+    raw, parts, rows = {}, {}, 0
+    try:
+        for chunk in iter_student_chunks(csv_path, COLUMNS, (), chunk_size, rejects):
+            for name, values in chunk.items():
+                if name not in raw:
+                    raw[name] = open(cache_dir / f"{name}.raw{tag}", "wb")
+                    parts[name] = []
+                raw[name].write(values.tobytes())
+                parts[name].append((len(values), values.dtype))
+            rows += len(next(iter(chunk.values()), ()))
+    finally:
+        for f in raw.values():
+            f.close()
+
+    columns = [name for name in COLUMNS if name in raw]
+    dtypes = {}
+    for name in columns:
+        part, out = cache_dir / f"{name}.raw{tag}", cache_dir / f"{name}.npy{tag}"
+        if _DTYPES[name] is None:
+            width = max([dtype.itemsize // 4 for _, dtype in parts[name]] + [1])
+            dtypes[name] = np.dtype(f"<U{width}").str
+        else:
+            dtypes[name] = _DTYPES[name]
+        dst = np.lib.format.open_memmap(out, mode="w+", dtype=dtypes[name], shape=(rows,))
+        if rows and _DTYPES[name] is None:
+            # Chunks were written at their own widths; widen them one by one.
+            start = 0
+            with open(part, "rb") as f:
+                for count, dtype in parts[name]:
+                    dst[start:start + count] = np.fromfile(f, dtype=dtype, count=count)
+                    start += count
+        elif rows:
+            src = np.memmap(part, dtype=dtypes[name], mode="r", shape=(rows,))
+            for start in range(0, rows, COPY_BLOCK):
+                dst[start:start + COPY_BLOCK] = src[start:start + COPY_BLOCK]
+            del src
+        dst.flush()
+        del dst
+        part.unlink()
+        os.replace(out, cache_dir / f"{name}.npy")
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "columns": columns,
+        "dtypes": dtypes,
+        "rows": rows,
+        "rejected_rows": rejects.rows,
+        "rejected_by_column": rejects.by_column,
+        "csv_sha256": digest,
+        "csv_stat": before,
+    }
+    tmp = cache_dir / f"meta.json{tag}"
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, cache_dir / "meta.json")
+    return meta
+
+
+def open_cache(csv_path=CSV_PATH, cache_dir=None, verify=True):
+    """({column: read-only memory-mapped array}, meta), or None if missing or stale."""
+    cache_dir = Path(cache_dir or cache_dir_for(csv_path))
+    try:
+        with open(cache_dir / "meta.json") as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        return None
+    if meta.get("format_version") != FORMAT_VERSION:
+        return None
+    dtypes = meta.get("dtypes", {})
+    if not all(_dtype_ok(name, dtypes.get(name)) for name in meta.get("columns", ())):
+        return None
+    if verify and meta.get("csv_stat") != _stat(csv_path):
+        if meta.get("csv_sha256") != file_digest(csv_path):
+            return None
+    try:
+        columns = {name: np.load(cache_dir / f"{name}.npy", mmap_mode="r") for name in meta["columns"]}
+    except FileNotFoundError:
+        return None
+    return columns, meta
+
+
+def load_columns(csv_path=CSV_PATH, cache_dir=None, chunk_size=DEFAULT_CHUNK_SIZE, rebuild=False):
+    """({column: typed array}, meta) for the CSV's valid rows.
+
+    Opens the cache, building it first when missing or stale. Where
+    the cache directory cannot be written, the rows are parsed into
+    memory instead.
+    """
+    opened = None if rebuild else open_cache(csv_path, cache_dir)
+    if opened is not None:
+        return opened
+    try:
+        build_cache(csv_path, cache_dir, chunk_size)
+    except OSError:
+        rejects = RejectLog()
+        chunks = list(iter_student_chunks(csv_path, COLUMNS, (), chunk_size, rejects))
+        columns = {name: np.concatenate([c[name] for c in chunks]) for name in chunks[0]} if chunks else {}
+        return columns, {
+            "rows": len(next(iter(columns.values()), ())),
+            "rejected_rows": rejects.rows,
+            "rejected_by_column": rejects.by_column,
+        }
+    return open_cache(csv_path, cache_dir, verify=False)
+
+
+def iter_column_chunks(columns, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Slices of a column dict, shaped like ingest.iter_student_chunks output."""
+    rows = len(next(iter(columns.values()), ()))
+    for start in range(0, rows, chunk_size):
+        yield {name: values[start:start + chunk_size] for name, values in columns.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the columnar cache of a student CSV.")
+    parser.add_argument("csv", nargs="?", default=CSV_PATH)
+    parser.add_argument("--cache-dir", help=f"default: <csv>{CACHE_SUFFIX}/")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild even when the cache is fresh")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    opened = None if args.rebuild else open_cache(args.csv, args.cache_dir)
+    if opened is None:
+        build_cache(args.csv, args.cache_dir, args.chunk_size)
+        built = time.perf_counter() - start
+        print(f"parsed {args.csv} in {built:.2f}s", file=sys.stderr)
+        start = time.perf_counter()
+        opened = open_cache(args.csv, args.cache_dir)
+    columns, meta = opened
+    print(
+        f"{meta['rows']:,} rows x {len(columns)} columns ({meta['rejected_rows']:,} rejected) "
+        f"opened from {args.cache_dir or cache_dir_for(args.csv)} in {1e3 * (time.perf_counter() - start):.1f}ms",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
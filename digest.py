@@ -0,0 +1,17 @@
+# ============================================================
+# 🎓 File Digests
+# Streaming SHA-256 used to key every derived file (lookup
+# table, column cache, student store, cohort stats, model
+# pack and training manifest) to the inputs it came from
+# ============================================================
+
+import hashlib
+
+
+def file_digest(path, block=1 << 20):
+    """Hex SHA-256 of a file, read in `block`-byte pieces."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(block), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
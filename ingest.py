@@ -0,0 +1,189 @@
+# ============================================================
+# 🎓 Streaming Student CSV Ingestion
+# Chunked reader for the Student_performance_data.csv schema:
+# typed NumPy columns per chunk, vectorised range checks, and
+# invalid rows routed to a reject file instead of the model
+#
+#   python ingest.py export.csv --rejects rejects.csv
+#
+# Memory is bounded by the chunk size, not the file size, so
+# multi-GB exports can be validated, scored or trained on.
+# ============================================================
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 262_144
+REASON_COLUMN = "reject_reason"
+
+# (column, dtype, min, max); bounds are inclusive, None means open.
+# Only values that cannot mean anything are rejected: categorical codes
+# outside the dataset's data dictionary (ParentalSupport runs 0-4,
+# 4 = very high), negative counts and hours, and GPAs off the 0-4
+# scale. Study time and absences have no upper bound, since the model
+# scores any value. StudentID is an opaque string, passed through as-is.
+SCHEMA = (
+    ("StudentID", str, None, None),
+    ("Age", np.int8, 0, None),
+    ("Gender", np.int8, 0, 1),
+    ("Ethnicity", np.int8, 0, 3),
+    ("ParentalEducation", np.int8, 0, 4),
+    ("StudyTimeWeekly", np.float64, 0.0, None),
+    ("Absences", np.int32, 0, None),
+    ("Tutoring", np.int8, 0, 1),
+    ("ParentalSupport", np.int8, 0, 4),
+    ("Extracurricular", np.int8, 0, 1),
+    ("Sports", np.int8, 0, 1),
+    ("Music", np.int8, 0, 1),
+    ("Volunteering", np.int8, 0, 1),
+    ("GPA", np.float64, 0.0, 4.0),
+    ("GradeClass", np.int8, 0, 4),
+)
+COLUMNS = tuple(spec[0] for spec in SCHEMA)
+_SPECS = {spec[0]: spec for spec in SCHEMA}
+_TEXT = {name for name, dtype, *_ in SCHEMA if dtype is str}
+
+
+def _numeric(series):
+    """Column as float64; text that is not a number becomes NaN."""
+    if series.dtype.kind in "biuf":
+        return series.to_numpy(dtype=np.float64)
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+
+
+def validate_chunk(frame, columns):
+    """({column: typed array of valid rows}, {column: bad-row mask}).
+
+    Each check is one vectorised pass per column: missing or
+    non-numeric values, values outside the schema range, and
+    fractional values in integer columns. Text columns only need a
+    non-blank value; they come back as fixed-width NumPy unicode
+    arrays, stripped in one vectorised pass.
+    """
+    raw, bad = {}, {}
+    for name in columns:
+        _, dtype, lo, hi = _SPECS[name]
+        if dtype is str:
+            values = np.char.strip(frame[name].to_numpy(dtype=str, na_value=""))
+            raw[name], bad[name] = values, values == ""
+            continue
+        values = _numeric(frame[name])
+        invalid = ~np.isfinite(values)
+        if lo is not None:
+            invalid |= values < lo
+        if hi is not None:
+            invalid |= values > hi
+        if np.issubdtype(dtype, np.integer):
+            info = np.iinfo(dtype)
+            invalid |= (values != np.floor(values)) | (values < info.min) | (values > info.max)
+        raw[name], bad[name] = values, invalid
+
+    keep = ~np.logical_or.reduce(list(bad.values())) if bad else np.ones(len(frame), dtype=bool)
+    typed = {name: raw[name][keep].astype(_SPECS[name][1]) for name in columns}
+    return typed, bad
+
+
+class RejectLog:
+    """Appends rejected rows to a CSV with a `reject_reason` column.
+
+    The reason lists every failing column, e.g. "ParentalSupport;GPA".
+    With no path, rejects are only counted. The first `keep` rejected
+    rows are also kept in `samples` as {"row": 1-based data row,
+    "reason": ...}, for showing in a UI.
+    """
+
+    def __init__(self, path=None, keep=0):
+        self.path = path
+        self.keep = keep
+        self.rows = 0
+        self.by_column = {}
+        self.samples = []
+        self._header_written = False
+        if path is not None:
+            open(path, "w").close()     # no stale rejects from an earlier run
+
+    def write(self, frame, bad):
+        rejected = np.logical_or.reduce(list(bad.values())) if bad else np.zeros(len(frame), dtype=bool)
+        count = int(rejected.sum())
+        if count == 0:
+            return 0
+        reasons = np.full(count, "", dtype=object)
+        for name, mask in bad.items():
+            hits = mask[rejected]
+            if hits.any():
+                self.by_column[name] = self.by_column.get(name, 0) + int(hits.sum())
+                reasons[hits] += name + ";"
+        self.rows += count
+        room = self.keep - len(self.samples)
+        if room > 0:
+            rows = frame.index[rejected][:room]
+            self.samples += [
+                {"row": int(row) + 1, "reason": reason.rstrip(";")} for row, reason in zip(rows, reasons)
+            ]
+        if self.path is not None:
+            out = frame[rejected].copy()
+            out[REASON_COLUMN] = [reason.rstrip(";") for reason in reasons]
+            out.to_csv(self.path, mode="a" if self._header_written else "w",
+                       header=not self._header_written, index=False)
+            self._header_written = True
+        return count
+
+
+def iter_student_chunks(src, columns=COLUMNS, required=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                        rejects=None):
+    """Yield {column: typed array} for the valid rows of each chunk of `src`.
+
+    Only `columns` are parsed. Those in `required` (default: all of
+    them) must be in the header; the others are left out of the
+    yielded dicts when the file lacks them. Rows that fail validation
+    go to `rejects` (a RejectLog) and are not yielded.
+    """
+    columns = tuple(columns)
+    unknown = [c for c in columns if c not in _SPECS]
+    if unknown:
+        raise ValueError(f"no schema for columns: {', '.join(unknown)}")
+    required = columns if required is None else tuple(required)
+    wanted = set(columns)
+    rejects = rejects if rejects is not None else RejectLog()
+
+    text = {name: str for name in columns if name in _TEXT}
+    reader = pd.read_csv(src, usecols=lambda c: c in wanted, dtype=text, chunksize=chunk_size)
+    for frame in reader:
+        missing = [c for c in required if c not in frame.columns]
+        if missing:
+            raise ValueError(f"input is missing columns: {', '.join(missing)}")
+        present = [c for c in columns if c in frame.columns]
+        typed, bad = validate_chunk(frame, present)
+        rejects.write(frame, bad)
+        yield typed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate a student CSV against the schema.")
+    parser.add_argument("csv")
+    parser.add_argument("--rejects", help="write invalid rows here, with a reject_reason column")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rejects = RejectLog(args.rejects)
+    accepted = sum(
+        len(next(iter(chunk.values()))) for chunk in iter_student_chunks(args.csv, chunk_size=args.chunk_size,
+                                                                 rejects=rejects)
+    )
+    elapsed = time.perf_counter() - start
+    total = accepted + rejects.rows
+    print(f"{total:,} rows in {elapsed:.2f}s ({total / max(elapsed, 1e-9):,.0f} rows/sec): "
+          f"{accepted:,} valid, {rejects.rows:,} rejected", file=sys.stderr)
+    for name, count in sorted(rejects.by_column.items(), key=lambda item: -item[1]):
+        print(f"  {name:<20}{count:>10,}", file=sys.stderr)
+    if rejects.rows and args.rejects:
+        print(f"rejected rows written to {args.rejects}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+# ============================================================
+# 🎓 Fused Scaler + KNN Inference Engine
+# Pure-NumPy replacement for scaler.transform + model.predict
+# ============================================================
+
+import threading
+
+import numpy as np
+
+from neighbors import BruteForceIndex, build_index
+
+# Appended rows searched by brute force before they are folded into
+# the base index with one rebuild.
+DEFAULT_MAX_DELTA = 4096
+
+
+class FusedKNN:
+    """KNN regressor over a pre-scaled, contiguous training matrix.
+
+    Queries are standardised with the scaler's mean/scale and handed to
+    a pluggable neighbour index (see neighbors.py). With the default
+    exact "brute" backend, results match scikit-learn's kd_tree to
+    floating-point round-off.
+    """
+
+    def __init__(self, train, targets, mean, scale, k=4, weights="uniform",
+                 backend="brute", index=None, **index_options):
+        if weights not in ("uniform", "distance"):
+            raise ValueError(f"unsupported weights {weights!r}")
+        self.train = np.ascontiguousarray(train, dtype=np.float64)
+        self.targets = np.ascontiguousarray(targets, dtype=np.float64)
+        self.mean = np.ascontiguousarray(mean, dtype=np.float64)
+        self.scale = np.ascontiguousarray(scale, dtype=np.float64)
+        self.k = int(k)
+        self.weights = weights
+        if not 1 <= self.k <= len(self.train):
+            raise ValueError(f"k={self.k} needs between 1 and {len(self.train)} training rows")
+        self.backend = backend
+        self.index_options = index_options
+        self.index = index if index is not None else build_index(self.train, backend, **index_options)
+
+    @classmethod
+    def from_sklearn(cls, model, scaler, backend="brute", **index_options):
+        """Compile a fitted KNeighborsRegressor + StandardScaler pair."""
+        params = model.get_params()
+        euclidean = params["metric"] == "euclidean" or (
+            params["metric"] == "minkowski" and params["p"] == 2
+        )
+        if not euclidean or callable(params["weights"]):
+            raise ValueError("only euclidean KNN with uniform/distance weights can be fused")
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(scaler.n_features_in_)
+        scale = scaler.scale_ if scaler.with_std else np.ones(scaler.n_features_in_)
+        return cls(
+            model._fit_X, model._y, mean, scale, params["n_neighbors"], params["weights"],
+            backend, **index_options,
+        )
+
+    @classmethod
+    def from_pack(cls, pack, backend="brute", **index_options):
+        """Build over an artifact.ModelPack; its arrays are used in place.
+
+        The brute index also takes the pack's stored row norms, so it
+        allocates nothing per process.
+        """
+        if backend == "brute" and pack.sq_norms is not None:
+            index_options.setdefault("sq_norms", pack.sq_norms)
+        return cls(
+            pack.train, pack.targets, pack.mean, pack.scale, pack.k, pack.weights,
+            backend, **index_options,
+        )
+
+    def transform(self, X):
+        # Same operations, in the same order, as StandardScaler.transform.
+        return (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+
+    def kneighbors(self, X, k=None):
+        """(distances, indices) of the k nearest training rows, nearest first."""
+        k = self.k if k is None else int(k)
+        return self.index.query(np.atleast_2d(self.transform(X)), k)
+
+    def _neighbours(self, X):
+        """(distances, indices, neighbour targets) from one query."""
+        dist, ind = self.kneighbors(X)
+        return dist, ind, self.targets[ind]
+
+    def predict(self, X):
+        dist, _, neigh_y = self._neighbours(X)
+        return self._aggregate(dist, neigh_y)
+
+    def predict_neighbours(self, X):
+        """(predictions, spread, distances, indices, targets) from one neighbour query.
+
+        `spread` is the weighted standard deviation of the neighbours'
+        targets around the prediction, using the model's own weights.
+        """
+        dist, ind, neigh_y = self._neighbours(X)
+        pred = self._aggregate(dist, neigh_y)
+        w = self._weights(dist)
+        var = np.sum(w * (neigh_y - pred[:, None]) ** 2, axis=1) / np.sum(w, axis=1)
+        return pred, np.sqrt(var), dist, ind, neigh_y
+
+    def _weights(self, dist):
+        if self.weights == "uniform":
+            return np.ones_like(dist)
+        # Mirrors sklearn: exact matches take all the weight.
+        with np.errstate(divide="ignore"):
+            w = 1.0 / dist
+        exact = np.isinf(w)
+        rows = exact.any(axis=1)
+        w[rows] = exact[rows]
+        return w
+
+    def _aggregate(self, dist, neigh_y):
+        if self.weights == "uniform":
+            return np.mean(neigh_y, axis=1)
+        w = self._weights(dist)
+        return np.sum(neigh_y * w, axis=1) / np.sum(w, axis=1)
+
+
+def _grown(buf, needed):
+    """`buf`, or a copy with room for `needed` rows (capacity doubles)."""
+    if needed <= len(buf):
+        return buf
+    out = np.empty((max(needed, 2 * len(buf)), *buf.shape[1:]), dtype=buf.dtype)
+    out[:len(buf)] = buf
+    return out
+
+
+class IncrementalKNN(FusedKNN):
+    """FusedKNN whose reference set takes new students between rebuilds.
+
+    `append` scales new rows with the fixed scaler and keeps them in a
+    delta searched exactly by brute force; every query merges the base
+    index's k nearest with the delta's. Once the delta passes
+    `max_delta` rows it is compacted into the base with one index
+    rebuild. Rows carry an integer cohort (e.g. a term number); with
+    `window`, only the newest `window` cohorts are kept, and older ones
+    are expired, with a rebuild, as soon as a newer cohort arrives.
+
+    Indices refer to the current reference set (base rows, then
+    appended rows in order), so a compaction that expires rows
+    renumbers them. Queries read one immutable snapshot, so they can
+    run while another thread appends or rebuilds.
+    """
+
+    def __init__(self, train, targets, mean, scale, k=4, weights="uniform", backend="brute",
+                 index=None, cohorts=0, max_delta=DEFAULT_MAX_DELTA, window=None, **index_options):
+        super().__init__(train, targets, mean, scale, k, weights, backend, index, **index_options)
+        if window is not None and window < 1:
+            raise ValueError("window must keep at least one cohort")
+        self.max_delta = int(max_delta)
+        self.window = window
+        self.compactions = 0
+        self._lock = threading.Lock()
+        n = len(self.train)
+        self._targets = np.empty(n + self.max_delta, dtype=np.float64)
+        self._targets[:n] = self.targets
+        self._cohorts = np.empty(n + self.max_delta, dtype=np.int64)
+        self._cohorts[:n] = np.broadcast_to(np.asarray(cohorts, dtype=np.int64), (n,))
+        self._delta = np.empty((self.max_delta, self.train.shape[1]), dtype=np.float64)
+        self._delta_n = 0
+        self._labels = set(np.unique(self._cohorts[:n]).tolist())
+        self._publish(None)
+
+    @classmethod
+    def from_engine(cls, engine, cohort=0, max_delta=DEFAULT_MAX_DELTA, window=None):
+        """Wrap a FusedKNN, keeping its index as the base (no rebuild)."""
+        return cls(
+            engine.train, engine.targets, engine.mean, engine.scale, engine.k, engine.weights,
+            engine.backend, engine.index, cohort, max_delta, window, **engine.index_options,
+        )
+
+    @property
+    def cohorts(self):
+        return self._snapshot[3]
+
+    def __len__(self):
+        return len(self._snapshot[2])
+
+    def _publish(self, delta_index):
+        n = len(self.train) + self._delta_n
+        self.targets = self._targets[:n]
+        self._snapshot = (self.index, delta_index, self.targets, self._cohorts[:n], len(self.train))
+
+    def kneighbors(self, X, k=None):
+        return self._query(self._snapshot, X, k)[:2]
+
+    def _neighbours(self, X):
+        snapshot = self._snapshot
+        dist, ind = self._query(snapshot, X)
+        return dist, ind, snapshot[2][ind]
+
+    def _query(self, snapshot, X, k=None):
+        index, delta_index, targets, _, n_base = snapshot
+        k = self.k if k is None else int(k)
+        if not 1 <= k <= len(targets):
+            raise ValueError(f"k={k} needs between 1 and {len(targets)} reference rows")
+        z = np.atleast_2d(self.transform(X))
+        if delta_index is None:
+            return index.query(z, k)
+        dist, ind = index.query(z, min(k, n_base))
+        d_dist, d_ind = delta_index.query(z, min(k, len(targets) - n_base))
+        dist = np.concatenate([dist, d_dist], axis=1)
+        ind = np.concatenate([ind, d_ind + n_base], axis=1)
+        order = np.argsort(dist, axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(dist, order, axis=1), np.take_along_axis(ind, order, axis=1)
+
+    def append(self, X, y, cohort=None):
+        """Add labelled rows (raw features, GPAs); returns the reference-set size.
+
+        `cohort` defaults to the newest cohort seen so far.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        y = np.asarray(y, dtype=np.float64).reshape(-1)
+        if X.shape != (len(y), self.train.shape[1]):
+            raise ValueError(f"expected ({len(y)}, {self.train.shape[1]}) rows for {len(y)} targets, got {X.shape}")
+        if not (np.isfinite(X).all() and np.isfinite(y).all()):
+            raise ValueError("rows and targets must be finite")
+        z = self.transform(X)
+
+        with self._lock:
+            cohort = max(self._labels) if cohort is None else int(cohort)
+            n = len(self.train) + self._delta_n
+            m = len(y)
+            # Rows past the live counts are scratch, so restoring the
+            # counts undoes a failed append (e.g. a window that would
+            # leave fewer than k rows).
+            delta_n, labels = self._delta_n, set(self._labels)
+            try:
+                self._delta = _grown(self._delta, self._delta_n + m)
+                self._targets = _grown(self._targets, n + m)
+                self._cohorts = _grown(self._cohorts, n + m)
+                self._delta[self._delta_n:self._delta_n + m] = z
+                self._targets[n:n + m] = y
+                self._cohorts[n:n + m] = cohort
+                self._delta_n += m
+                self._labels.add(cohort)
+
+                expired = None
+                if self.window is not None and len(self._labels) > self.window:
+                    cutoff = sorted(self._labels)[-self.window]
+                    expired = self._cohorts[:n + m] < cutoff
+                if expired is not None or self._delta_n > self.max_delta:
+                    self._compact(expired)
+                else:
+                    self._publish(BruteForceIndex(self._delta[:self._delta_n]))
+            except BaseException:
+                self._delta_n, self._labels = delta_n, labels
+                raise
+            return len(self.targets)
+
+    def expire(self, before):
+        """Drop every row of a cohort older than `before` (one rebuild)."""
+        with self._lock:
+            n = len(self.train) + self._delta_n
+            expired = self._cohorts[:n] < int(before)
+            if expired.any():
+                self._compact(expired)
+            return len(self.targets)
+
+    def compact(self):
+        """Fold the delta into the base index now."""
+        with self._lock:
+            if self._delta_n:
+                self._compact(None)
+
+    def _compact(self, expired):
+        n = len(self.train) + self._delta_n
+        train = np.concatenate([self.train, self._delta[:self._delta_n]])
+        targets, cohorts = self._targets[:n], self._cohorts[:n]
+        if expired is not None:
+            keep = ~expired
+            train, targets, cohorts = train[keep], targets[keep], cohorts[keep]
+        if len(targets) < self.k:
+            raise ValueError(f"only {len(targets)} rows would remain for k={self.k}")
+        train = np.ascontiguousarray(train)
+
+        # Built aside and published in one assignment, so queries keep
+        # using the old snapshot until the new index is ready.
+        options = {key: v for key, v in self.index_options.items() if key != "sq_norms"}
+        index = build_index(train, self.backend, **options)
+        self._targets = np.empty(len(targets) + self.max_delta, dtype=np.float64)
+        self._targets[:len(targets)] = targets
+        self._cohorts = np.empty(len(targets) + self.max_delta, dtype=np.int64)
+        self._cohorts[:len(targets)] = cohorts
+        self._delta = np.empty((self.max_delta, train.shape[1]), dtype=np.float64)
+        self._delta_n = 0
+        self._labels = set(np.unique(cohorts).tolist())
+        self.train, self.index = train, index
+        self.compactions += 1
+        self._publish(None)
+
+    def stats(self):
+        index, delta_index, targets, cohorts, n_base = self._snapshot
+        return {
+            "rows": len(targets),
+            "base_rows": n_base,
+            "delta_rows": len(targets) - n_base,
+            "cohorts": sorted(np.unique(cohorts).tolist()),
+            "compactions": self.compactions,
+        }
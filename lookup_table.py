@@ -0,0 +1,158 @@
+# ============================================================
+# 🎓 Dense GPA Lookup Table
+# Offline build of the model's GPA for every profile on the
+# discrete input grid (see grid.py), served via np.memmap
+#
+#   python lookup_table.py          # writes gpa_lookup.npy + .json
+# ============================================================
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from digest import file_digest
+from grid import GRID_SIZE, RADICES, STUDY_STEP, decode, encode
+from predictor import (
+    BASE_DIR, MODEL_PACK_PATH, BasePredictor, GPAPredictor, as_matrix, model_files,
+)
+
+TABLE_PATH = BASE_DIR / "gpa_lookup.npy"
+META_PATH = BASE_DIR / "gpa_lookup.json"
+FORMAT_VERSION = 2
+
+# GPA in [0, 4] is stored as uint16 fixed point: max error 4 / 65535 / 2 ≈ 3e-5.
+GPA_MAX = 4.0
+QUANT_LEVELS = np.iinfo(np.uint16).max
+BUILD_BATCH = 65_536
+
+
+def model_digests(pack_path=MODEL_PACK_PATH, model_path=None, scaler_path=None):
+    """{role: SHA-256} of the files GPAPredictor.open loads for these arguments."""
+    return {role: file_digest(path) for role, path in model_files(pack_path, model_path, scaler_path).items()}
+
+
+def build_table(predictor, table_path=TABLE_PATH, meta_path=META_PATH,
+                pack_path=MODEL_PACK_PATH, model_path=None, scaler_path=None, batch=BUILD_BATCH):
+    """Score every grid code in batches and write the quantised table.
+
+    The table is keyed on the model files chosen as GPAPredictor.open
+    chooses them, which should be the ones `predictor` was loaded from.
+    """
+    table = np.lib.format.open_memmap(table_path, mode="w+", dtype=np.uint16, shape=(GRID_SIZE,))
+    for start in range(0, GRID_SIZE, batch):
+        codes = np.arange(start, min(start + batch, GRID_SIZE), dtype=np.int64)
+        gpa = np.clip(predictor.predict(decode(codes)), 0.0, GPA_MAX)
+        table[start:start + len(codes)] = np.rint(gpa * (QUANT_LEVELS / GPA_MAX))
+    table.flush()
+    del table
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "radices": RADICES.tolist(),
+        "study_step": STUDY_STEP,
+        "gpa_scale": GPA_MAX / QUANT_LEVELS,
+        "model_sha256": model_digests(pack_path, model_path, scaler_path),
+    }
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+class LookupPredictor(BasePredictor):
+    """Serve GPAs from the memory-mapped table: one array index per row.
+
+    Loading needs only NumPy. Rows off the grid, and the neighbours in
+    `explain`, come from the GPAPredictor the table was built from
+    (opened on first use), so on-grid GPAs are the table's everywhere.
+    """
+
+    def __init__(self, table, gpa_scale, pack_path=MODEL_PACK_PATH, model_path=None, scaler_path=None):
+        self.table = table
+        self.gpa_scale = gpa_scale
+        self._paths = (pack_path, model_path, scaler_path)
+        self._fallback = None
+
+    @classmethod
+    def open(cls, table_path=TABLE_PATH, meta_path=META_PATH,
+             pack_path=MODEL_PACK_PATH, model_path=None, scaler_path=None, verify=True):
+        """Memory-map a built table, or return None if missing or stale.
+
+        Stale includes a table built from other model files than the
+        ones the fallback would load.
+        """
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        if (
+            meta.get("format_version") != FORMAT_VERSION
+            or meta.get("radices") != RADICES.tolist()
+            or meta.get("study_step") != STUDY_STEP
+        ):
+            return None
+        if verify and meta.get("model_sha256") != model_digests(pack_path, model_path, scaler_path):
+            return None
+        try:
+            table = np.load(table_path, mmap_mode="r")
+        except FileNotFoundError:
+            return None
+        if table.shape != (GRID_SIZE,):
+            return None
+        return cls(table, meta["gpa_scale"], pack_path, model_path, scaler_path)
+
+    def _model(self):
+        if self._fallback is None:
+            self._fallback = GPAPredictor.open(*self._paths)
+        return self._fallback
+
+    def predict(self, X):
+        X = as_matrix(X)
+        codes, on_grid = encode(X)
+        out = np.empty(len(X), dtype=np.float64)
+        out[on_grid] = self.table[codes[on_grid]] * self.gpa_scale
+        if not on_grid.all():
+            out[~on_grid] = self._model().predict(X[~on_grid])
+        return out
+
+    def explain(self, X):
+        """The model's neighbourhood, with on-grid GPAs (and intervals) from the table."""
+        X = as_matrix(X)
+        model = self._model()
+        out = model.explain(X)
+        codes, on_grid = encode(X)
+        if on_grid.any():
+            gpa = out["gpa"].copy()
+            gpa[on_grid] = self.table[codes[on_grid]] * self.gpa_scale
+            out["gpa"] = gpa
+            if "low" in out:
+                half = model.calibration[out["level"]]
+                out["low"] = np.clip(gpa - half, 0.0, GPA_MAX)
+                out["high"] = np.clip(gpa + half, 0.0, GPA_MAX)
+        return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the dense GPA lookup table.")
+    parser.add_argument("--pack", default=MODEL_PACK_PATH, help="model pack (see artifact.py)")
+    parser.add_argument("--model", help="pickled model instead of the pack")
+    parser.add_argument("--scaler", help="pickled scaler instead of the pack")
+    parser.add_argument("--table", default=TABLE_PATH)
+    parser.add_argument("--meta", default=META_PATH)
+    parser.add_argument("--backend", default="kd_tree", help="neighbour index used for the build")
+    args = parser.parse_args(argv)
+
+    predictor = GPAPredictor.open(args.pack, args.model, args.scaler, args.backend)
+    start = time.perf_counter()
+    build_table(predictor, args.table, args.meta, args.pack, args.model, args.scaler)
+    print(
+        f"wrote {GRID_SIZE:,} GPAs to {args.table} in {time.perf_counter() - start:.1f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# ============================================================
+# 🎓 Micro-Batching Request Coalescer
+# Collects concurrent single-row predictions into one vectorised
+# transform + predict call, then fans the results back out
+# ============================================================
+
+import asyncio
+import threading
+
+import numpy as np
+
+DEFAULT_MAX_WAIT = 0.002
+DEFAULT_MAX_BATCH = 256
+N_FEATURES = 8
+
+
+class MicroBatcher:
+    """Coalesce concurrent `await predict(row)` calls into batches.
+
+    A batch is flushed when `max_batch` rows are waiting or `max_wait`
+    seconds after its first row arrived, whichever comes first, so no
+    request waits longer than the window for its batch to start.
+    `predict_fn` takes an (N, n_features) matrix and returns N
+    predictions. Each row is checked before it joins a batch, so a
+    malformed row fails only its own call, not its batch-mates.
+    """
+
+    def __init__(self, predict_fn, max_wait=DEFAULT_MAX_WAIT, max_batch=DEFAULT_MAX_BATCH,
+                 n_features=N_FEATURES):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.predict_fn = predict_fn
+        self.n_features = n_features
+        self.max_wait = max_wait
+        self.max_batch = max_batch
+        self._rows = []
+        self._futures = []
+        self._timer = None
+        self.batches = 0
+        self.rows = 0
+
+    async def predict(self, row):
+        row = np.asarray(row, dtype=np.float64)
+        if row.shape != (self.n_features,):
+            raise ValueError(f"expected a row of {self.n_features} features, got shape {row.shape}")
+        if not np.isfinite(row).all():
+            raise ValueError("row has non-finite values")
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._rows.append(row)
+        self._futures.append(fut)
+        if len(self._rows) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self.flush)
+        return await fut
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        rows, futures = self._rows, self._futures
+        if not rows:
+            return
+        self._rows, self._futures = [], []
+
+        try:
+            preds = self.predict_fn(np.stack(rows))
+        except Exception as exc:
+            for fut in futures:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+
+        self.batches += 1
+        self.rows += len(rows)
+        for fut, pred in zip(futures, preds.tolist()):
+            if not fut.done():
+                fut.set_result(pred)
+
+    @property
+    def mean_batch_size(self):
+        return self.rows / self.batches if self.batches else 0.0
+
+
+class ThreadedMicroBatcher:
+    """Run a MicroBatcher on a private event loop for threaded callers.
+
+    Lets blocking servers (e.g. ThreadingHTTPServer in service.py) share
+    one coalescer: each handler thread blocks only on its own result.
+    """
+
+    def __init__(self, predict_fn, max_wait=DEFAULT_MAX_WAIT, max_batch=DEFAULT_MAX_BATCH,
+                 n_features=N_FEATURES):
+        self.batcher = MicroBatcher(predict_fn, max_wait, max_batch, n_features)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="microbatch", daemon=True)
+        self._thread.start()
+
+    def predict(self, row, timeout=None):
+        fut = asyncio.run_coroutine_threadsafe(self.batcher.predict(row), self._loop)
+        return fut.result(timeout)
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self.batcher.flush)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,199 @@
+# ============================================================
+# 🎓 Neighbour-Search Backends
+# Pluggable k-nearest-neighbour indexes over the scaled
+# training matrix used by knn_engine.FusedKNN
+#
+#   brute      exact, BLAS distance kernel (best for small sets)
+#   kd_tree    exact, scikit-learn KDTree
+#   ball_tree  exact, scikit-learn BallTree
+#   ivf        approximate inverted-file index; n_probe trades
+#              recall for speed on very large training sets
+#
+# Every index exposes `query(Z, k) -> (distances, indices)` over
+# already-standardised queries, nearest first.
+# ============================================================
+
+import numpy as np
+
+# Queries are processed in blocks so the per-block candidate
+# distance matrix stays around 32 MB regardless of batch size.
+BLOCK_ELEMENTS = 4_000_000
+
+
+def row_sq_norms(data):
+    """||t||^2 per row, as BruteForceIndex computes it."""
+    return np.einsum("ij,ij->i", data, data)
+
+
+def _check_k(k, n):
+    if not 1 <= k <= n:
+        raise ValueError(f"k={k} needs between 1 and {n} indexed rows")
+
+
+def _rerank(data, Z, cand, k, valid=None):
+    """Exact top-k among candidate rows: (distances, indices)."""
+    diff = data[cand] - Z[:, None, :]
+    exact = np.einsum("ijk,ijk->ij", diff, diff)
+    if valid is not None:
+        exact[~valid] = np.inf
+    order = np.argsort(exact, axis=1, kind="stable")[:, :k]
+    return (
+        np.sqrt(np.take_along_axis(exact, order, axis=1)),
+        np.take_along_axis(cand, order, axis=1),
+    )
+
+
+class BruteForceIndex:
+    """Exact search: one matmul per block, then exact re-ranking.
+
+    ||t||^2 - 2 z.t ranks rows like ||z - t||^2; the best 2k rows under
+    that expansion are re-ranked on exact squared distances so results
+    match scikit-learn to floating-point round-off.
+
+    The index keeps no derived copy of `data`: a float64 C-order matrix
+    (e.g. a read-only memory map) is searched in place, and the row
+    norms can be supplied precomputed as `sq_norms`, so processes
+    mapping the same model pack share the whole index.
+    """
+
+    def __init__(self, data, sq_norms=None):
+        self.data = np.ascontiguousarray(data, dtype=np.float64)
+        if sq_norms is None:
+            sq_norms = row_sq_norms(self.data)
+        elif np.shape(sq_norms) != (len(self.data),):
+            raise ValueError(f"sq_norms has shape {np.shape(sq_norms)}, expected ({len(self.data)},)")
+        self._sq = sq_norms
+
+    def query(self, Z, k):
+        n = len(self.data)
+        _check_k(k, n)
+        n_cand = min(2 * k, n)
+        block = max(1, BLOCK_ELEMENTS // n)
+
+        dist = np.empty((len(Z), k), dtype=np.float64)
+        ind = np.empty((len(Z), k), dtype=np.intp)
+        for start in range(0, len(Z), block):
+            z = Z[start:start + block]
+            approx = (z * -2.0) @ self.data.T
+            approx += self._sq
+            if n_cand < n:
+                cand = np.argpartition(approx, n_cand - 1, axis=1)[:, :n_cand]
+            else:
+                cand = np.broadcast_to(np.arange(n), approx.shape)
+            dist[start:start + block], ind[start:start + block] = _rerank(self.data, z, cand, k)
+        return dist, ind
+
+
+class TreeIndex:
+    """Exact search through scikit-learn's KDTree or BallTree."""
+
+    def __init__(self, data, kind="kd_tree", leaf_size=30):
+        from sklearn.neighbors import BallTree, KDTree
+
+        trees = {"kd_tree": KDTree, "ball_tree": BallTree}
+        if kind not in trees:
+            raise ValueError(f"unknown tree kind {kind!r}")
+        self.data = np.ascontiguousarray(data, dtype=np.float64)
+        self.tree = trees[kind](self.data, leaf_size=leaf_size)
+
+    def query(self, Z, k):
+        _check_k(k, len(self.data))
+        return self.tree.query(Z, k=k)
+
+
+class IVFIndex:
+    """Approximate search over k-means inverted lists.
+
+    Rows are bucketed by their nearest of `n_lists` centroids. A query
+    scans only its `n_probe` nearest lists, so raising `n_probe` buys
+    recall at the cost of speed. Lists are stored as a dense padded
+    (n_chunks, cap) matrix so candidate gathering stays vectorised
+    across a block of queries; lists longer than `cap` are split into
+    several chunks sharing one centroid, which keeps padding bounded
+    even when many students share identical discrete features.
+    """
+
+    def __init__(self, data, n_lists=None, n_probe=8, iters=12, sample=65_536, seed=0):
+        self.data = np.ascontiguousarray(data, dtype=np.float64)
+        n = len(self.data)
+        n_lists = min(int(n_lists or max(1, round(np.sqrt(n)))), n)
+        self.n_probe = n_probe
+
+        rng = np.random.default_rng(seed)
+        fit_rows = self.data[rng.choice(n, min(n, sample), replace=False)]
+        centroids = _kmeans(fit_rows, n_lists, iters, rng)
+
+        assign = BruteForceIndex(centroids).query(self.data, 1)[1][:, 0]
+        counts = np.bincount(assign, minlength=n_lists)
+        cap = max(1, int(np.ceil(2 * n / n_lists)))
+        chunks = -(-counts // cap)
+        chunk_start = np.concatenate(([0], np.cumsum(chunks)[:-1]))
+
+        order = np.argsort(assign, kind="stable")
+        list_start = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        rank = np.arange(n) - list_start[assign[order]]
+        self.lists = np.full((chunks.sum(), cap), -1, dtype=np.intp)
+        self.lists[chunk_start[assign[order]] + rank // cap, rank % cap] = order
+        self.centroids = np.repeat(centroids, chunks, axis=0)
+        self._centroid_index = BruteForceIndex(self.centroids)
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    def query(self, Z, k, n_probe=None):
+        n = len(self.data)
+        _check_k(k, n)
+        n_probe = min(int(n_probe or self.n_probe), self.n_lists)
+        width = n_probe * self.lists.shape[1]
+        block = max(1, BLOCK_ELEMENTS // (width * self.data.shape[1]))
+
+        dist = np.empty((len(Z), k), dtype=np.float64)
+        ind = np.empty((len(Z), k), dtype=np.intp)
+        for start in range(0, len(Z), block):
+            z = Z[start:start + block]
+            probes = self._centroid_index.query(z, n_probe)[1]
+            cand = self.lists[probes].reshape(len(z), -1)
+            if width < k:
+                # Pad so every query still has k slots; empty ones stay
+                # at inf distance and trigger the exact fallback below.
+                cand = np.pad(cand, ((0, 0), (0, k - width)), constant_values=-1)
+            valid = cand >= 0
+            dist[start:start + block], ind[start:start + block] = _rerank(
+                self.data, z, np.where(valid, cand, 0), k, valid
+            )
+
+        # Rows whose probed lists held fewer than k points fall back to exact search.
+        short = np.isinf(dist[:, -1])
+        if short.any():
+            dist[short], ind[short] = BruteForceIndex(self.data).query(Z[short], k)
+        return dist, ind
+
+
+def _kmeans(X, n_clusters, iters, rng):
+    centroids = X[rng.choice(len(X), n_clusters, replace=False)].copy()
+    for _ in range(iters):
+        labels = BruteForceIndex(centroids).query(X, 1)[1][:, 0]
+        counts = np.bincount(labels, minlength=n_clusters)
+        sums = np.column_stack([
+            np.bincount(labels, weights=X[:, j], minlength=n_clusters) for j in range(X.shape[1])
+        ])
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        # Re-seed empty clusters on random points so every list is used.
+        centroids[empty] = X[rng.choice(len(X), empty.sum(), replace=False)]
+    return centroids
+
+
+BACKENDS = ("brute", "kd_tree", "ball_tree", "ivf")
+
+
+def build_index(data, backend="brute", **options):
+    """Construct a neighbour index by backend name."""
+    if backend == "brute":
+        return BruteForceIndex(data, **options)
+    if backend in ("kd_tree", "ball_tree"):
+        return TreeIndex(data, kind=backend, **options)
+    if backend == "ivf":
+        return IVFIndex(data, **options)
+    raise ValueError(f"unknown neighbour backend {backend!r}; choose from {', '.join(BACKENDS)}")
@@ -0,0 +1,266 @@
+# ============================================================
+# 🎓 GPA Prediction Engine
+# Headless model loading and vectorised scoring, shared by the
+# Streamlit app, the batch scorer and the HTTP service
+# ============================================================
+
+import json
+import pickle
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import numpy as np
+
+from digest import file_digest
+from knn_engine import DEFAULT_MAX_DELTA, FusedKNN, IncrementalKNN
+from prediction_cache import PredictionCache
+
+BASE_DIR = Path(__file__).resolve().parent
+MODEL_PATH = BASE_DIR / "model.pkl"
+SCALER_PATH = BASE_DIR / "scaler.pkl"
+# Pickle-free export of the same model (see artifact.py).
+MODEL_PACK_PATH = BASE_DIR / "model.gpaknn"
+# Conformal interval half-widths written by `train.py --install`.
+CALIBRATION_PATH = BASE_DIR / "calibration.json"
+INTERVAL_LEVEL = 0.9
+
+# Column order the scaler and KNN model were fitted on
+# (same layout as `input_arr` in the prediction tab).
+FEATURES = (
+    "StudyTimeWeekly", "Absences", "Tutoring", "ParentalSupport",
+    "Extracurricular", "Sports", "Music", "GradeClass",
+)
+STUDY_COL = FEATURES.index("StudyTimeWeekly")
+
+# Performance bands used across the dashboard (lower edge inclusive).
+BAND_EDGES = np.array([1.8, 2.5, 3.5])
+BAND_LABELS = np.array(["Academic Risk", "Average", "Good", "Excellent"])
+
+
+def risk_band(gpa):
+    """Vectorised band label for an array of GPAs."""
+    return BAND_LABELS[np.searchsorted(BAND_EDGES, gpa, side="right")]
+
+
+def load_objects(model_path=MODEL_PATH, scaler_path=SCALER_PATH):
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+    with open(scaler_path, "rb") as f:
+        scaler = pickle.load(f)
+    return model, scaler
+
+
+def load_calibration(path=CALIBRATION_PATH, model_path=MODEL_PATH, model_sha256=None):
+    """{coverage level: GPA half-width}, or None if missing or for another model.
+
+    The model is identified by `model_sha256` when given, otherwise by
+    hashing `model_path`.
+    """
+    try:
+        with open(path) as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        return None
+    if model_sha256 is None:
+        model_sha256 = file_digest(model_path)
+    if meta.get("model_sha256") != model_sha256:
+        return None
+    return {float(level): float(width) for level, width in meta["half_widths"].items()}
+
+
+def model_files(pack_path=MODEL_PACK_PATH, model_path=None, scaler_path=None):
+    """{role: path} of the files `GPAPredictor.open` loads for these arguments."""
+    if model_path is None and scaler_path is None and Path(pack_path).exists():
+        return {"pack": pack_path}
+    return {"model": model_path or MODEL_PATH, "scaler": scaler_path or SCALER_PATH}
+
+
+def encode_profile(profile):
+    """Turn a mapping keyed by FEATURES into one model-ordered row."""
+    missing = [c for c in FEATURES if c not in profile]
+    if missing:
+        raise ValueError(f"missing features: {', '.join(missing)}")
+    row = [float(profile[c]) for c in FEATURES]
+    bad = [c for c, value in zip(FEATURES, row) if not np.isfinite(value)]
+    if bad:
+        raise ValueError(f"non-finite features: {', '.join(bad)}")
+    return row
+
+
+def as_matrix(X):
+    """Coerce rows (or a single row) into a contiguous (N, 8) float64 matrix.
+
+    Raises ValueError for the wrong shape or any NaN/inf value.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    if X.ndim == 1:
+        X = X.reshape(1, -1)
+    if X.ndim != 2 or X.shape[1] != len(FEATURES):
+        raise ValueError(f"expected rows of {len(FEATURES)} features, got shape {X.shape}")
+    finite = np.isfinite(X)
+    if not finite.all():
+        rows = np.flatnonzero(~finite.all(axis=1))[:10].tolist()
+        raise ValueError(f"non-finite values in row(s) {', '.join(map(str, rows))}")
+    return X
+
+
+def study_time_grid(profile, start=0.0, stop=40.0, points=41):
+    """Build an (N, 8) grid that varies study time and holds the rest fixed."""
+    hours = np.linspace(start, stop, points)
+    grid = np.empty((points, len(FEATURES)), dtype=np.float64)
+    grid[:] = np.asarray(profile, dtype=np.float64)
+    grid[:, STUDY_COL] = hours
+    return hours, grid
+
+
+class BasePredictor(ABC):
+    """Convenience scoring helpers on top of a subclass's `predict` and `explain`."""
+
+    cache = None
+
+    @abstractmethod
+    def predict(self, X):
+        """GPA per row of an (N, 8) model-ordered matrix."""
+
+    @abstractmethod
+    def explain(self, X):
+        """Per-row neighbourhood arrays (the keys `explain_one` reads)."""
+
+    def predict_one(self, row):
+        """Rounded GPA for a single model-ordered row."""
+        return round(float(self.predict(row)[0]), 2)
+
+    def explain_one(self, row):
+        """Rounded GPA plus its neighbourhood for a single row, as plain Python."""
+        out = self.explain(row)
+        result = {
+            "gpa": round(float(out["gpa"][0]), 2),
+            "spread": round(float(out["spread"][0]), 3),
+            "neighbour_gpa": out["neighbour_gpa"][0].round(3).tolist(),
+            "distance": out["distance"][0].round(4).tolist(),
+            "index": out["index"][0].tolist(),
+        }
+        if "low" in out:
+            result["interval"] = (
+                out["level"], round(float(out["low"][0]), 2), round(float(out["high"][0]), 2),
+            )
+        return result
+
+    def simulate_study_time(self, profile, start=0.0, stop=40.0, points=41):
+        """Predicted GPA curve over study hours for a fixed student profile.
+
+        The whole curve is scored in a single batch, so denser curves
+        (e.g. 1,000 points) cost about the same as the default. The
+        default 1 h spacing stays on the cached 0.5 h input grid.
+        """
+        hours, grid = study_time_grid(profile, start, stop, points)
+        gpas = np.clip(self.predict(grid), 0.0, 4.0).round(3)
+        return hours, gpas
+
+
+class GPAPredictor(BasePredictor):
+    """Fitted KNN model with batch-first scoring helpers.
+
+    Scoring goes through a FusedKNN, which returns the same GPAs as
+    `model.predict(scaler.transform(X))` without sklearn's per-call
+    validation. It is built from the pickle-free model pack
+    (`from_pack`) or the pickled pair (`from_files`); `open` prefers
+    the pack. `backend` picks the neighbour index (see neighbors.py);
+    `cache=True` memoises on-grid profiles in a PredictionCache.
+    `calibration` ({level: half-width}) adds conformal intervals to
+    `explain`. `append` adds labelled students without a retrain (see
+    `enable_updates`).
+    """
+
+    def __init__(self, engine, cache=False, calibration=None):
+        self.engine = engine
+        self.cache = PredictionCache(self.engine.predict) if cache else None
+        self.calibration = calibration
+
+    @classmethod
+    def from_sklearn(cls, model, scaler, backend="brute", cache=False, calibration=None,
+                     **index_options):
+        return cls(FusedKNN.from_sklearn(model, scaler, backend, **index_options), cache, calibration)
+
+    @classmethod
+    def from_files(cls, model_path=MODEL_PATH, scaler_path=SCALER_PATH, backend="brute",
+                   cache=False, **index_options):
+        """Unpickle model.pkl/scaler.pkl (needs the scikit-learn that wrote them)."""
+        calibration = load_calibration(model_path=model_path)
+        return cls.from_sklearn(*load_objects(model_path, scaler_path), backend, cache, calibration,
+                                **index_options)
+
+    @classmethod
+    def from_pack(cls, path=MODEL_PACK_PATH, backend="brute", cache=False, **index_options):
+        """Memory-map a model pack: no unpickling, no scikit-learn for the brute backend."""
+        from artifact import ModelPack
+
+        pack = ModelPack.open(path)
+        calibration = load_calibration(model_sha256=pack.header.get("source_model_sha256"))
+        return cls(FusedKNN.from_pack(pack, backend, **index_options), cache, calibration)
+
+    @classmethod
+    def open(cls, pack_path=MODEL_PACK_PATH, model_path=None, scaler_path=None,
+             backend="brute", cache=False, **index_options):
+        """The model pack, unless pickle paths are given or no pack exists."""
+        files = model_files(pack_path, model_path, scaler_path)
+        if "pack" in files:
+            return cls.from_pack(files["pack"], backend, cache, **index_options)
+        return cls.from_files(files["model"], files["scaler"], backend, cache, **index_options)
+
+    def enable_updates(self, window=None, max_delta=DEFAULT_MAX_DELTA, cohort=0):
+        """Switch to an IncrementalKNN engine so `append` can add students.
+
+        The current index becomes the base and its rows are labelled
+        `cohort`; `window` keeps only the newest cohorts (see
+        knn_engine.IncrementalKNN). A no-op once enabled.
+        """
+        if not isinstance(self.engine, IncrementalKNN):
+            self.engine = IncrementalKNN.from_engine(self.engine, cohort, max_delta, window)
+            if self.cache is not None:
+                self.cache = PredictionCache(self.engine.predict)
+        return self
+
+    def append(self, X, y, cohort=None):
+        """Add labelled students (model-ordered rows, GPAs); live for the next query.
+
+        The scaler is not refitted: new rows are standardised with the
+        training mean/scale. Returns the reference-set size.
+        """
+        self.enable_updates()
+        size = self.engine.append(as_matrix(X), y, cohort)
+        if self.cache is not None:
+            self.cache.clear()
+        return size
+
+    def predict(self, X):
+        """Raw GPA for an (N, 8) matrix, scored in one vectorised pass."""
+        X = as_matrix(X)
+        if self.cache is not None:
+            return self.cache.predict(X)
+        return self.engine.predict(X)
+
+    def explain(self, X):
+        """GPA, neighbour GPAs/distances/indices and spread from one query.
+
+        `spread` is the (weighted) standard deviation of the k neighbour
+        GPAs. With a calibration, `low`/`high` bound the conformal
+        interval at INTERVAL_LEVEL coverage.
+        """
+        X = as_matrix(X)
+        gpa, spread, dist, ind, neighbour_gpa = self.engine.predict_neighbours(X)
+        out = {
+            "gpa": gpa,
+            "spread": spread,
+            "neighbour_gpa": neighbour_gpa,
+            "distance": dist,
+            "index": ind,
+        }
+        if self.calibration and INTERVAL_LEVEL in self.calibration:
+            half = self.calibration[INTERVAL_LEVEL]
+            out.update(
+                level=INTERVAL_LEVEL,
+                low=np.clip(gpa - half, 0.0, 4.0),
+                high=np.clip(gpa + half, 0.0, 4.0),
+            )
+        return out
@@ -0,0 +1,76 @@
+# ============================================================
+# 🎓 What-If Sensitivity
+# 2-D GPA surfaces and a one-at-a-time sweep over every feature,
+# all scored in a single batched predict around one profile
+# ============================================================
+
+import numpy as np
+
+from grid import STUDY_STEP
+from predictor import FEATURES, as_matrix
+
+# Every level the prediction tab's widgets can produce, per feature.
+# All of them are on the cached grid (see grid.py), which also covers
+# parental support 4 and grade class 0 for data rows.
+FEATURE_LEVELS = {
+    "StudyTimeWeekly": np.arange(81) * STUDY_STEP,
+    "Absences": np.arange(51.0),
+    "Tutoring": np.arange(2.0),
+    "ParentalSupport": np.arange(4.0),
+    "Extracurricular": np.arange(2.0),
+    "Sports": np.arange(2.0),
+    "Music": np.arange(2.0),
+    "GradeClass": np.arange(1.0, 5.0),
+}
+
+# Each surface varies its features jointly; the first is the x axis and
+# any further features are flattened into the y axis (last fastest).
+SURFACES = (
+    ("StudyTimeWeekly", "Absences"),
+    ("StudyTimeWeekly", "Tutoring", "ParentalSupport"),
+)
+
+
+def profile_grid(profile, names):
+    """(N, 8) rows: `profile` with `names` swept over the cartesian product of their levels.
+
+    Rows are ordered like np.indices over the levels, first name slowest.
+    """
+    levels = [FEATURE_LEVELS[name] for name in names]
+    shape = tuple(len(v) for v in levels)
+    grid = np.empty((int(np.prod(shape)), len(FEATURES)), dtype=np.float64)
+    grid[:] = as_matrix(profile)[0]
+    for name, values, idx in zip(names, levels, np.indices(shape).reshape(len(shape), -1)):
+        grid[:, FEATURES.index(name)] = values[idx]
+    return grid
+
+
+def what_if(predictor, profile, surfaces=SURFACES):
+    """Every sensitivity view for one profile from one predict call.
+
+    Returns {"base": GPA, "surfaces": [(names, (x_len, y_len) GPA matrix)],
+    "oat": {feature: GPA per level}}, GPAs clipped to [0, 4].
+    """
+    blocks = [as_matrix(profile)]
+    blocks += [profile_grid(profile, names) for names in surfaces]
+    blocks += [profile_grid(profile, (name,)) for name in FEATURES]
+    gpa = np.clip(predictor.predict(np.concatenate(blocks)), 0.0, 4.0)
+    parts = np.split(gpa, np.cumsum([len(b) for b in blocks])[:-1])
+
+    result = {"base": float(parts[0][0]), "surfaces": [], "oat": {}}
+    for names, values in zip(surfaces, parts[1:1 + len(surfaces)]):
+        result["surfaces"].append((names, values.reshape(len(FEATURE_LEVELS[names[0]]), -1)))
+    for name, values in zip(FEATURES, parts[1 + len(surfaces):]):
+        result["oat"][name] = values
+    return result
+
+
+def axis_labels(names):
+    """Tick labels for a surface's y axis (its features after the first)."""
+    if len(names) == 2:
+        return [f"{v:g}" for v in FEATURE_LEVELS[names[1]]]
+    grids = np.meshgrid(*(FEATURE_LEVELS[name] for name in names[1:]), indexing="ij")
+    return [
+        " · ".join(f"{name[:8]} {v:g}" for name, v in zip(names[1:], combo))
+        for combo in zip(*(g.ravel() for g in grids))
+    ]
@@ -0,0 +1,288 @@
+# ============================================================
+# 🎓 GPA Prediction Service
+# Lightweight HTTP/JSON front-end to predictor.GPAPredictor
+#
+#   python service.py --port 8000 [--micro-batch-ms 2]
+#   python service.py --port 8000 --workers 4   # processes sharing one mapped model
+#
+#   GET  /health          -> {"status": "ok", "features": [...]}
+#   GET  /metrics         -> Prometheus text format request-latency histograms
+#   POST /predict         {"StudyTimeWeekly": 12, "Absences": 4, ...}
+#                         -> {"gpa": 2.82, "band": "Good"}
+#   POST /predict/batch   {"students": [{...}, ...]}  or  {"rows": [[8 values], ...]}
+#                         -> {"gpa": [...], "band": [...]}
+#   POST /students        {"students": [{..., "GPA": 3.1}], "cohort": 20251}
+#                         or {"rows": [[8 values], ...], "gpa": [...], "cohort": ...}
+#                         -> {"added": n, "rows": ..., ...}   (needs --allow-updates)
+# ============================================================
+
+import argparse
+import json
+import multiprocessing
+import signal
+import sys
+import time
+from multiprocessing.connection import wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from microbatch import DEFAULT_MAX_BATCH, ThreadedMicroBatcher
+from neighbors import BACKENDS
+from knn_engine import IncrementalKNN
+from predictor import FEATURES, MODEL_PACK_PATH, GPAPredictor, encode_profile, risk_band
+from telemetry import Registry
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+GPA_RANGE = (0.0, 4.0)      # the scale ingest.py accepts for training rows
+METRICS = Registry()
+REQUEST_SECONDS = METRICS.histogram(
+    "gpa_service_request_seconds", "Time to handle a prediction request.", labels=("route", "status"))
+
+
+def score_rows(predictor, X):
+    gpa = np.clip(predictor.predict(X), 0.0, 4.0).round(2)
+    return gpa, risk_band(gpa)
+
+
+def handle_single(predictor, payload, batcher=None):
+    if not isinstance(payload, dict):
+        raise ValueError("expected a JSON object keyed by feature name")
+    row = encode_profile(payload)
+    if batcher is None:
+        gpa, band = score_rows(predictor, row)
+        return {"gpa": float(gpa[0]), "band": str(band[0])}
+    gpa = round(min(max(batcher.predict(row), 0.0), 4.0), 2)
+    return {"gpa": gpa, "band": str(risk_band(gpa))}
+
+
+def handle_batch(predictor, payload, batcher=None):
+    if not isinstance(payload, dict):
+        raise ValueError('expected {"students": [...]} or {"rows": [...]}')
+    if "rows" in payload:
+        X = payload["rows"]
+    elif "students" in payload:
+        X = [encode_profile(s) for s in payload["students"]]
+    else:
+        raise ValueError('expected {"students": [...]} or {"rows": [...]}')
+    if len(X) == 0:
+        return {"gpa": [], "band": []}
+    gpa, band = score_rows(predictor, X)
+    return {"gpa": gpa.tolist(), "band": band.tolist()}
+
+
+def _cohort(value):
+    """`cohort` from JSON as an int64-sized integer (3 and 3.0 both pass)."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or not -2**63 <= value < 2**63:
+        raise ValueError(f"cohort must be an integer, got {value!r}")
+    return value
+
+
+def handle_append(predictor, payload, batcher=None):
+    if not isinstance(predictor.engine, IncrementalKNN):
+        raise ValueError("updates are disabled; start the service with --allow-updates")
+    if not isinstance(payload, dict):
+        raise ValueError('expected {"students": [...]} or {"rows": [...], "gpa": [...]}')
+    if "rows" in payload:
+        X, y = payload["rows"], payload.get("gpa")
+        if y is None:
+            raise ValueError('"rows" needs a matching "gpa" list')
+    elif "students" in payload:
+        students = payload["students"]
+        if any("GPA" not in s for s in students):
+            raise ValueError("every student needs a GPA")
+        X = [encode_profile(s) for s in students]
+        y = [float(s["GPA"]) for s in students]
+    else:
+        raise ValueError('expected {"students": [...]} or {"rows": [...], "gpa": [...]}')
+    if len(X) == 0:
+        return {"added": 0, **predictor.engine.stats()}
+    cohort = payload.get("cohort")
+    cohort = None if cohort is None else _cohort(cohort)
+    y = np.asarray(y, dtype=np.float64)
+    lo, hi = GPA_RANGE
+    if not ((y >= lo) & (y <= hi)).all():
+        raise ValueError(f"every GPA must be between {lo:g} and {hi:g}")
+    predictor.append(X, y, cohort)
+    return {"added": len(X), **predictor.engine.stats()}
+
+
+ROUTES = {
+    "/predict": handle_single,
+    "/predict/batch": handle_batch,
+    "/students": handle_append,
+}
+
+
+def make_handler(predictor, access_log=False, batcher=None):
+
+    class PredictionHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send_json(self, status, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, {"status": "ok", "features": list(FEATURES)})
+            elif self.path == "/metrics":
+                data = METRICS.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            else:
+                self._send_json(404, {"error": f"unknown path {self.path}"})
+
+        def do_POST(self):
+            route = ROUTES.get(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_BODY_BYTES:
+                self.close_connection = True
+                self._send_json(413, {"error": "request body too large"})
+                return
+            raw = self.rfile.read(length)
+            if route is None:
+                self._send_json(404, {"error": f"unknown path {self.path}"})
+                return
+            started = time.perf_counter()
+            try:
+                body = route(predictor, json.loads(raw or b"null"), batcher)
+            except (ValueError, TypeError, OverflowError) as exc:
+                REQUEST_SECONDS.observe(time.perf_counter() - started, self.path, "400")
+                self._send_json(400, {"error": str(exc)})
+                return
+            REQUEST_SECONDS.observe(time.perf_counter() - started, self.path, "200")
+            self._send_json(200, body)
+
+        def log_message(self, fmt, *args):
+            if access_log:
+                super().log_message(fmt, *args)
+
+    return PredictionHandler
+
+
+def make_server(predictor, host="127.0.0.1", port=8000, access_log=False, batcher=None,
+                reuse_port=False):
+    """`reuse_port` lets several worker processes bind the same port (SO_REUSEPORT)."""
+    server = ThreadingHTTPServer(
+        (host, port), make_handler(predictor, access_log, batcher), bind_and_activate=False,
+    )
+    server.daemon_threads = True
+    server.allow_reuse_port = reuse_port
+    try:
+        server.server_bind()
+        server.server_activate()
+    except BaseException:
+        server.server_close()
+        raise
+    return server
+
+
+def serve(predictor, args, reuse_port=False):
+    batcher = None
+    if args.micro_batch_ms > 0:
+        batcher = ThreadedMicroBatcher(predictor.predict, args.micro_batch_ms / 1000.0, args.micro_batch_rows)
+    server = make_server(predictor, args.host, args.port, args.access_log, batcher, reuse_port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if batcher is not None:
+            batcher.close()
+
+
+def _worker(args):
+    # Maps the pack read-only: the training matrix, targets, scaler and
+    # (for brute) the index are the loader's pages, not a private copy.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    serve(GPAPredictor.from_pack(args.pack, args.backend), args, reuse_port=True)
+
+
+def serve_workers(args):
+    """Verify the pack once, then run `args.workers` processes that map it.
+
+    The loader reads the whole pack to check its checksum, which also
+    leaves it in the page cache; each spawned worker then maps the same
+    file, so startup is an mmap and the model is held once per host.
+    The kernel spreads connections over the workers' SO_REUSEPORT
+    sockets. If any worker exits, the rest are stopped.
+    """
+    from artifact import ModelPack
+
+    ModelPack.open(args.pack, verify=True)
+    ctx = multiprocessing.get_context("spawn")
+    workers = [
+        ctx.Process(target=_worker, args=(args,), name=f"gpa-worker-{i}", daemon=True)
+        for i in range(args.workers)
+    ]
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        for worker in workers:
+            worker.start()
+        print(f"GPA prediction service listening on http://{args.host}:{args.port} "
+              f"({args.workers} workers sharing {args.pack})")
+        wait([worker.sentinel for worker in workers])
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for worker in workers:
+            worker.join()
+    return max((worker.exitcode or 0 for worker in workers), default=0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve GPA predictions over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--pack", default=MODEL_PACK_PATH, help="model pack (see artifact.py)")
+    parser.add_argument("--model", help="pickled model instead of the pack")
+    parser.add_argument("--scaler", help="pickled scaler instead of the pack")
+    parser.add_argument("--backend", default="brute", choices=BACKENDS, help="neighbour index")
+    parser.add_argument("--access-log", action="store_true", help="log every request to stderr")
+    parser.add_argument(
+        "--micro-batch-ms", type=float, default=0.0,
+        help="coalesce concurrent /predict calls for up to this many ms (0 disables)",
+    )
+    parser.add_argument("--micro-batch-rows", type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="serve from this many processes that share the memory-mapped model pack",
+    )
+    parser.add_argument("--allow-updates", action="store_true",
+                        help="accept new labelled students at POST /students")
+    parser.add_argument("--window", type=int,
+                        help="with --allow-updates, keep only the newest WINDOW cohorts")
+    parser.add_argument("--base-cohort", type=int, default=0,
+                        help="cohort label of the packed training rows")
+    args = parser.parse_args(argv)
+
+    if args.workers > 1:
+        if args.model or args.scaler:
+            parser.error("--workers serves the model pack; drop --model/--scaler")
+        if args.allow_updates:
+            parser.error("--allow-updates needs a single process (workers would diverge)")
+        sys.exit(serve_workers(args))
+
+    predictor = GPAPredictor.open(args.pack, args.model, args.scaler, args.backend)
+    if args.allow_updates:
+        predictor.enable_updates(args.window, cohort=args.base_cohort)
+    print(f"GPA prediction service listening on http://{args.host}:{args.port}")
+    serve(predictor, args)
+
+
+if __name__ == "__main__":
+    main()
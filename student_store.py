@@ -0,0 +1,163 @@
+# ============================================================
+# 🎓 Indexed Student Store
+# Columnar NumPy copy of the training students (StudentID,
+# features, GPA), indexed by the model's training-row ids so the
+# neighbours behind a prediction can be shown without pandas
+#
+#   python student_store.py         # writes student_store/*.npy + meta.json
+#
+# Training rows are tied to students by the StudentIDs recorded in
+# the model pack (train.py writes them; see artifact.py), so neither
+# the pickle nor scikit-learn is loaded.
+# ============================================================
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from digest import file_digest
+from predictor import BASE_DIR, FEATURES, MODEL_PACK_PATH
+
+CSV_PATH = BASE_DIR / "Student_performance_data.csv"
+STORE_DIR = BASE_DIR / "student_store"
+FORMAT_VERSION = 3
+ID_COLUMN = "StudentID"
+TARGET = "GPA"
+COLUMNS = (ID_COLUMN, *FEATURES, TARGET)
+
+
+class StudentStore:
+    """Read-only columnar student records.
+
+    `columns` maps each name in COLUMNS to a 1-D array (memory-mapped
+    when opened from disk); `model_rows[i]` is the record behind the
+    model's training row i. Lookups are plain fancy indexing, so cost
+    depends on the number of rows fetched, not the store size.
+    """
+
+    def __init__(self, columns, model_rows):
+        self.columns = columns
+        self.model_rows = model_rows
+        ids = columns[ID_COLUMN]
+        self._id_order = np.argsort(ids, kind="stable")
+        self._sorted_ids = ids[self._id_order]
+
+    def __len__(self):
+        return len(self.columns[ID_COLUMN])
+
+    @classmethod
+    def from_csv(cls, csv_path=CSV_PATH, pack_path=MODEL_PACK_PATH):
+        """Build from the student CSV's columnar cache and the model pack's train_ids.
+
+        The columns stay memory-mapped from the cache (see
+        dataset_cache.py), which is built on first use. Raises
+        ValueError for a pack without recorded StudentIDs.
+        """
+        from artifact import ModelPack
+        from dataset_cache import load_columns
+
+        train_ids = ModelPack.open(pack_path).train_ids
+        if train_ids is None:
+            raise ValueError(f"{pack_path} records no training StudentIDs; re-export it with train.py "
+                             "or artifact.py --ids-from-csv")
+        cached, _ = load_columns(csv_path)
+        missing = [name for name in COLUMNS if name not in cached]
+        if missing:
+            raise ValueError(f"{csv_path} is missing columns: {', '.join(missing)}")
+        store = cls({name: cached[name] for name in COLUMNS}, np.empty(0, dtype=np.intp))
+        store.model_rows = store.rows_for_ids(train_ids)
+        return store
+
+    def save(self, store_dir=STORE_DIR, csv_path=CSV_PATH, pack_path=MODEL_PACK_PATH):
+        store_dir = Path(store_dir)
+        store_dir.mkdir(parents=True, exist_ok=True)
+        for name, values in self.columns.items():
+            np.save(store_dir / f"{name}.npy", np.ascontiguousarray(values))
+        np.save(store_dir / "model_rows.npy", self.model_rows)
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "columns": list(COLUMNS),
+            "rows": len(self),
+            "csv_sha256": file_digest(csv_path),
+            "pack_sha256": file_digest(pack_path),
+        }
+        with open(store_dir / "meta.json", "w") as f:
+            json.dump(meta, f, indent=2)
+        return meta
+
+    @classmethod
+    def open(cls, store_dir=STORE_DIR, csv_path=CSV_PATH, pack_path=MODEL_PACK_PATH, verify=True):
+        """Memory-map a saved store, or return None if missing or stale."""
+        store_dir = Path(store_dir)
+        try:
+            with open(store_dir / "meta.json") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        if meta.get("format_version") != FORMAT_VERSION or meta.get("columns") != list(COLUMNS):
+            return None
+        if verify and (
+            meta.get("csv_sha256") != file_digest(csv_path)
+            or meta.get("pack_sha256") != file_digest(pack_path)
+        ):
+            return None
+        try:
+            columns = {name: np.load(store_dir / f"{name}.npy", mmap_mode="r") for name in COLUMNS}
+            model_rows = np.load(store_dir / "model_rows.npy", mmap_mode="r")
+        except FileNotFoundError:
+            return None
+        return cls(columns, model_rows)
+
+    def records(self, rows):
+        """{column: values} for store rows, in the given order."""
+        rows = np.asarray(rows, dtype=np.intp)
+        return {name: np.asarray(values[rows]) for name, values in self.columns.items()}
+
+    def neighbours(self, model_rows):
+        """(records, found) for the model's training-row ids.
+
+        Ids with no stored record are dropped from `records`; `found`
+        marks which of the requested ids were kept.
+        """
+        rows = np.asarray(self.model_rows[np.asarray(model_rows, dtype=np.intp)])
+        found = rows >= 0
+        return self.records(rows[found]), found
+
+    def rows_for_ids(self, ids):
+        """Store row of each StudentID (-1 where absent); IDs compare as strings."""
+        ids = np.atleast_1d(np.asarray(ids)).astype(str)
+        if not len(self):
+            return np.full(len(ids), -1, dtype=np.intp)
+        pos = np.minimum(np.searchsorted(self._sorted_ids, ids), len(self) - 1)
+        return np.where(self._sorted_ids[pos] == ids, self._id_order[pos], -1).astype(np.intp)
+
+    def by_student_id(self, ids):
+        """Records for StudentIDs present in the store."""
+        rows = self.rows_for_ids(ids)
+        return self.records(rows[rows >= 0])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the columnar similar-students store.")
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--pack", default=MODEL_PACK_PATH, help="model pack with train_ids (see artifact.py)")
+    parser.add_argument("--out", default=STORE_DIR)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    store = StudentStore.from_csv(args.csv, args.pack)
+    store.save(args.out, args.csv, args.pack)
+    matched = int((np.asarray(store.model_rows) >= 0).sum())
+    print(
+        f"stored {len(store):,} students ({matched:,}/{len(store.model_rows):,} model rows matched) "
+        f"in {args.out} in {time.perf_counter() - start:.2f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# ============================================================
+# 🎓 KNN Hyperparameter Sweep
+# Cross-validated grid over k, weights, distance metric and
+# feature subset, sharing one neighbour graph per config
+#
+#   python sweep.py Student_performance_data.csv
+#   python sweep.py data.csv --metrics euclidean,manhattan,minkowski:3 --subsets all,drop-one --jobs 8
+# ============================================================
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cv import cv_neighbours, predictions_for_all_k, score_matrix
+from predictor import BASE_DIR, FEATURES
+from train import DEFAULT_CHUNK_SIZE, read_split
+
+# Arrays shared with worker processes (set by the pool initializer).
+_DATA = {}
+
+
+def parse_metric(spec):
+    """'euclidean' | 'manhattan' | 'minkowski:<p>' -> (label, sklearn kwargs)."""
+    if spec == "euclidean":
+        return spec, {"metric": "minkowski", "p": 2}
+    if spec == "manhattan":
+        return spec, {"metric": "minkowski", "p": 1}
+    if spec.startswith("minkowski:"):
+        p = float(spec.split(":", 1)[1])
+        return spec, {"metric": "minkowski", "p": p}
+    raise ValueError(f"unknown metric {spec!r}")
+
+
+def parse_subsets(spec):
+    """'all', 'drop-one' or '+'-joined feature names, comma separated."""
+    subsets = []
+    for item in spec.split(","):
+        if item == "all":
+            subsets.append(tuple(FEATURES))
+        elif item == "drop-one":
+            subsets += [tuple(f for f in FEATURES if f != drop) for drop in FEATURES]
+        else:
+            cols = tuple(item.split("+"))
+            unknown = [c for c in cols if c not in FEATURES]
+            if unknown:
+                raise ValueError(f"unknown features: {', '.join(unknown)}")
+            subsets.append(cols)
+    return list(dict.fromkeys(subsets))
+
+
+def _init_worker(Z, y, folds):
+    _DATA.update(Z=Z, y=y, folds=folds)
+
+
+def _out_of_fold_neighbours(Z, folds, k_max, metric_label, metric_kwargs):
+    """(dist, ind) of each row's k_max nearest rows from the other folds."""
+    if metric_label == "euclidean":
+        # The same graph train.py --cv scores (see cv.py)
+        return cv_neighbours(Z, folds, k_max)
+    from sklearn.neighbors import NearestNeighbors
+
+    dist = np.empty((len(Z), k_max))
+    ind = np.empty((len(Z), k_max), dtype=np.intp)
+    for fold in np.unique(folds):
+        train, val = np.flatnonzero(folds != fold), folds == fold
+        nn = NearestNeighbors(n_neighbors=k_max, **metric_kwargs).fit(Z[train])
+        dist[val], fold_ind = nn.kneighbors(Z[val])
+        ind[val] = train[fold_ind]
+    return dist, ind
+
+
+def _run_task(task):
+    """Out-of-fold neighbours for one (metric, subset), scored for every k/weights."""
+    metric_label, metric_kwargs, subset, k_max = task
+    Z, y, folds = _DATA["Z"], _DATA["y"], _DATA["folds"]
+    cols = [FEATURES.index(c) for c in subset]
+
+    start = time.perf_counter()
+    dist, ind = _out_of_fold_neighbours(
+        np.ascontiguousarray(Z[:, cols]), folds, k_max, metric_label, metric_kwargs,
+    )
+    latency_us = (time.perf_counter() - start) / max(len(Z), 1) * 1e6
+
+    rows = []
+    fold_ids = np.unique(folds)
+    for weights, preds in predictions_for_all_k(dist, y[ind]).items():
+        r2, mae = score_matrix(y, preds)
+        fold_r2 = np.array([score_matrix(y[folds == f], preds[folds == f])[0] for f in fold_ids])
+        r2_std = fold_r2.std(axis=0)
+        for k in range(1, k_max + 1):
+            rows.append({
+                "metric": metric_label,
+                "features": subset,
+                "weights": weights,
+                "k": k,
+                "r2": float(r2[k - 1]),
+                "r2_std": float(r2_std[k - 1]),
+                "mae": float(mae[k - 1]),
+                "latency_us": latency_us,
+            })
+    return rows
+
+
+def run_sweep(Z, y, metrics, subsets, k_max=15, n_folds=5, seed=42, jobs=None):
+    """Cross-validated results, one row per config, ranked by R².
+
+    `Z` is the training rows standardised once with the training
+    scaler, as in train.py --cv; folds are drawn the same way, so the
+    euclidean configs score exactly as cv.cross_validate does. R² and
+    MAE are pooled over all out-of-fold predictions; `r2_std` is the
+    spread of the per-fold R².
+    """
+    folds = np.random.default_rng(seed).permutation(len(Z)) % n_folds
+    tasks = [(label, kwargs, subset, k_max) for label, kwargs in metrics for subset in subsets]
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+    if jobs == 1:
+        _init_worker(Z, y, folds)
+        table = [row for task in tasks for row in _run_task(task)]
+    else:
+        with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(Z, y, folds)) as pool:
+            table = [row for rows in pool.map(_run_task, tasks) for row in rows]
+    table.sort(key=lambda row: row["r2"], reverse=True)
+    return table
+
+
+def describe_subset(subset):
+    if len(subset) == len(FEATURES):
+        return "all"
+    missing = [f for f in FEATURES if f not in subset]
+    return "-" + ",".join(missing) if len(missing) <= 2 else "+".join(subset)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cross-validated KNN hyperparameter sweep.")
+    parser.add_argument("csv", nargs="?", default=BASE_DIR / "Student_performance_data.csv")
+    parser.add_argument("--k-max", type=int, default=15)
+    parser.add_argument("--metrics", default="euclidean,manhattan,minkowski:3")
+    parser.add_argument("--subsets", default="all,drop-one")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--test-size", type=float, default=0.2,
+                        help="held-out share excluded from the sweep (same split as train.py)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--out", help="write the full ranked table as CSV")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--no-cache", action="store_true",
+                        help="parse the CSV instead of the columnar cache (see dataset_cache.py)")
+    args = parser.parse_args(argv)
+
+    X, y, _, _, moments, _ = read_split(args.csv, args.test_size, args.seed, args.chunk_size,
+                                        cache=not args.no_cache)
+    # Standardise once with the training scaler, as train.py does
+    scale = np.sqrt(moments.var)
+    scale[scale == 0.0] = 1.0
+    X -= moments.mean
+    X /= scale
+    metrics = [parse_metric(m) for m in args.metrics.split(",")]
+    subsets = parse_subsets(args.subsets)
+
+    start = time.perf_counter()
+    table = run_sweep(X, y, metrics, subsets, min(args.k_max, len(X) - 1), args.folds, args.seed, args.jobs)
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{len(table):,} configs x {args.folds} folds on {len(X):,} rows in {elapsed:.2f}s",
+        file=sys.stderr,
+    )
+    print(f"{'rank':>4}  {'metric':<13}{'features':<28}{'weights':<10}{'k':>3}"
+          f"{'R2':>9}{'±':>7}{'MAE':>8}{'us/row':>9}")
+    for rank, row in enumerate(table[:args.top], 1):
+        print(
+            f"{rank:>4}  {row['metric']:<13}{describe_subset(row['features']):<28}{row['weights']:<10}"
+            f"{row['k']:>3}{row['r2']:>9.4f}{row['r2_std']:>7.4f}{row['mae']:>8.4f}{row['latency_us']:>9.1f}"
+        )
+
+    if args.out:
+        import csv
+
+        with open(args.out, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(table[0]))
+            writer.writeheader()
+            for row in table:
+                writer.writerow({**row, "features": "+".join(row["features"])})
+
+
+if __name__ == "__main__":
+    main()
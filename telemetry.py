@@ -0,0 +1,166 @@
+# ============================================================
+# 🎓 Latency Telemetry
+# Prometheus-style histograms plus per-rerun stage timings for
+# the dashboard, exported in the text exposition format
+#
+#   GPA_METRICS_PORT=9464 streamlit run app.py
+#   curl localhost:9464/metrics
+# ============================================================
+
+import bisect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Seconds; spans sub-millisecond lookups to multi-second cold starts.
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _label_text(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{n}="{v}"' for n, v in pairs) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by label values."""
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.labels = tuple(labels)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        if len(label_values) != len(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}")
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, *label_values):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: ([*counts], total) for key, (counts, total) in self._series.items()}
+        for values, (counts, total) in sorted(series.items()):
+            running = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                running += count
+                le = bound if bound == "+Inf" else repr(float(bound))
+                lines.append(f"{self.name}_bucket{_label_text(self.labels, values, [('le', le)])} {running}")
+            lines.append(f"{self.name}_sum{_label_text(self.labels, values)} {total:.9g}")
+            lines.append(f"{self.name}_count{_label_text(self.labels, values)} {running}")
+        return "\n".join(lines)
+
+
+class Registry:
+    """Named histograms rendered together for a scraper."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS, labels=()):
+        """Get or create a histogram by name."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(name, help_text, buckets, labels)
+            return metric
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+class RerunTimer:
+    """Lap timer for one script run: each `lap(name)` closes a stage.
+
+    A stage's time is everything since the previous lap (or the start),
+    so marking the end of each section covers the whole run with no
+    re-indentation. `finish()` records the run in the histograms and in
+    the shared `recent` deque.
+    """
+
+    def __init__(self, stage_hist, total_hist, recent):
+        self._stage_hist = stage_hist
+        self._total_hist = total_hist
+        self._recent = recent
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.stages = {}
+
+    def lap(self, name):
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._last = now
+        self.stages[name] = self.stages.get(name, 0.0) + elapsed
+        self._stage_hist.observe(elapsed, name)
+        return elapsed
+
+    def finish(self):
+        total = time.perf_counter() - self.started
+        self._total_hist.observe(total)
+        self._recent.append({"at": time.time(), "total": total, "stages": dict(self.stages)})
+        return total
+
+
+class AppTelemetry:
+    """Histograms and recent rerun breakdowns shared by all sessions."""
+
+    def __init__(self, registry=None, keep_reruns=20):
+        self.registry = registry or Registry()
+        self.recent = deque(maxlen=keep_reruns)
+        self.rerun_seconds = self.registry.histogram(
+            "gpa_app_rerun_seconds", "Wall time of one dashboard script run.")
+        self.stage_seconds = self.registry.histogram(
+            "gpa_app_stage_seconds", "Wall time per dashboard section.", labels=("stage",))
+        self.predict_seconds = self.registry.histogram(
+            "gpa_predict_seconds", "Latency of one prediction call.", labels=("kind",))
+
+    def rerun(self):
+        return RerunTimer(self.stage_seconds, self.rerun_seconds, self.recent)
+
+
+def serve_metrics(registry, host="127.0.0.1", port=9464):
+    """Expose `registry` at http://host:port/metrics from a daemon thread."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            data = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+    return server
@@ -0,0 +1,33 @@
+# ============================================================
+# 🎓 Test Configuration
+# Puts the repository root on sys.path (the modules are flat,
+# root-level files) and shares small synthetic fixtures
+# ============================================================
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def random_students(n, seed=0):
+    """(X, gpa) in model feature order, spread like the dashboard inputs."""
+    rng = np.random.default_rng(seed)
+    X = np.empty((n, 8))
+    X[:, 0] = rng.uniform(0.0, 20.0, n)
+    X[:, 1] = rng.integers(0, 30, n)
+    X[:, 2] = rng.integers(0, 2, n)
+    X[:, 3] = rng.integers(0, 5, n)
+    X[:, 4:7] = rng.integers(0, 2, (n, 3))
+    X[:, 7] = rng.integers(0, 5, n)
+    gpa = np.clip(3.0 + 0.05 * X[:, 0] - 0.1 * X[:, 1] + rng.normal(0.0, 0.2, n), 0.0, 4.0)
+    return X, gpa
+
+
+@pytest.fixture
+def students():
+    return random_students(200)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from artifact import ModelPack, write_pack
+from conftest import random_students
+
+
+def pack(path, **kwargs):
+    X, y = random_students(50)
+    write_pack(path, X, y, X.mean(axis=0), X.std(axis=0), k=4, **kwargs)
+    return X, y
+
+
+def corrupt(path, offset):
+    data = bytearray(path.read_bytes())
+    data[offset] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "m.gpaknn"
+    X, y = pack(path)
+    opened = ModelPack.open(path, verify=True)
+    np.testing.assert_array_equal(opened.train, X)
+    np.testing.assert_array_equal(opened.targets, y)
+    assert opened.k == 4 and opened.sq_norms is not None
+
+
+def test_unknown_arrays_are_skipped_but_verified(tmp_path):
+    path = tmp_path / "m.gpaknn"
+    pack(path, extra_arrays={"future": np.arange(7, dtype=np.int32)})
+    opened = ModelPack.open(path, verify=True)
+    assert opened.header["arrays"]["future"]["dtype"] == "<i4"
+
+    spec = opened.header["arrays"]["future"]
+    start = len(path.read_bytes()) - spec["nbytes"]     # stored last
+    del opened
+    corrupt(path, start)
+    ModelPack.open(path)                                # mapping ignores it
+    with pytest.raises(ValueError, match=r"checksum \(future\)"):
+        ModelPack.open(path, verify=True)
+
+
+def test_corrupt_training_matrix_fails_verify(tmp_path):
+    path = tmp_path / "m.gpaknn"
+    pack(path)
+    header = ModelPack.open(path).header
+    train = header["arrays"]["train"]
+    last = header["arrays"]["sq_norms"]                 # stored last, so the file ends with it
+    data_start = len(path.read_bytes()) - last["offset"] - last["nbytes"]
+    corrupt(path, data_start + train["offset"] + 3)
+    with pytest.raises(ValueError, match=r"checksum \(train\)"):
+        ModelPack.open(path, verify=True)
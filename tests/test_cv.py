@@ -0,0 +1,20 @@
+import numpy as np
+
+from cv import cross_validate
+from predictor import FEATURES
+from sweep import parse_metric, run_sweep
+
+
+def test_sweep_scores_euclidean_configs_like_cross_validate(students):
+    X, y = students
+    Z = (X - X.mean(axis=0)) / X.std(axis=0)
+    ranked = cross_validate(Z, y, k_max=6, n_folds=5, seed=3)
+    table = run_sweep(Z, y, [parse_metric("euclidean"), parse_metric("manhattan")], [tuple(FEATURES)],
+                      k_max=6, n_folds=5, seed=3, jobs=1)
+
+    euclidean = {(row["k"], row["weights"]): row for row in table if row["metric"] == "euclidean"}
+    assert len(euclidean) == len(ranked) == 12
+    for row in ranked:
+        swept = euclidean[row["k"], row["weights"]]
+        assert (swept["r2"], swept["mae"]) == (row["r2"], row["mae"])
+    assert all(np.isfinite(row["r2_std"]) for row in table)
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from conftest import random_students
+from knn_engine import FusedKNN, IncrementalKNN
+
+
+def engine(X, y, **kwargs):
+    mean, scale = X.mean(axis=0), X.std(axis=0)
+    return IncrementalKNN((X - mean) / scale, y, mean, scale, k=4, **kwargs)
+
+
+def fresh(X, y, mean, scale):
+    """A FusedKNN built from scratch over the same raw rows."""
+    return FusedKNN((X - mean) / scale, y, mean, scale, k=4)
+
+
+def test_append_matches_a_fresh_build(students):
+    X, y = students
+    knn = engine(X, y)
+    X_new, y_new = random_students(30, seed=1)
+    assert knn.append(X_new, y_new) == 230
+    assert knn.stats()["delta_rows"] == 30
+
+    queries, _ = random_students(50, seed=2)
+    expected = fresh(np.vstack([X, X_new]), np.concatenate([y, y_new]), knn.mean, knn.scale)
+    np.testing.assert_allclose(knn.predict(queries), expected.predict(queries))
+
+
+def test_delta_is_compacted_past_max_delta(students):
+    X, y = students
+    knn = engine(X, y, max_delta=16)
+    knn.append(*random_students(10, seed=1))
+    assert knn.compactions == 0
+    knn.append(*random_students(10, seed=2))
+    stats = knn.stats()
+    assert knn.compactions == 1
+    assert (stats["base_rows"], stats["delta_rows"]) == (220, 0)
+
+
+def test_window_expires_older_cohorts(students):
+    X, y = students
+    knn = engine(X, y, cohorts=1, window=2)
+    X2, y2 = random_students(20, seed=1)
+    X3, y3 = random_students(20, seed=2)
+    knn.append(X2, y2, cohort=2)
+    assert knn.stats()["cohorts"] == [1, 2]
+    knn.append(X3, y3, cohort=3)
+    assert knn.stats()["cohorts"] == [2, 3]
+    assert len(knn) == 40
+
+    queries, _ = random_students(50, seed=3)
+    expected = fresh(np.vstack([X2, X3]), np.concatenate([y2, y3]), knn.mean, knn.scale)
+    np.testing.assert_allclose(knn.predict(queries), expected.predict(queries))
+
+
+def test_expire_drops_cohorts_before_cutoff(students):
+    X, y = students
+    knn = engine(X, y, cohorts=1)
+    knn.append(*random_students(20, seed=1), cohort=2)
+    assert knn.expire(2) == 20
+    assert knn.stats()["cohorts"] == [2]
+
+
+def test_failed_append_is_rolled_back(students):
+    # window=1: a new cohort of 2 rows would expire the base and leave
+    # fewer than k rows, so the append fails and must leave no trace.
+    X, y = students
+    knn = engine(X, y, cohorts=0, window=1)
+    queries, _ = random_students(20, seed=3)
+    before = knn.predict(queries)
+
+    with pytest.raises(ValueError, match="would remain"):
+        knn.append(*random_students(2, seed=1), cohort=1)
+    assert knn.stats() == {"rows": 200, "base_rows": 200, "delta_rows": 0, "cohorts": [0], "compactions": 0}
+    np.testing.assert_array_equal(knn.predict(queries), before)
+
+    # The rejected rows must not count towards a later append either.
+    with pytest.raises(ValueError, match="would remain"):
+        knn.append(*random_students(3, seed=2), cohort=1)
+    X_ok, y_ok = random_students(5, seed=4)
+    assert knn.append(X_ok, y_ok, cohort=1) == 5
+    np.testing.assert_array_equal(np.sort(knn.targets), np.sort(y_ok))
+
+
+def test_rejects_bad_rows(students):
+    X, y = students
+    knn = engine(X, y)
+    with pytest.raises(ValueError):
+        knn.append(X[:2], y[:3])
+    with pytest.raises(ValueError):
+        knn.append(np.full((1, 8), np.nan), [3.0])
+    assert len(knn) == 200
@@ -0,0 +1,98 @@
+import csv
+import io
+
+import numpy as np
+import pytest
+
+from batch_score import score_csv
+from ingest import RejectLog, iter_student_chunks
+from predictor import FEATURES
+
+HEADER = "StudentID,StudyTimeWeekly,Absences,Tutoring,ParentalSupport,Extracurricular,Sports,Music,GradeClass,GPA\n"
+
+
+def chunks(text, columns=("StudentID", *FEATURES, "GPA"), **kwargs):
+    return list(iter_student_chunks(io.StringIO(HEADER + text), columns, **kwargs))
+
+
+def test_valid_rows_are_typed():
+    (chunk,) = chunks("S-1001,12.5,4,0,2,1,0,0,2,2.9\n007,45,60,1,4,0,1,1,0,3.5\n")
+    assert chunk["StudentID"].tolist() == ["S-1001", "007"]     # opaque text, leading zeros kept
+    assert chunk["StudentID"].dtype.kind == "U"                  # fixed-width, not Python objects
+    assert chunk["StudyTimeWeekly"].dtype == np.float64
+    assert chunk["Absences"].tolist() == [4, 60]                # no dashboard upper bound
+    assert chunk["Tutoring"].dtype == np.int8
+    assert chunk["GPA"].tolist() == [2.9, 3.5]
+
+
+@pytest.mark.parametrize("row, column", [
+    (",12,4,0,2,1,0,0,2,2.9", "StudentID"),
+    ("S-1,abc,4,0,2,1,0,0,2,2.9", "StudyTimeWeekly"),
+    ("S-1,,4,0,2,1,0,0,2,2.9", "StudyTimeWeekly"),
+    ("S-1,-1,4,0,2,1,0,0,2,2.9", "StudyTimeWeekly"),
+    ("S-1,12,4.5,0,2,1,0,0,2,2.9", "Absences"),
+    ("S-1,12,4,2,2,1,0,0,2,2.9", "Tutoring"),
+    ("S-1,12,4,0,5,1,0,0,2,2.9", "ParentalSupport"),
+    ("S-1,12,4,0,2,1,0,0,2,4.5", "GPA"),
+])
+def test_invalid_rows_are_rejected(row, column):
+    rejects = RejectLog(keep=5)
+    (chunk,) = chunks(f"S-0,12,4,0,2,1,0,0,2,2.9\n{row}\n", rejects=rejects)
+    assert chunk["StudentID"].tolist() == ["S-0"]
+    assert rejects.rows == 1
+    assert rejects.by_column == {column: 1}
+    assert rejects.samples == [{"row": 2, "reason": column}]
+
+
+def test_reject_file_names_every_failing_column(tmp_path):
+    path = tmp_path / "rejects.csv"
+    rejects = RejectLog(path)
+    chunks("S-1,x,4,0,9,1,0,0,2,2.9\nS-2,12,4,0,2,1,0,0,2,2.9\n", rejects=rejects)
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    assert lines[1].endswith(",StudyTimeWeekly;ParentalSupport")
+
+
+def test_missing_required_column_raises():
+    with pytest.raises(ValueError, match="missing columns"):
+        list(iter_student_chunks(io.StringIO("StudyTimeWeekly,Absences\n1,2\n"), FEATURES))
+
+
+def test_optional_columns_may_be_absent():
+    text = ",".join(FEATURES) + "\n12,4,0,2,1,0,0,2\n"
+    (chunk,) = list(iter_student_chunks(io.StringIO(text), ("StudentID", *FEATURES), FEATURES))
+    assert "StudentID" not in chunk and len(chunk["Absences"]) == 1
+
+
+class ConstantModel:
+    def predict(self, X):
+        return np.full(len(X), 3.0)
+
+
+def test_batch_score_keeps_text_ids_and_counts_rejects():
+    out, rejects = io.StringIO(), RejectLog()
+    rows = score_csv(io.StringIO(HEADER + "S-1,12,4,0,2,1,0,0,2,\nS-2,12,x,0,2,1,0,0,2,\n"), out,
+                     ConstantModel(), rejects=rejects)
+    assert rows == 1 and rejects.rows == 1
+    assert out.getvalue().splitlines() == ["StudentID,PredictedGPA,RiskBand", "S-1,3.0,Good"]
+
+
+def test_batch_score_quotes_ids_like_the_csv_module():
+    out = io.StringIO()
+    src = HEADER + '"S,1",12,4,0,2,1,0,0,2,\n"say ""hi""",12,4,0,2,1,0,0,2,\n'
+    assert score_csv(io.StringIO(src), out, ConstantModel()) == 2
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert rows[1:] == [["S,1", "3.0", "Good"], ['say "hi"', "3.0", "Good"]]
+
+
+def test_batch_score_fails_when_every_row_is_rejected(tmp_path):
+    dst = tmp_path / "scored.csv"
+    with pytest.raises(ValueError, match="all 2 rows failed"):
+        score_csv(io.StringIO(HEADER + "S-1,x,4,0,2,1,0,0,2,\nS-2,,4,0,2,1,0,0,2,\n"), dst, ConstantModel())
+    assert not dst.exists()
+
+
+def test_batch_score_writes_only_a_header_for_empty_input():
+    out = io.StringIO()
+    assert score_csv(io.StringIO(HEADER), out, ConstantModel()) == 0
+    assert out.getvalue().splitlines()[0].endswith("PredictedGPA,RiskBand")
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from artifact import write_pack
+from conftest import random_students
+from grid import RADICES, STUDY_STEP
+from lookup_table import LookupPredictor, build_table
+from predictor import GPAPredictor
+
+
+@pytest.fixture(scope="module")
+def built(tmp_path_factory):
+    root = tmp_path_factory.mktemp("lookup")
+    X, y = random_students(50)
+    write_pack(root / "m.gpaknn", X, y, X.mean(axis=0), X.std(axis=0), k=4)
+    engine = GPAPredictor.from_pack(root / "m.gpaknn")
+    build_table(engine, root / "t.npy", root / "t.json", root / "m.gpaknn")
+    return root, engine
+
+
+def open_table(root, pack="m.gpaknn"):
+    return LookupPredictor.open(root / "t.npy", root / "t.json", root / pack)
+
+
+def on_grid_profiles(n, seed=0):
+    rng = np.random.default_rng(seed)
+    levels = rng.integers(0, RADICES, (n, len(RADICES))).astype(np.float64)
+    levels[:, 0] *= STUDY_STEP
+    return levels
+
+
+def test_table_matches_the_engine_within_quantisation(built):
+    root, engine = built
+    lookup = open_table(root)
+    X = on_grid_profiles(2000)
+    np.testing.assert_allclose(lookup.predict(X), engine.predict(X), rtol=0, atol=lookup.gpa_scale / 2 + 1e-12)
+
+    off_grid = X[:5] + [0.25, 0, 0, 0, 0, 0, 0, 0]
+    np.testing.assert_array_equal(lookup.predict(off_grid), engine.predict(off_grid))
+
+
+def test_explain_serves_the_table_gpa_with_model_neighbours(built):
+    root, engine = built
+    lookup = open_table(root)
+    X = np.vstack([on_grid_profiles(20, seed=1), on_grid_profiles(3, seed=2) + [0.25, 0, 0, 0, 0, 0, 0, 0]])
+    out, reference = lookup.explain(X), engine.explain(X)
+    np.testing.assert_array_equal(out["gpa"], lookup.predict(X))
+    np.testing.assert_array_equal(out["index"], reference["index"])
+    assert lookup.explain_one(X[:1])["gpa"] == lookup.predict_one(X[:1])
+
+
+def test_table_for_another_model_is_stale(built):
+    root, _ = built
+    X, y = random_students(50, seed=9)
+    write_pack(root / "other.gpaknn", X, y, X.mean(axis=0), X.std(axis=0), k=4)
+    assert open_table(root, "other.gpaknn") is None
+    assert open_table(root) is not None
@@ -0,0 +1,49 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from microbatch import MicroBatcher, ThreadedMicroBatcher
+
+GOOD = [12.0, 4, 0, 2, 1, 0, 0, 2]
+
+
+def row_sum(X):
+    return X.sum(axis=1)
+
+
+def test_concurrent_rows_share_one_batch():
+    async def run():
+        batcher = MicroBatcher(row_sum, max_wait=0.01)
+        rows = [[float(i)] * 8 for i in range(5)]
+        preds = await asyncio.gather(*(batcher.predict(row) for row in rows))
+        return batcher, preds
+
+    batcher, preds = asyncio.run(run())
+    assert preds == [8.0 * i for i in range(5)]
+    assert batcher.batches == 1 and batcher.mean_batch_size == 5
+
+
+@pytest.mark.parametrize("bad", [[1, 2, 3], [[*GOOD]], [np.nan] + GOOD[1:], [np.inf] + GOOD[1:]])
+def test_bad_row_fails_only_its_own_request(bad):
+    async def run():
+        batcher = MicroBatcher(row_sum, max_wait=0.01)
+        results = await asyncio.gather(
+            batcher.predict(GOOD), batcher.predict(bad), batcher.predict(GOOD), return_exceptions=True,
+        )
+        return batcher, results
+
+    batcher, (first, error, second) = asyncio.run(run())
+    assert first == second == sum(GOOD)
+    assert isinstance(error, ValueError)
+    assert (batcher.batches, batcher.rows) == (1, 2)
+
+
+def test_threaded_batcher_raises_in_the_caller():
+    batcher = ThreadedMicroBatcher(row_sum, max_wait=0.001)
+    try:
+        with pytest.raises(ValueError, match="8 features"):
+            batcher.predict([1, 2, 3], timeout=5)
+        assert batcher.predict(GOOD, timeout=5) == sum(GOOD)
+    finally:
+        batcher.close()
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from neighbors import IVFIndex, build_index
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((500, 8)), rng.standard_normal((100, 8))
+
+
+def test_exact_backends_agree(data):
+    train, queries = data
+    dist, ind = build_index(train, "brute").query(queries, 5)
+    for backend in ("kd_tree", "ball_tree"):
+        other_dist, other_ind = build_index(train, backend).query(queries, 5)
+        np.testing.assert_array_equal(other_ind, ind)
+        np.testing.assert_allclose(other_dist, dist, rtol=1e-12)
+    # Nearest first, and a training row is its own nearest neighbour.
+    assert (np.diff(dist, axis=1) >= 0).all()
+    self_ind = build_index(train, "brute").query(train[:10], 1)[1][:, 0]
+    np.testing.assert_array_equal(self_ind, np.arange(10))
+
+
+def test_ivf_probing_every_list_is_exact(data):
+    train, queries = data
+    index = IVFIndex(train, n_lists=16, n_probe=2)
+    dist, ind = build_index(train, "brute").query(queries, 5)
+    ivf_dist, ivf_ind = index.query(queries, 5, n_probe=index.n_lists)
+    np.testing.assert_array_equal(ivf_ind, ind)
+    np.testing.assert_allclose(ivf_dist, dist, rtol=1e-12)
+
+
+def test_ivf_falls_back_to_exact_when_lists_are_short(data):
+    train, queries = data
+    index = IVFIndex(train, n_lists=250, n_probe=1)
+    k = 10
+    assert index.lists.shape[1] < k       # one probed list can never hold k rows
+    dist, ind = index.query(queries, k)
+    exact_dist, exact_ind = build_index(train, "brute").query(queries, k)
+    np.testing.assert_array_equal(ind, exact_ind)
+    np.testing.assert_allclose(dist, exact_dist, rtol=1e-12)
+
+
+def test_unknown_backend_and_bad_k(data):
+    train, queries = data
+    with pytest.raises(ValueError, match="unknown neighbour backend"):
+        build_index(train, "annoy")
+    with pytest.raises(ValueError, match="k=501"):
+        build_index(train, "brute").query(queries, 501)
@@ -0,0 +1,80 @@
+import numpy as np
+
+from grid import GRID_SIZE
+from knn_engine import FusedKNN
+from predictor import GPAPredictor
+from prediction_cache import PredictionCache
+
+ON_GRID = np.array([
+    [12.0, 4, 0, 2, 1, 0, 0, 2],
+    [12.5, 4, 0, 2, 1, 0, 0, 2],
+    [0.0, 0, 1, 4, 0, 1, 1, 0],     # dataset-only codes: parental support 4, grade class 0
+])
+OFF_GRID = np.array([[12.25, 4, 0, 2, 1, 0, 0, 2]])     # study time off the 0.5 h grid
+
+
+class CountingModel:
+    def __init__(self):
+        self.rows = 0
+
+    def predict(self, X):
+        self.rows += len(X)
+        return X[:, 0] / 10.0 - X[:, 1] / 100.0
+
+
+def test_miss_then_hit():
+    model = CountingModel()
+    cache = PredictionCache(model.predict)
+    first = cache.predict(ON_GRID)
+    assert cache.stats()["misses"] == 3 and cache.stats()["hits"] == 0
+    second = cache.predict(ON_GRID)
+    np.testing.assert_array_equal(first, second)
+    np.testing.assert_allclose(first, CountingModel().predict(ON_GRID))
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["filled"]) == (3, 3, 3)
+    assert model.rows == 3
+
+
+def test_duplicate_codes_scored_once():
+    model = CountingModel()
+    cache = PredictionCache(model.predict)
+    cache.predict(np.repeat(ON_GRID[:1], 5, axis=0))
+    assert model.rows == 1
+    assert cache.stats()["filled"] == 1
+
+
+def test_off_grid_rows_bypass_the_table():
+    model = CountingModel()
+    cache = PredictionCache(model.predict)
+    out = cache.predict(np.vstack([OFF_GRID, ON_GRID[:1], OFF_GRID]))
+    np.testing.assert_allclose(out[[0, 2]], model.predict(OFF_GRID)[[0, 0]])
+    stats = cache.stats()
+    assert (stats["bypassed"], stats["misses"], stats["filled"]) == (2, 1, 1)
+    assert stats["size"] == GRID_SIZE
+
+
+def test_clear_forgets_values_and_counters():
+    model = CountingModel()
+    cache = PredictionCache(model.predict)
+    cache.predict(ON_GRID)
+    cache.clear()
+    assert cache.stats() == {
+        "hits": 0, "misses": 0, "bypassed": 0, "filled": 0, "size": GRID_SIZE, "hit_rate": 0.0,
+    }
+    assert np.isnan(cache.table).all()
+    rows = model.rows
+    cache.predict(ON_GRID)
+    assert model.rows == rows + 3
+
+
+def test_predictor_append_clears_the_cache(students):
+    X, y = students
+    mean, scale = X.mean(axis=0), X.std(axis=0)
+    predictor = GPAPredictor(FusedKNN((X - mean) / scale, y, mean, scale, k=4), cache=True)
+    before = predictor.predict(ON_GRID)
+    predictor.enable_updates()
+    # Students identical to the query rows, with a GPA none of the others have
+    predictor.append(ON_GRID, np.full(len(ON_GRID), 4.0))
+    after = predictor.predict(ON_GRID)
+    assert predictor.cache.stats()["hits"] == 0
+    assert (after > before).all()
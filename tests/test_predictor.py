@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from conftest import random_students
+from knn_engine import FusedKNN
+from predictor import BasePredictor, GPAPredictor
+
+
+def test_base_predictor_requires_predict_and_explain():
+    class PredictOnly(BasePredictor):
+        def predict(self, X):
+            return np.zeros(len(X))
+
+    with pytest.raises(TypeError, match="explain"):
+        PredictOnly()
+    with pytest.raises(TypeError):
+        BasePredictor()
+
+
+def test_explain_one_matches_predict_one(students):
+    X, y = students
+    mean, scale = X.mean(axis=0), X.std(axis=0)
+    predictor = GPAPredictor(FusedKNN((X - mean) / scale, y, mean, scale, k=4))
+    row = X[:1]
+    explained = predictor.explain_one(row)
+    assert explained["gpa"] == predictor.predict_one(row)
+    assert len(explained["neighbour_gpa"]) == 4
+    assert explained["index"][0] == 0 and explained["distance"][0] == 0.0
+
+
+def grid_profiles():
+    """Every categorical combination at coarse study-time and absence steps (18,000 rows)."""
+    axes = [np.arange(0.0, 20.5, 2.5), np.arange(0, 30, 7), [0, 1], np.arange(5), [0, 1], [0, 1], [0, 1],
+            np.arange(5)]
+    return np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 8).astype(np.float64)
+
+
+@pytest.mark.parametrize("weights", ["uniform", "distance"])
+def test_fused_engine_matches_sklearn(students, weights):
+    from sklearn.neighbors import KNeighborsRegressor
+    from sklearn.preprocessing import StandardScaler
+
+    X, y = students
+    scaler = StandardScaler().fit(X)
+    model = KNeighborsRegressor(n_neighbors=4, weights=weights).fit(scaler.transform(X), y)
+    engine = FusedKNN.from_sklearn(model, scaler)
+
+    queries = np.vstack([random_students(300, seed=7)[0], grid_profiles(), X[:20]])
+    np.testing.assert_allclose(engine.predict(queries), model.predict(scaler.transform(queries)),
+                               rtol=0, atol=1e-12)
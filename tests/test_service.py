@@ -0,0 +1,94 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+
+from knn_engine import FusedKNN
+from predictor import FEATURES, GPAPredictor
+from service import handle_append, handle_batch, handle_single, make_server
+
+
+@pytest.fixture
+def predictor(students):
+    X, y = students
+    mean, scale = X.mean(axis=0), X.std(axis=0)
+    return GPAPredictor(FusedKNN((X - mean) / scale, y, mean, scale, k=4))
+
+
+def profile(**overrides):
+    return {**dict(zip(FEATURES, (12.0, 4, 0, 2, 1, 0, 0, 2))), **overrides}
+
+
+def test_single_and_batch_score(predictor):
+    single = handle_single(predictor, profile())
+    batch = handle_batch(predictor, {"students": [profile()], "rows": [list(profile().values())]})
+    assert batch["gpa"] == [single["gpa"]] and batch["band"] == [single["band"]]
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf")])
+def test_non_finite_features_are_rejected(predictor, value):
+    with pytest.raises(ValueError, match="StudyTimeWeekly"):
+        handle_single(predictor, profile(StudyTimeWeekly=value))
+    with pytest.raises(ValueError, match="non-finite"):
+        handle_batch(predictor, {"students": [profile(), profile(Absences=value)]})
+    with pytest.raises(ValueError, match=r"row\(s\) 1"):
+        handle_batch(predictor, {"rows": [list(profile().values()), [value] * len(FEATURES)]})
+
+
+@pytest.mark.parametrize("rows", [
+    [[1, 2, 3]],
+    [[1.0] * (len(FEATURES) + 1)],
+    [[1.0] * len(FEATURES), [1.0] * 3],     # ragged
+])
+def test_wrong_arity_rows_are_rejected(predictor, rows):
+    with pytest.raises(ValueError):
+        handle_batch(predictor, {"rows": rows})
+
+
+def test_bad_input_answers_400(predictor):
+    server = make_server(predictor, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def post(path, text):
+        request = urllib.request.Request(url + path, text.encode(), {"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, json.load(response)
+        except urllib.error.HTTPError as exc:
+            return exc.code, json.load(exc)
+
+    try:
+        good = json.dumps(profile())
+        assert post("/predict", good)[0] == 200
+        # Python's json accepts NaN and reads 1e400 as inf
+        assert post("/predict", good.replace('"StudyTimeWeekly": 12.0', '"StudyTimeWeekly": NaN'))[0] == 400
+        status, body = post("/predict/batch", '{"rows": [[1e400, 4, 0, 2, 1, 0, 0, 2]]}')
+        assert status == 400 and "non-finite" in body["error"]
+        assert post("/predict/batch", '{"rows": [[1, 2, 3]]}')[0] == 400
+        # A JSON integer too big for a float raises OverflowError
+        assert post("/predict", good.replace("12.0", "1" + "0" * 400))[0] == 400
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_append_validates_cohort_and_gpa(predictor):
+    predictor.enable_updates()
+    row = list(profile().values())
+    for cohort in (1e400, float("nan"), 2.5, "2025", True):
+        with pytest.raises(ValueError, match="cohort"):
+            handle_append(predictor, {"rows": [row], "gpa": [3.0], "cohort": cohort})
+    for gpa in (4.5, -0.1, float("nan")):
+        with pytest.raises(ValueError, match="GPA"):
+            handle_append(predictor, {"rows": [row], "gpa": [gpa]})
+        with pytest.raises(ValueError, match="GPA"):
+            handle_append(predictor, {"students": [profile(GPA=gpa)]})
+    assert len(predictor.engine) == 200
+
+    added = handle_append(predictor, {"rows": [row], "gpa": [4.0], "cohort": 2.0})
+    assert added["added"] == 1 and added["cohorts"] == [0, 2]
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from artifact import write_pack
+from conftest import random_students
+from predictor import FEATURES
+from student_store import COLUMNS, StudentStore
+
+
+@pytest.fixture
+def csv_and_rows(tmp_path):
+    """A student CSV with text IDs, and a pack over a shuffled subset of it."""
+    X, y = random_students(40)
+    ids = np.array([f"S-{i:03d}" for i in range(40)])
+    path = tmp_path / "students.csv"
+    with open(path, "w") as f:
+        f.write(",".join(COLUMNS) + "\n")
+        for sid, row, gpa in zip(ids, X, y):
+            f.write(",".join([sid, *(f"{v:g}" for v in row), f"{gpa:.6f}"]) + "\n")
+    train_rows = np.random.default_rng(1).permutation(40)[:30]
+    mean, scale = X.mean(axis=0), X.std(axis=0)
+    return path, ids, train_rows, (X[train_rows] - mean) / scale, y[train_rows], mean, scale
+
+
+def test_model_rows_follow_the_recorded_ids(tmp_path, csv_and_rows):
+    csv, ids, train_rows, train, targets, mean, scale = csv_and_rows
+    pack = tmp_path / "m.gpaknn"
+    write_pack(pack, train, targets, mean, scale, k=4, extra_arrays={"train_ids": ids[train_rows]})
+
+    store = StudentStore.from_csv(csv, pack)
+    np.testing.assert_array_equal(store.model_rows, train_rows)
+    records, found = store.neighbours([0, 5])
+    assert found.all()
+    assert records["StudentID"].tolist() == ids[train_rows[[0, 5]]].tolist()
+    assert set(records) == {"StudentID", *FEATURES, "GPA"}
+
+
+def test_ids_missing_from_the_csv_are_not_found(tmp_path, csv_and_rows):
+    csv, ids, train_rows, train, targets, mean, scale = csv_and_rows
+    recorded = ids[train_rows].copy()
+    recorded[3] = "S-999"
+    pack = tmp_path / "m.gpaknn"
+    write_pack(pack, train, targets, mean, scale, k=4, extra_arrays={"train_ids": recorded})
+
+    store = StudentStore.from_csv(csv, pack)
+    assert store.model_rows[3] == -1
+    _, found = store.neighbours([2, 3])
+    assert found.tolist() == [True, False]
+
+
+def test_pack_without_ids_is_refused(tmp_path, csv_and_rows):
+    csv, _, _, train, targets, mean, scale = csv_and_rows
+    pack = tmp_path / "m.gpaknn"
+    write_pack(pack, train, targets, mean, scale, k=4)
+    with pytest.raises(ValueError, match="no training StudentIDs"):
+        StudentStore.from_csv(csv, pack)
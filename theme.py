@@ -0,0 +1,47 @@
+# ============================================================
+# 🎓 Dashboard Theme
+# The ~20 KB stylesheet lives in static/theme.css and is served
+# once by Streamlit's static file server; each rerun only sends a
+# content-hashed <link>, so browsers refetch it only when it changes.
+# ============================================================
+
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+import streamlit as st
+
+THEME_PATH = Path(__file__).resolve().parent / "static" / "theme.css"
+THEME_URL = "app/static/theme.css"
+
+PARTICLES_HTML = """<!-- Floating Particles -->
+<div class="particles">
+    <div class="pt"></div><div class="pt"></div><div class="pt"></div>
+    <div class="pt"></div><div class="pt"></div><div class="pt"></div>
+    <div class="pt"></div><div class="pt"></div>
+</div>"""
+
+
+@lru_cache(maxsize=4)
+def _read_theme(mtime_ns):
+    css = THEME_PATH.read_text(encoding="utf-8")
+    return css, hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+
+
+def theme_css():
+    """(css, digest) for the current stylesheet, re-read only when it changes."""
+    return _read_theme(THEME_PATH.stat().st_mtime_ns)
+
+
+def theme_html():
+    """Per-rerun theme markup.
+
+    With static serving enabled (.streamlit/config.toml) this is a few
+    hundred bytes; otherwise the stylesheet is inlined as before.
+    """
+    css, digest = theme_css()
+    if st.get_option("server.enableStaticServing"):
+        head = f'<link rel="stylesheet" href="{THEME_URL}?v={digest}">'
+    else:
+        head = f"<style>\n{css}</style>"
+    return f"{head}\n\n{PARTICLES_HTML}\n"
@@ -0,0 +1,372 @@
+# ============================================================
+# 🎓 GPA Model Training Pipeline
+# Headless, deterministic replacement for the training cells of
+# `KNN Reg Que.ipynb`
+#
+#   python train.py Student_performance_data.csv
+#   python train.py district.csv --k 4 --install   # also overwrite ./model.pkl, ./scaler.pkl, ./model.gpaknn
+#   python train.py --cv 5 --auto-k                 # pick k/weights by fast CV first
+#
+# Each run writes artifacts/<version>/{model.pkl, scaler.pkl, model.gpaknn, manifest.json}.
+# ============================================================
+
+import argparse
+import hashlib
+import json
+import pickle
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from artifact import export_sklearn
+from dataset_cache import iter_column_chunks, load_columns
+from digest import file_digest
+from ingest import RejectLog, iter_student_chunks
+from predictor import BASE_DIR, CALIBRATION_PATH, FEATURES, MODEL_PACK_PATH, MODEL_PATH, SCALER_PATH
+
+TARGET = "GPA"
+ID_COLUMN = "StudentID"
+ARTIFACT_DIR = BASE_DIR / "artifacts"
+DEFAULT_CHUNK_SIZE = 262_144
+PREDICT_BATCH = 65_536
+CONFORMAL_LEVELS = (0.8, 0.9, 0.95)
+
+
+def split_mask(keys, test_size, seed):
+    """Deterministic test-set membership from integer row keys.
+
+    A splitmix64-style hash of (key, seed) decides each row on its own,
+    so the split does not depend on chunking or row order.
+    """
+    with np.errstate(over="ignore"):
+        z = keys.astype(np.uint64) + np.uint64(seed) * np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z ^= z >> np.uint64(31)
+    return (z % np.uint64(1_000_000)) < np.uint64(round(test_size * 1_000_000))
+
+
+def id_keys(ids):
+    """uint64 split keys for StudentIDs (opaque strings, see ingest.py).
+
+    All-digit IDs keep their integer value, so numeric exports split
+    exactly as before; other IDs are hashed with pandas' stable
+    SipHash, which does not change between runs or machines.
+    """
+    ids = np.asarray(ids)
+    if ids.dtype.kind in "iu":
+        return ids.astype(np.uint64)
+    import pandas as pd
+
+    keys = pd.util.hash_array(ids.astype(object))
+    numeric = np.char.isdigit(ids) & (np.char.str_len(ids) <= 19)
+    keys[numeric] = ids[numeric].astype(np.uint64)
+    return keys
+
+
+class RunningMoments:
+    """Streaming per-column mean/variance (Chan et al. parallel update)."""
+
+    def __init__(self, n_features):
+        self.n = 0
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+
+    def update(self, X):
+        if len(X) == 0:
+            return
+        n_b = len(X)
+        mean_b = X.mean(axis=0)
+        m2_b = ((X - mean_b) ** 2).sum(axis=0)
+        delta = mean_b - self.mean
+        total = self.n + n_b
+        self.mean = self.mean + delta * (n_b / total)
+        self.m2 = self.m2 + m2_b + delta ** 2 * (self.n * n_b / total)
+        self.n = total
+
+    @property
+    def var(self):
+        return self.m2 / self.n
+
+
+def read_split(csv_path, test_size, seed, chunk_size=DEFAULT_CHUNK_SIZE, rejects=None, cache=True):
+    """Read the rows once: (X_train, y_train, X_test, y_test, train_moments, train_ids).
+
+    `train_ids` holds the StudentID of each training row, in row order,
+    or is None when the input has no StudentID column.
+
+    Rows come chunk by chunk from the columnar cache (see
+    dataset_cache.py, built on first use) or, with `cache=False` or a
+    reject file to write, straight from the CSV (see ingest.py).
+    Scaler statistics are accumulated from training rows alone. Rows
+    failing schema validation are counted in `rejects` and not used.
+    """
+    wanted = (ID_COLUMN, *FEATURES, TARGET)
+    if cache and (rejects is None or rejects.path is None):
+        columns, meta = load_columns(csv_path, chunk_size=chunk_size)
+        missing = [c for c in wanted[1:] if c not in columns]
+        if missing:
+            raise ValueError(f"input is missing columns: {', '.join(missing)}")
+        if rejects is not None:
+            rejects.rows, rejects.by_column = meta["rejected_rows"], dict(meta["rejected_by_column"])
+        chunks = iter_column_chunks({c: columns[c] for c in wanted if c in columns}, chunk_size)
+    else:
+        chunks = iter_student_chunks(csv_path, wanted, wanted[1:], chunk_size, rejects)
+    parts = {"train": ([], []), "test": ([], [])}
+    train_ids = []
+    moments = RunningMoments(len(FEATURES))
+    offset = 0
+    for chunk in chunks:
+        rows = len(chunk[TARGET])
+        if ID_COLUMN in chunk:
+            keys = id_keys(chunk[ID_COLUMN])
+        else:
+            keys = np.arange(offset, offset + rows, dtype=np.int64)
+        offset += rows
+        test = split_mask(keys, test_size, seed)
+        if ID_COLUMN in chunk:
+            train_ids.append(np.asarray(chunk[ID_COLUMN])[~test])
+
+        X = np.column_stack([chunk[name] for name in FEATURES]).astype(np.float64)
+        y = chunk[TARGET]
+        moments.update(X[~test])
+        parts["train"][0].append(X[~test])
+        parts["train"][1].append(y[~test])
+        parts["test"][0].append(X[test])
+        parts["test"][1].append(y[test])
+
+    def stack(xs, ys):
+        if not xs:
+            return np.empty((0, len(FEATURES))), np.empty(0)
+        return np.concatenate(xs), np.concatenate(ys)
+
+    ids = np.concatenate(train_ids) if train_ids else None
+    return (*stack(*parts["train"]), *stack(*parts["test"]), moments, ids)
+
+
+def make_scaler(moments):
+    """A fitted StandardScaler equivalent to fit() on the training rows."""
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler()
+    scaler.mean_ = moments.mean
+    scaler.var_ = moments.var
+    scale = np.sqrt(moments.var)
+    scale[scale == 0.0] = 1.0
+    scaler.scale_ = scale
+    scaler.n_samples_seen_ = moments.n
+    scaler.n_features_in_ = len(FEATURES)
+    scaler.feature_names_in_ = np.array(FEATURES, dtype=object)
+    return scaler
+
+
+def regression_metrics(y_true, y_pred, n_features):
+    resid = y_true - y_pred
+    n = len(y_true)
+    ss_res = float(resid @ resid)
+    ss_tot = float(((y_true - y_true.mean()) ** 2).sum())
+    r2 = 1.0 - ss_res / ss_tot if ss_tot else float("nan")
+    adj = 1.0 - (1.0 - r2) * (n - 1) / (n - n_features - 1) if n > n_features + 1 else float("nan")
+    return {
+        "r2": r2,
+        "adjusted_r2": adj,
+        "mae": float(np.abs(resid).mean()),
+        "rmse": float(np.sqrt(ss_res / n)),
+        "rows": n,
+    }
+
+
+def conformal_half_widths(y_true, y_pred, levels=CONFORMAL_LEVELS):
+    """Split-conformal GPA half-widths from held-out absolute residuals.
+
+    prediction ± width covers a new student with probability >= level;
+    levels that need more held-out rows than exist are left out.
+    """
+    scores = np.sort(np.abs(y_true - y_pred))
+    n = len(scores)
+    widths = {}
+    for level in levels:
+        rank = int(np.ceil((n + 1) * level))
+        if rank <= n:
+            widths[str(level)] = float(scores[rank - 1])
+    return widths
+
+
+def parse_cv(spec):
+    """'loo' -> None (leave-one-out), otherwise a fold count >= 2."""
+    if spec == "loo":
+        return None
+    folds = int(spec)
+    if folds < 2:
+        raise ValueError("--cv needs at least 2 folds (or 'loo')")
+    return folds
+
+
+def train(csv_path, k=4, weights="uniform", algorithm="kd_tree", test_size=0.2, seed=42,
+          chunk_size=DEFAULT_CHUNK_SIZE, out_dir=ARTIFACT_DIR, version=None,
+          cv=False, cv_folds=5, cv_k_max=15, auto_k=False, reject_path=None, cache=True):
+    """Fit scaler + KNN, evaluate on the held-out split and write artifacts.
+
+    With `cv`, the training rows are also cross-validated for every
+    k <= cv_k_max from one shared neighbour graph (see cv.py);
+    `cv_folds=None` is leave-one-out. Rows are standardised once with
+    the training scaler rather than per fold. `auto_k` fits the model
+    with the best cross-validated k and weights. Rows failing schema
+    validation are skipped and, with `reject_path`, written there;
+    `cache` reads the columnar dataset cache instead of the CSV text.
+    """
+    from sklearn.neighbors import KNeighborsRegressor
+
+    started = time.perf_counter()
+    data_sha = file_digest(csv_path)
+    rejects = RejectLog(reject_path)
+    X_train, y_train, X_test, y_test, moments, train_ids = read_split(
+        csv_path, test_size, seed, chunk_size, rejects, cache,
+    )
+    if len(X_train) < k:
+        raise ValueError(f"only {len(X_train)} training rows for k={k}")
+
+    scaler = make_scaler(moments)
+    X_train -= scaler.mean_
+    X_train /= scaler.scale_
+
+    cv_report = None
+    if cv or auto_k:
+        from cv import cross_validate
+
+        cv_started = time.perf_counter()
+        ranked = cross_validate(X_train, y_train, min(cv_k_max, len(X_train) - 1), cv_folds, seed)
+        cv_report = {
+            "folds": cv_folds or "loo",
+            "k_max": cv_k_max,
+            "best": ranked[0],
+            "results": ranked,
+            "seconds": round(time.perf_counter() - cv_started, 3),
+        }
+        if auto_k:
+            k, weights = ranked[0]["k"], ranked[0]["weights"]
+
+    model = KNeighborsRegressor(n_neighbors=k, weights=weights, algorithm=algorithm)
+    model.fit(X_train, y_train)
+
+    metrics, calibration = {}, {}
+    if len(X_test):
+        y_pred = np.concatenate([
+            model.predict((X_test[i:i + PREDICT_BATCH] - scaler.mean_) / scaler.scale_)
+            for i in range(0, len(X_test), PREDICT_BATCH)
+        ])
+        metrics = regression_metrics(y_test, y_pred, len(FEATURES))
+        calibration = conformal_half_widths(y_test, y_pred)
+
+    params = {
+        "n_neighbors": k, "weights": weights, "algorithm": algorithm,
+        "test_size": test_size, "seed": seed,
+    }
+    if version is None:
+        fingerprint = hashlib.sha256(
+            (data_sha + json.dumps(params, sort_keys=True)).encode("utf-8")
+        ).hexdigest()
+        version = f"knn-{fingerprint[:12]}"
+
+    target = Path(out_dir) / version
+    target.mkdir(parents=True, exist_ok=True)
+    with open(target / "model.pkl", "wb") as f:
+        pickle.dump(model, f)
+    with open(target / "scaler.pkl", "wb") as f:
+        pickle.dump(scaler, f)
+    # The pack records each training row's StudentID, so the similar-
+    # students table can be built without the pickle (see student_store.py).
+    export_sklearn(model, scaler, target / MODEL_PACK_PATH.name,
+                   extra={"version": version, "source_model_sha256": file_digest(target / "model.pkl")},
+                   train_ids=train_ids)
+
+    import sklearn
+
+    manifest = {
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "data": {
+            "path": str(csv_path),
+            "sha256": data_sha,
+            "train_rows": int(len(X_train)),
+            "test_rows": int(len(X_test)),
+            "rejected_rows": rejects.rows,
+            "rejected_by_column": rejects.by_column,
+        },
+        "features": list(FEATURES),
+        "target": TARGET,
+        "params": params,
+        "metrics": metrics,
+        "calibration": calibration,
+        "cv": cv_report,
+        "artifacts": {
+            name: file_digest(target / name) for name in ("model.pkl", "scaler.pkl", MODEL_PACK_PATH.name)
+        },
+        "environment": {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "scikit-learn": sklearn.__version__,
+        },
+        "train_seconds": round(time.perf_counter() - started, 3),
+    }
+    with open(target / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    return target, manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the GPA KNN model from a student CSV.")
+    parser.add_argument("csv", nargs="?", default=BASE_DIR / "Student_performance_data.csv")
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--weights", choices=["uniform", "distance"], default="uniform")
+    parser.add_argument("--algorithm", choices=["auto", "kd_tree", "ball_tree", "brute"], default="kd_tree")
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--out-dir", default=ARTIFACT_DIR)
+    parser.add_argument("--version", help="artifact version (default: hash of data + params)")
+    parser.add_argument("--rejects", help="write rows failing schema validation to this CSV")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="parse the CSV instead of the columnar cache (see dataset_cache.py)")
+    parser.add_argument("--install", action="store_true",
+                        help="also copy the artifacts over ./model.pkl and ./scaler.pkl "
+                             "and write ./calibration.json")
+    parser.add_argument("--cv", metavar="FOLDS|loo",
+                        help="cross-validate every k <= --cv-k-max on the training rows")
+    parser.add_argument("--cv-k-max", type=int, default=15)
+    parser.add_argument("--auto-k", action="store_true",
+                        help="fit with the best cross-validated k and weights")
+    args = parser.parse_args(argv)
+
+    target, manifest = train(
+        args.csv, args.k, args.weights, args.algorithm, args.test_size, args.seed,
+        args.chunk_size, args.out_dir, args.version,
+        cv=args.cv is not None, cv_folds=parse_cv(args.cv or "5"),
+        cv_k_max=args.cv_k_max, auto_k=args.auto_k, reject_path=args.rejects,
+        cache=not args.no_cache,
+    )
+    if args.install:
+        shutil.copyfile(target / "model.pkl", MODEL_PATH)
+        shutil.copyfile(target / "scaler.pkl", SCALER_PATH)
+        shutil.copyfile(target / MODEL_PACK_PATH.name, MODEL_PACK_PATH)
+        if manifest["calibration"]:
+            with open(CALIBRATION_PATH, "w") as f:
+                json.dump({
+                    "version": manifest["version"],
+                    "model_sha256": manifest["artifacts"]["model.pkl"],
+                    "half_widths": manifest["calibration"],
+                }, f, indent=2)
+    summary = {"artifacts": str(target), "params": manifest["params"], "metrics": manifest["metrics"]}
+    if manifest["data"]["rejected_rows"]:
+        summary["rejected_rows"] = manifest["data"]["rejected_rows"]
+    if manifest["cv"]:
+        summary["cv"] = {key: manifest["cv"][key] for key in ("folds", "best", "seconds")}
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()